@@ -81,17 +81,31 @@ from majormode.utils import zip_util
 import argparse
 import chardet
 import codecs
+import collections
+import contextlib
+import errno
+import functools
 import gc
+import hashlib
+import itertools
+import json
 import locale
+import multiprocessing
+import numpy
 import os
 import re
 import shapefile
+import shutil
+import socket
+import sqlite3
 import string
+import struct
 import subprocess
 import sys
 import time
 import tempfile
 import traceback
+import unicodedata
 import unidecode
 import uuid
 import zipfile
@@ -355,6 +369,209 @@ GADM_SUPPORTED_COUNTRIES = [
     ('ZWE', u"Zimbabwe"),
 ]
 
+# Suffix of the name of the file, stored next to a Global Administrative
+# Areas (GADM) ZIP archive, where the catalog of the entries of this
+# archive is stored in.
+GADM_ARCHIVE_CATALOG_FILE_NAME_SUFFIX = '.catalog.json'
+
+# Name of the directory of the cache where the parsed data of each
+# country are stored, and version of the format of these data, which
+# is part of the checksum that identifies them.
+PARSED_COUNTRY_CACHE_DIRECTORY_NAME = 'parsed'
+PARSED_COUNTRY_CACHE_FORMAT_VERSION = 1
+
+# Name of the directory of the cache where the archives of each country
+# split from a global archive are stored, separately from the archives
+# downloaded per country, which have the same names.
+SPLIT_ARCHIVE_CACHE_DIRECTORY_NAME = 'split'
+
+# Memory used by the maintenance operations, such as the rebuild of
+# indexes and foreign keys, of the session loading the data with the
+# bulk-load envelope of the SQL commands.
+BULK_LOAD_MAINTENANCE_WORK_MEM = '1GB'
+
+# Estimated memory in bytes that a process requires to parse the data
+# of a country, whatever the size of these data, and estimated memory
+# required per vertex of the boundaries of the administrative
+# subdivisions of this country.  The script uses these estimates to
+# project the memory of the processes run in parallel.
+GADM_COUNTRY_BASE_MEMORY = 1024 * 1024 * 64
+GADM_COUNTRY_MEMORY_PER_VERTEX = 192
+
+# Interval in seconds between two checks of the completion of the
+# processes that parse the data of countries in parallel.
+GADM_SCHEDULER_POLLING_INTERVAL = 0.1
+
+# Minimal number of vertices of the boundaries of a country for its
+# administrative levels to be parsed in parallel.  The levels of smaller
+# countries are parsed sequentially, as the cost of starting a pool of
+# processes and of transferring the parsed data would exceed the gain.
+GADM_PARALLEL_LEVELS_MIN_VERTEX_COUNT = 1000000
+
+# Maximum number of rows of a row group of a GeoParquet file.  The rows
+# of a country are sorted along a Hilbert curve before being written,
+# so that each row group covers a compact geographic area.
+GEOPARQUET_ROW_GROUP_SIZE = 1024 * 8
+
+# Order of the Hilbert curve, that is the number of bits of each
+# coordinate of the grid which cells are indexed along this curve.
+HILBERT_CURVE_ORDER = 16
+
+# Maximum number of times a boundary is recursively split in two halves
+# when subdivided into pieces of a maximum number of vertices.
+SUBDIVISION_MAX_DEPTH = 50
+
+# Maximum number of pieces a boundary is subdivided into, per vertex of
+# this boundary, so that the subdivision of a degenerate boundary, such
+# as a self-overlapping ring, which halves are not always smaller than
+# the piece they are clipped from, stops.
+SUBDIVISION_MAX_PIECE_COUNT_RATIO = 4
+
+# Size in bytes of the pages of the SQLite database written by the
+# script, and number of rows inserted by a single batch.
+SQLITE_PAGE_SIZE = 1024 * 64
+SQLITE_BATCH_SIZE = 1024 * 4
+
+# Number of characters of the rows, in the text format of the
+# PostgreSQL command COPY, that are assembled before being encoded and
+# written with a single call.
+COPY_OUTPUT_BUFFER_SIZE = 1024 * 1024 * 4
+
+# List of the tables populated with the data of the administrative
+# subdivisions, with their columns, in the order these tables need to
+# be populated to satisfy their foreign key constraints.
+COPY_TABLE_COLUMNS = [
+    ('area', ('area_id', 'parent_area_id', 'area_code', 'area_type', 'area_level', 'boundaries')),
+    ('area_label', ('area_id', 'content')),
+    ('area_index', ('area_id', 'keyword')),
+]
+
+# List of the tables populated with the topology of the boundaries of
+# the administrative subdivisions, when requested, with their columns:
+# the table ``area_arc`` stores the arcs shared between the boundaries,
+# and the table ``area_arc_ref`` the sequence of arcs of each boundary.
+TOPOLOGY_COPY_TABLE_COLUMNS = [
+    ('area_arc', ('arc_id', 'path')),
+    ('area_arc_ref', ('area_id', 'ring_index', 'arc_index', 'arc_id', 'is_reversed')),
+]
+
+# List of the tables populated with the references of the
+# administrative subdivisions which boundaries are identical to the
+# boundaries of another subdivision, when the boundaries are
+# deduplicated, with their columns.
+GEOMETRY_REFERENCE_COPY_TABLE_COLUMNS = [
+    ('area_geometry_ref', ('area_id', 'geometry_area_id')),
+]
+
+# List of the tables populated with the pieces of a maximum number of
+# vertices which the boundaries of the administrative subdivisions are
+# subdivided into, when requested, with their columns.
+PIECE_COPY_TABLE_COLUMNS = [
+    ('area_piece', ('area_id', 'geom')),
+]
+
+# Tables which rows reference the rows of other tables, with the list of
+# these other tables.
+COPY_TABLE_DEPENDENCIES = {
+    'area_label': ('area',),
+    'area_index': ('area',),
+    'area_arc_ref': ('area', 'area_arc'),
+    'area_geometry_ref': ('area',),
+    'area_piece': ('area',),
+}
+
+# Name of the manifest file of a directory of shards, which lists the
+# files of each country and table, written in the text format of the
+# PostgreSQL command COPY, and suffix of the marker file written next to
+# a shard that has been loaded into the database.
+SHARD_MANIFEST_FILE_NAME = 'manifest.json'
+SHARD_LOADED_MARKER_FILE_NAME_SUFFIX = '.loaded'
+
+# Name of the file of a shared work directory that lists the countries
+# that the workers need to process, and the settings of their output.
+# The lease of a country by a worker is a file ``(country_code).lease.
+# (generation)``, the part written by this worker a file or a directory
+# ``(country_code).(generation).part``, and the completion marker of
+# this country a file ``(country_code).done``.
+WORK_QUEUE_FILE_NAME = 'queue.json'
+WORK_QUEUE_LEASE_FILE_NAME_INFIX = '.lease.'
+WORK_QUEUE_PART_FILE_NAME_SUFFIX = '.part'
+WORK_QUEUE_DONE_MARKER_FILE_NAME_SUFFIX = '.done'
+
+# Time in seconds after which the lease of a country, which the worker
+# holding it has not renewed, is considered stale, and can be claimed by
+# another worker.
+WORK_QUEUE_LEASE_EXPIRATION_TIME = 60 * 10
+
+# Maximum interval in seconds between two renewals of its leases by a
+# worker, and interval between two attempts of a worker to claim a
+# country when all the remaining countries are leased by other workers.
+WORK_QUEUE_HEARTBEAT_INTERVAL = 30
+WORK_QUEUE_POLLING_INTERVAL = 5
+
+# Schema of the tables that the benchmark creates in the PostgreSQL
+# database, without index, before loading the SQL commands generated by
+# the script, and list of the indexes that the benchmark then builds,
+# timing each of them.
+BENCHMARK_SCHEMA = """
+    CREATE EXTENSION IF NOT EXISTS postgis;
+
+    DROP TABLE IF EXISTS area_piece, area_geometry_ref, area_arc_ref, area_arc, area_index, area_label, area, _gadm2sql_deferred_ddl CASCADE;
+
+    CREATE TABLE area(
+      area_id uuid NOT NULL,
+      parent_area_id uuid NULL,
+      area_code text NOT NULL,
+      area_type text NULL,
+      area_level smallint NOT NULL,
+      boundaries geometry(MultiPolygon, 4326) NULL);
+
+    CREATE TABLE area_label(
+      area_id uuid NOT NULL,
+      content text NOT NULL);
+
+    CREATE TABLE area_index(
+      area_id uuid NOT NULL,
+      keyword text NOT NULL);
+
+    CREATE TABLE area_arc(
+      arc_id uuid NOT NULL,
+      path geometry(LineString, 4326) NOT NULL);
+
+    CREATE TABLE area_arc_ref(
+      area_id uuid NOT NULL,
+      ring_index integer NOT NULL,
+      arc_index integer NOT NULL,
+      arc_id uuid NOT NULL,
+      is_reversed boolean NOT NULL);
+
+    CREATE TABLE area_geometry_ref(
+      area_id uuid NOT NULL,
+      geometry_area_id uuid NOT NULL);
+
+    CREATE TABLE area_piece(
+      area_id uuid NOT NULL,
+      geom geometry(Polygon, 4326) NOT NULL);
+    """
+
+BENCHMARK_INDEXES = [
+    ('pk_area', 'ALTER TABLE area ADD CONSTRAINT pk_area PRIMARY KEY (area_id)'),
+    ('idx_area__parent_area_id', 'CREATE INDEX idx_area__parent_area_id ON area(parent_area_id)'),
+    ('idx_area__boundaries', 'CREATE INDEX idx_area__boundaries ON area USING GIST (boundaries)'),
+    ('idx_area_label__area_id', 'CREATE INDEX idx_area_label__area_id ON area_label(area_id)'),
+    ('idx_area_index__keyword', 'CREATE INDEX idx_area_index__keyword ON area_index(keyword text_pattern_ops)'),
+    ('pk_area_arc', 'ALTER TABLE area_arc ADD CONSTRAINT pk_area_arc PRIMARY KEY (arc_id)'),
+    ('idx_area_arc_ref__area_id', 'CREATE INDEX idx_area_arc_ref__area_id ON area_arc_ref(area_id)'),
+    ('pk_area_geometry_ref', 'ALTER TABLE area_geometry_ref ADD CONSTRAINT pk_area_geometry_ref PRIMARY KEY (area_id)'),
+    ('idx_area_piece__geom', 'CREATE INDEX idx_area_piece__geom ON area_piece USING GIST (geom)'),
+]
+
+# Number of executions of each query whose latency the benchmark
+# measures, and default name of the file, in JSON Lines format, which
+# the results of the benchmark are appended to.
+BENCHMARK_QUERY_EXECUTION_COUNT = 20
+BENCHMARK_RESULT_FILE_NAME = 'gadm2sql-benchmark.jsonl'
+
 # Maximum time in seconds that the Global Administrative Areas (GADM)
 # ZIP archives stored in the local cache are allowed to be reused.
 # When this time expires, the script needs to fetch data from the
@@ -371,6 +588,87 @@ GADM_ESRI_ARCHIVE_URL_TEMPLATE = 'http://biogeo.ucdavis.edu/data/gadm2.8/mdb/%s_
 # Administrative Areas (GADM) project.
 GADM_SHAPEFILE_ARCHIVE_URL_TEMPLATE = 'http://biogeo.ucdavis.edu/data/gadm2.8/shp/%s_adm_shp.zip'
 
+# Minimum number of Latin letters of a word, decoded from a dBase IV
+# file, which letters are all non-ASCII, for this word to be considered
+# as the text of another script decoded with a wrong Latin code page.
+DBASE_MOJIBAKE_WORD_MIN_LENGTH = 4
+
+# Code pages of the text stored in a dBase IV file, indexed by the
+# language driver identifier written in the header of this file, as
+# defined by the ESRI specification of the ``.dbf`` format.
+DBASE_LANGUAGE_DRIVER_CODE_PAGES = {
+    0x01: 'cp437',
+    0x02: 'cp850',
+    0x03: 'cp1252',
+    0x08: 'cp865',
+    0x09: 'cp437',
+    0x0A: 'cp850',
+    0x0B: 'cp437',
+    0x0D: 'cp437',
+    0x0E: 'cp850',
+    0x0F: 'cp437',
+    0x10: 'cp850',
+    0x11: 'cp437',
+    0x12: 'cp850',
+    0x13: 'cp932',
+    0x14: 'cp850',
+    0x15: 'cp437',
+    0x16: 'cp850',
+    0x17: 'cp865',
+    0x18: 'cp437',
+    0x19: 'cp437',
+    0x1A: 'cp850',
+    0x1B: 'cp437',
+    0x1C: 'cp863',
+    0x1D: 'cp850',
+    0x1F: 'cp852',
+    0x22: 'cp852',
+    0x23: 'cp852',
+    0x24: 'cp860',
+    0x25: 'cp850',
+    0x26: 'cp866',
+    0x37: 'cp850',
+    0x40: 'cp852',
+    0x4D: 'cp936',
+    0x4E: 'cp949',
+    0x4F: 'cp950',
+    0x50: 'cp874',
+    0x57: 'cp1252',
+    0x58: 'cp1252',
+    0x59: 'cp1252',
+    0x64: 'cp852',
+    0x65: 'cp866',
+    0x66: 'cp865',
+    0x67: 'cp861',
+    0x6A: 'cp737',
+    0x6B: 'cp857',
+    0x78: 'cp950',
+    0x79: 'cp949',
+    0x7A: 'cp936',
+    0x7B: 'cp932',
+    0x7C: 'cp874',
+    0x86: 'cp737',
+    0x87: 'cp852',
+    0x88: 'cp857',
+    0xC8: 'cp1250',
+    0xC9: 'cp1251',
+    0xCA: 'cp1254',
+    0xCB: 'cp1253',
+    0xCC: 'cp1257',
+}
+
+# Regular expression that matches the name of the shape file entry of
+# a given administrative level in a GADM ZIP archive, whatever this
+# archive contains the data of one country (``{country_code}_adm{level}.shp``)
+# or the data of the whole world (``gadm28_adm{level}.shp``).
+GADM_SHAPE_ENTRY_NAME_REGEX = re.compile(r'^(?:.*/)?([^/]+)_adm(\d+)\.shp$', re.IGNORECASE)
+
+# Size in bytes of the shapes, and of the dBase IV records, of a country
+# that the script keeps in memory while splitting a global GADM archive,
+# before spooling these data to a temporary file on the disk.  A split
+# is kept per country of an administrative level, i.e., about 250 splits.
+GADM_SPLIT_SPOOL_MAX_SIZE = 1024 * 256
+
 # Character to request ``mdb-export`` to use to separate columns while
 # exported data of a given ESRI geodatabase table into a CVS-like
 # output.
@@ -382,22 +680,53 @@ MDB_COLUMN_DELIMITER = '@'
 MDB_ROW_DELIMITER = '$'
 
 
-# Python determines the encoding of stdout and stderr based on the
-# value of the ``LC_CTYPE`` variable, but only if the stdout is a tty.
-# So if you just output to the terminal, ``LC_CTYPE`` (or ``LC_ALL``)
-# define the encoding.  However, when the output is piped to a file or
-# to a different process, the encoding is not defined, and defaults to
-# 7-bit ASCII, which raise the following exception when outputting
-# unicode characters:
+# Named tuple of the data of a country fetched by the function
+# ``fetch_country_data``, as documented by this function.
+CountryData = collections.namedtuple('CountryData', [
+    'country_code',
+    'administrative_level_count',
+    'shape_zip_file_path_name',
+    'esri_zip_file_path_name',
+    'dbase_encodings',
+    'catalog',
+])
+
+# Named tuple of an administrative subdivision yielded by the function
+# ``iter_subdivisions``:
+#
+# * ``area_id``: the identification of the subdivision (``uuid.UUID``).
 #
-#   ``UnicodeEncodeError: 'ascii' codec can't encode character u'\x..' in position 18: ordinal not in range(128).``
+# * ``parent_area_id``: the identification of the parent subdivision, or
+#   ``None`` for a country.
 #
-# @note: using the environment variable ``PYTHONIOENCODING`` is
-#     another solution, however it requires the user to prefix the
-#     command line with ``PYTHONIOENCODING=utf-8``, which is more
-#     cumbersome.
-sys.stdout = codecs.getwriter(sys.stdout.encoding if sys.stdout.isatty() \
-        else locale.getpreferredencoding())(sys.stdout)
+# * ``country_code``: the ISO 3166-1 alpha-3 code of the country.
+#
+# * ``area_code``, ``parent_area_code``: the dot-separated codes of the
+#   subdivision and of its parent.
+#
+# * ``area_level``: the administrative level of the subdivision.
+#
+# * ``area_type``: the type of the subdivision, or ``None``.
+#
+# * ``name``: the name of the subdivision.
+#
+# * ``boundaries``: a list of NumPy arrays of shape ``(n, 2)`` of the
+#   coordinates ``(longitude, latitude)`` of the closed boundaries of
+#   the subdivision.  The boundaries of a subdivision that references
+#   the identical boundaries of another subdivision, when they have been
+#   deduplicated, are resolved to the boundaries of this other
+#   subdivision, and are thus never ``None``.
+AreaRecord = collections.namedtuple('AreaRecord', [
+    'area_id',
+    'parent_area_id',
+    'country_code',
+    'area_code',
+    'parent_area_code',
+    'area_level',
+    'area_type',
+    'name',
+    'boundaries',
+])
 
 
 class AdministrativeSubdivision(object):
@@ -416,7 +745,7 @@ class AdministrativeSubdivision(object):
     # reference an administrative division in the GADM database.
     CODE_ALLOWED_CHARACTERS = string.digits + '.'
 
-    def __init__(self, code, name, level, area_type, boundaries):
+    def __init__(self, code, name, level, area_type, boundaries, encoding=None):
         """
         Build a ``AdministrativeSubdivision`` instance which data are
         retrieved from a GADM shape file (boundaries of this administrative
@@ -456,12 +785,18 @@ class AdministrativeSubdivision(object):
             boundary of one geographical area of the administrative
             subdivision.  A boundary is a list of tuples of geographical
             coordinates ``(longitude, latitude)`` that define a closed line
-            (the perimeter) of this area.
+            (the perimeter) of this area.  Each boundary is stored as a NumPy
+            array of shape ``(n, 2)``.
 
                 [
                   ((lon1, lat1), (lon2, lat2), ... , (lon1, lat1)), # area 1
                   ...
                 ]
+
+        @param encoding: the code page of the dBase IV file that the name
+            and the type of this subdivision have been read from, when this
+            code page has been determined.  The name and the type are then
+            decoded as they are, instead of being converted to ASCII.
         """
         self.id = uuid.uuid4()
         self.code = AdministrativeSubdivision.cleanse_subdivision_code(code)
@@ -479,11 +814,14 @@ class AdministrativeSubdivision(object):
         # which results in encoding issue.  We need to convert them to ASCII
         # characters; this name will be overrided later on when parsing the
         # ESRI geodatabase, a Microsoft Access file, that supports UTF-8.
-        try:
-            probable_encoding = chardet.detect(name)
-            self.name = unidecode.unidecode(name.decode(probable_encoding['encoding'] or 'cp1251'))
-        except UnicodeDecodeError: # 'charmap' codec can't decode byte 0x8f in position 1: character maps to <undefined>
-            self.name = u''.join([ c for c in name if ord(c) < 128 ])
+        if encoding:
+            self.name = name.decode(encoding)
+        else:
+            try:
+                probable_encoding = chardet.detect(name)
+                self.name = unidecode.unidecode(name.decode(probable_encoding['encoding'] or 'cp1251'))
+            except UnicodeDecodeError: # 'charmap' codec can't decode byte 0x8f in position 1: character maps to <undefined>
+                self.name = u''.join([ c for c in name if ord(c) < 128 ])
 
         # [PATCH:20170312] ERROR: literal carriage return found in data
         self.name = self.name.replace('\n', '').replace('\r', '')
@@ -496,16 +834,31 @@ class AdministrativeSubdivision(object):
         # which results in encoding issue.  We need to convert them to ASCII
         # characters; this name will be overrided later on when parsing the
         # ESRI geodatabase, a Microsoft Access file, that supports UTF-8.
-        self.area_type = unidecode.unidecode(unicode(area_type, 'cp1252')) if area_type else \
-            ('country' if level == 0 else None)
+        if encoding:
+            self.area_type = unicode(area_type, encoding) if area_type else ('country' if level == 0 else None)
+        else:
+            self.area_type = unidecode.unidecode(unicode(area_type, 'cp1252')) if area_type else \
+                ('country' if level == 0 else None)
 
-        self.boundaries = boundaries
+        self.boundaries = [ numpy.asarray(boundary, dtype=numpy.float64) for boundary in boundaries ]
+
+        # List of the arcs of each boundary, when the topology of the
+        # boundaries of the country has been built.
+        self.arcs = None
+
+        # Administrative subdivision which boundaries are identical to the
+        # boundaries of this subdivision, and which are written instead,
+        # when the boundaries of the country have been deduplicated.
+        self.geometry_reference = None
+
+        # List of the pieces of a maximum number of vertices which the
+        # boundaries of this subdivision are subdivided into, when requested.
+        self.pieces = None
 
         # [PATCH:20160302] Check whether the coordinate values of the boundaries
         # of this administrative subdivision are in the range [-180 -90, 180 90].
-        invalid_coordinates = [ (longitude, latitude) for boundary in boundaries
-                for (longitude, latitude) in boundary
-                    if not (-180.0 <= longitude <= 180) and (-90 <= latitude <= 90) ]
+        invalid_coordinates = [ (longitude, latitude) for boundary in self.boundaries
+                for (longitude, latitude) in boundary[(numpy.abs(boundary[:, 0]) > 180) | (numpy.abs(boundary[:, 1]) > 90)].tolist() ]
         if invalid_coordinates:
             print '[WARNING] Invalid coordinates of subdivision %s:' % self.name, invalid_coordinates
 
@@ -526,322 +879,3932 @@ class AdministrativeSubdivision(object):
         cleansed_code = ''.join([ c for c in code if c in AdministrativeSubdivision.CODE_ALLOWED_CHARACTERS ])
         return '.'.join([ subcode for subcode in cleansed_code.split('.') if len(subcode) > 0 ])
 
+    @staticmethod
+    def restore(code, parent_code, name, level, area_type, boundaries):
+        """
+        Build a ``AdministrativeSubdivision`` instance from data that have
+        been already parsed, decoded, and linked to the parent of this
+        administrative subdivision, such as stored in the cache.
 
-def build_administrative_subdivisions(zip_file, country_code, administrative_level_count):
-    """
-    Download the ZIP archive of the shape files of the administrative
-    subdivisions of the specified country, uncompress it into memory, and
-    retrieve the geographical boundaries, from the first-level -- which is
-    the largest administrative subdivision of a country -- to the smallest
-    administrative level, which depends on this country.
-
-    The Database of Global Administrative Areas (GADM) provides a ZIP
-    archive which contains the following mandatory files:
 
-    * (country_code)_adm(administrative_level).shp: the geographical
-      boundaries of all the administrative subdivision of this country of
-      a particular administrative level.
+        @param code: the code of the administrative subdivision.
 
-    * (country_code)_adm(administrative_level).dbf: columnar attributes, in
-      dBase IV format for each administrative subdivision shape of this
-      country of a particular administrative level.
+        @param parent_code: the code of the parent of this administrative
+            subdivision.
 
-    This ZIP archive may contain additional file that this function
-    doesn't uses.
+        @param name: the name of this administrative subdivision.
 
+        @param level: the administrative level of this subdivision.
 
-    @param country_code: an ISO 3166-1 alpha-2 code representing the
-        country to retrieve is administrative subdivision shapes.
+        @param area_type: the type of this administrative subdivision.
 
+        @param boundaries: a list of NumPy arrays of the coordinates of
+            the boundaries of this administrative subdivision.
 
-    @return: a dictionary of ``AdministrativeSubdivision`` instances of
-        all the administrative subdivisions of this country, whatever
-        their administrative level.  The key corresponds to the code of
-        an administrative subdivision, while the value is the instance
-        itself.
 
-    @raise Exception: if a network issue occurs.
+        @return: a ``AdministrativeSubdivision`` instance, with a new
+            identification.
+        """
+        subdivision = AdministrativeSubdivision.__new__(AdministrativeSubdivision)
+        subdivision.id = uuid.uuid4()
+        subdivision.code = code
+        subdivision.parent_code = parent_code
+        subdivision.name = name
+        subdivision.level = level
+        subdivision.area_type = area_type
+        subdivision.boundaries = boundaries
+        subdivision.arcs = None
+        subdivision.geometry_reference = None
+        subdivision.pieces = None
+        return subdivision
+
+
+class OutputWriter(object):
     """
-    administrative_subdivisions = {}
+    Represent a writer of the administrative subdivisions of countries to
+    an output file of a given format.
+
+    Countries are processed in parallel by distinct processes, each of
+    them writing the administrative subdivisions of its country to a part
+    of the output, with its own writer instance.  The writer of the output
+    file then appends these parts as countries complete.
+
+    The method ``write_country`` is abstract, and needs to be implemented
+    by every subclass.  The method ``append_part`` concatenates the bytes
+    of the parts by default, and needs to be overridden by the formats
+    which output is not the concatenation of the output of each country.
+    """
+    def __init__(self, file_path_name, part=False):
+        """
+        Build a writer of the specified output file.
 
-    for administrative_level in range(administrative_level_count):
-        print '[INFO] Parsing administrative level %d...' % administrative_level
-        shape_memory_mapped_file = zip_util.open_entry_file(zip_file, '%s_adm%d.shp' % (country_code, administrative_level))
-        dbase_memory_mapped_file = zip_util.open_entry_file(zip_file, '%s_adm%d.dbf' % (country_code, administrative_level))
-        reader = shapefile.Reader(shp=shape_memory_mapped_file, dbf=dbase_memory_mapped_file)
 
-        field_names = [ field[0] for field in reader.fields[1:] ]
+        @param file_path_name: absolute path and name of the output file, or
+            ``None`` to write to the standard output, if the format supports
+            it.
+
+        @param part: indicate whether this writer writes a part of the
+            output, which is intended to be appended to the output file by
+            another writer.
+        """
+        self.file_path_name = file_path_name
+        self.part = part
 
-        for shapeRecord in reader.shapeRecords():
-            attributes = dict(zip(field_names, shapeRecord.record))
+        # File object of the output, opened by the subclasses which output
+        # is written as a stream of bytes.
+        self.file_handle = None
 
-            geometry = shapeRecord.shape.__geo_interface__
-            geomerty_type = geometry['type']
-            if geomerty_type != 'Polygon' and geomerty_type != 'MultiPolygon':
-                raise Exception('Unexpected geometry type "%s"' % geomerty_type)
+    def append_part(self, part_file_path_name):
+        """
+        Append a part, written by another writer of the same format, to the
+        output file.
 
-            geomerty_coordinates = geometry['coordinates']
+        By default, the bytes of the part are copied to the file object of
+        this writer, as the output of the formats, such as the COPY
+        commands of ``SqlCopyWriter``, that is the concatenation of the
+        output of each country.
 
-            administrative_subdivision = AdministrativeSubdivision(
-                    '.'.join([ str(attributes['ID_%d' % i]) for i in range(administrative_level + 1) ]),
-                     attributes['NAME_ENGLI'].strip() if administrative_level == 0 \
-                            else attributes['NAME_%d' % administrative_level].strip(), # VARNAME_%d not always exists
-                     administrative_level,
-                     'Country' if administrative_level == 0 else attributes['ENGTYPE_%d' % administrative_level].strip(),
-                     [ geomerty_coordinates[0] ] if geomerty_type == 'Polygon' else [ geometry[0] for geometry in geomerty_coordinates ])
+        @param part_file_path_name: absolute path and name of the part.
+        """
+        with open(part_file_path_name, 'rb') as file_handle:
+            shutil.copyfileobj(file_handle, self.file_handle)
 
-            # [PATCH:20150615] Check this subdivision has a parent, and if not,
-            # try to link this subdivision to a grand-parent.
-            if administrative_subdivision.level > 0:
-                subcodes = administrative_subdivision.code.split('.')
-                parent_subdivision_code = '.'.join([ subcode for subcode in subcodes[:-1] ])
-                if not administrative_subdivisions.get(parent_subdivision_code):
-                    while True:
-                        subcodes = subcodes[:-1]
-                        parent_subdivision_code = '.'.join([ subcode for subcode in subcodes[:-1] ])
-                        parent_subdivision = administrative_subdivisions.get(parent_subdivision_code)
-                        if parent_subdivision:
-                            sys.stderr.write('[WARNING] %s (%s-%s) does have a direct parent; fix with grand parent %s\n' % \
-                                    (administrative_subdivision.name, country_code, administrative_subdivision.code, parent_subdivision.code))
-                            administrative_subdivision.parent_code = parent_subdivision_code
-                            break
+    def close(self):
+        """
+        Complete the output file and release the resources of this writer.
+        """
+        pass
 
-                        else:
-                            if len(subcodes) == 1:
-                                sys.stderr.write('[ERROR] The administrative subdivision %s (%s-%s) CANNOT be linked to a parent!\n' % \
-                                    (administrative_subdivision.name, country_code, administrative_subdivision.code))
-                                break
+    def write_country(self, country_code, administrative_subdivisions):
+        """
+        Write the administrative subdivisions of a country.
 
-            administrative_subdivisions[administrative_subdivision.code] = administrative_subdivision
+        @param country_code: an ISO 3166-1 alpha-3 code representing the
+            country of the administrative subdivisions.
 
-    return administrative_subdivisions
+        @param administrative_subdivisions: a dictionary of
+            ``AdministrativeSubdivision`` instances of all the administrative
+            subdivisions of this country.  The key corresponds to the code of
+            an administrative subdivision, while the value is the instance
+            itself.
 
+        @raise NotImplementedError: if the subclass doesn't implement this
+            abstract method.
+        """
+        raise NotImplementedError('%s does not implement the method write_country' % self.__class__.__name__)
 
-def extract_esri_files(zip_file, country_code, administrative_level_count):
+
+class CopyOutputBuffer(object):
     """
-    Providing a ZIP archive file of a Environmental Systems Research
-    Institute (ESRI) geodatabase, this function returns a list of files
-    where it has stored CSV-formatted data extracted from the Microsoft
-    Access database for every administrative subdivision of the given
-    country.  There is one file per administrative subdivision level.
+    Assemble the rows written in the text format of the PostgreSQL
+    command COPY into large buffers, which are encoded in UTF-8 and
+    written to a file with a single call, instead of encoding and writing
+    each row.
+    """
+    def __init__(self, file_handle, buffer_size=COPY_OUTPUT_BUFFER_SIZE, checksum=None):
+        """
+        Build a buffer of the output to a file.
 
-    @param zip_file: a ESRI ZIP archive instance.
 
-    @param country_code: a ISO 3166-1 alpha-2 code referencing the
-        country of the administrative subdivisions stored in the given
-        ESRI geodatabase.
+        @param file_handle: a file-like object opened in binary mode.
 
-    @param administrative_level_count: the number of administrative
-        subdivision levels defined for this country
+        @param buffer_size: number of characters to assemble before
+            writing them to the file.
 
+        @param checksum: a hash object, such as returned by
+            ``hashlib.sha256``, to update with the bytes written to the
+            file, if any.
+        """
+        self.file_handle = file_handle
+        self.buffer_size = buffer_size
+        self.checksum = checksum
+        self.size = 0
 
-    @return: a list of absolute path and name of files containing the CSV
-        data of each administrative subdivision of the given country.
-        These files are sorted by ascending order of their administrative
-        subdivision level (the data of country level have been stripped
-        from this list as they do not contain any interested information).
+        self.__pieces = []
+        self.__piece_length = 0
 
+    def flush(self):
+        """
+        Write the assembled text to the file.
+        """
+        if self.__pieces:
+            data = u''.join(self.__pieces).encode('utf-8')
+            self.__pieces = []
+            self.__piece_length = 0
 
-    @note: the caller is responsible for deleting the files returned by
-        this function.
-    """
-    # Extract the ESRI archive in a temporary file that this function will
-    # delete later.
-    mdb_file_entry_name = '%s_adm.mdb' % country_code
-    (fd, mdb_file_path_name) = tempfile.mkstemp()
-    with os.fdopen(fd, 'wb') as file_handle:
-        file_handle.write(zip_file.read(mdb_file_entry_name))
+            self.file_handle.write(data)
+            if self.checksum is not None:
+                self.checksum.update(data)
+            self.size += len(data)
 
-    # Export each administrative subdivision data in the MDB database
-    # table to a CSV-formatted file.
-    file_path_names = []
+    def write(self, text):
+        """
+        Append text to the buffer, writing the buffer to the file when it
+        is full.
 
-    for administrative_level in range(1, administrative_level_count): # Skip country level (nothing interesting to retrieve)
-        command_line = 'mdb-export -Q -d %s -R %s -b strip %s %s' % \
-                (MDB_COLUMN_DELIMITER,
-                 MDB_ROW_DELIMITER,
-                 mdb_file_path_name,
-                 '%s_adm%d' % (country_code.replace('-', '_'), administrative_level))
 
-        (fd, file_path_name) = tempfile.mkstemp()
-        file_path_names.append(file_path_name)
-        with os.fdopen(fd, 'wt') as file_handle:
-            file_handle.write(subprocess.check_output(command_line, shell=True))
+        @param text: a string or a Unicode string.
+        """
+        self.__pieces.append(text)
+        self.__piece_length += len(text)
+        if self.__piece_length >= self.buffer_size:
+            self.flush()
 
-    # Delete the temporary file.
-    os.remove(mdb_file_path_name)
+    def write_rows(self, rows):
+        """
+        Append rows to the buffer, each followed by a line terminator.
 
-    return file_path_names
 
+        @param rows: an iterable of rows, without line terminator.
 
-def fetch_archive_file(archive_url,
-        archive_file_name=None,
-        memory_mapped=False,
-        cache_path=None,
-        cache_required=False,
-        cache_expiration_time=GADM_CACHE_EXPIRATION_TIME):
+
+        @return: the number of rows.
+        """
+        row_count = 0
+        for row in rows:
+            self.write(row)
+            self.write('\n')
+            row_count += 1
+        return row_count
+
+
+class DBaseFileHeader(object):
     """
-    Fetch a GADM ZIP archive referenced by the specified Uniform Resource
-    Locator (URL) from either the local cache, either the GADM server.
+    Represent the header of a dBase IV file, as stored at the beginning
+    of the ``.dbf`` file that comes with a shape file.  The header
+    describes the number of records stored in this file, the length of
+    each record, and the list of fields composing a record.
+    """
+    def __init__(self, data):
+        """
+        Build a ``DBaseFileHeader`` instance from the raw bytes of the
+        header of a dBase IV file, including the field descriptor array
+        and its terminator.
 
+        @param data: the raw bytes of the header of the dBase IV file.
+        """
+        self.data = data
+        (self.record_count, self.header_length, self.record_length) = struct.unpack('<IHH', data[4:12])
+        self.language_driver_id = ord(data[29])
+
+        # Each field descriptor is 32-byte long; the first byte of a record
+        # is the deletion flag of this record.
+        self.fields = []
+        field_offset = 1
+        for i in range(32, len(data) - 1, 32):
+            descriptor = data[i:i + 32]
+            if descriptor[0] == '\x0d':
+                break
+            field_name = descriptor[:11].split('\x00')[0]
+            field_length = ord(descriptor[16])
+            self.fields.append((field_name, descriptor[11], field_offset, field_length))
+            field_offset += field_length
+
+    def get_field_value(self, record, field_name):
+        """
+        Return the raw value of a field of the specified record.
 
-    @param archive_url: Uniform Resource Locator (URL) referencing the
-        GADM ZIP archive to fetch.
+        @param record: the raw bytes of a record of the dBase IV file.
 
-    @param url: Uniform Resource Locator that specifies the location of
-        the ZIP archive file on a computer network and a mechanism for
-        retrieving it.
+        @param field_name: the name of the field to return the value.
 
-    @param archive_file_name: The name of the file in which the archive
-        will be stored in.  If not defined, the function downloads the
-        archive file in a temporary file created in the most secure
-        manner possible; the user is responsible for deleting this
-        temporary file when done with it.
 
-    @param memory_mapped: indicate whether to map the ZIP archive file-
-        like object into memory, for performance optimization, or whether
-        to store this archive into disk, for memory optimization.
-        If the archive is directly stored into disk, the caller is
-        responsible for deleting the temporary file when done with it.
+        @return: the raw value of the field, stripped from its padding
+            characters, or ``None`` if no field has this name.
+        """
+        for (name, _, offset, length) in self.fields:
+            if name == field_name:
+                return record[offset:offset + length].strip()
 
-    @param cache_path: absolute path of the cache where downloaded files
-        are stored in.
+    @staticmethod
+    def read(file_handle):
+        """
+        Read the header of a dBase IV file from the specified file-like
+        object, which position is then moved to the first record.
 
-    @param cache_required: indicate whether the store the downloaded files
-        in the local cache, or whether to generate temporary files that
-        the caller is responsible for deleting.
+        @param file_handle: a file-like object positioned at the beginning
+            of a dBase IV file.
 
-    @param cache_expiration_time: time in seconds during which the cached
-        representation of the GADM data is considered fresh.  Fresh data
-        are served directly from the cache, otherwise they are fetched
-        from the origin server.
 
+        @return: a ``DBaseFileHeader`` instance.
+        """
+        data = file_handle.read(32)
+        (header_length,) = struct.unpack('<H', data[8:10])
+        return DBaseFileHeader(data + file_handle.read(header_length - 32))
 
-    @return: a tuple ``(file_path_name, zip_file)`` where:
 
-    * ``file_path_name``: the absolute path and name of the file where
-      the ZIP archive has been downloaded and stored in.
+class FlatGeobufWriter(OutputWriter):
+    """
+    Write the administrative subdivisions to a `FlatGeobuf
+    <https://flatgeobuf.org/>`_ file, with a packed Hilbert R-tree index
+    of the bounding boxes of their boundaries.
 
-    * ``zip_file``: a ``ZipFile`` instance of the remote ZIP archive
-      file.
+    @note: this writer requires the Python bindings of GDAL/OGR 3.1+.
     """
-    zip_file = None
+    # List of the attributes of a feature, and their OGR type name.
+    FIELDS = [
+        ('area_id', 'OFTString'),
+        ('parent_area_id', 'OFTString'),
+        ('country_code', 'OFTString'),
+        ('area_code', 'OFTString'),
+        ('area_type', 'OFTString'),
+        ('area_level', 'OFTInteger'),
+        ('name', 'OFTString'),
+    ]
+
+    def __init__(self, file_path_name, part=False):
+        super(FlatGeobufWriter, self).__init__(file_path_name, part=part)
+        if not file_path_name:
+            raise Exception('The FlatGeobuf format cannot be written to the standard output')
 
-    if cache_required:
-        assert cache_path, 'The GADM cache path is not defined'
+        try:
+            from osgeo import ogr
+            from osgeo import osr
+        except ImportError:
+            raise Exception('The Python bindings of GDAL/OGR have not been found while they are required to write FlatGeobuf files')
+
+        self.ogr = ogr
+
+        spatial_reference = osr.SpatialReference()
+        spatial_reference.ImportFromEPSG(4326)
+
+        # The index of the parts is useless, as their features are copied
+        # to the output file, which index is built when it is closed.
+        driver = ogr.GetDriverByName('FlatGeobuf')
+        if os.path.exists(file_path_name):
+            driver.DeleteDataSource(file_path_name)
+        self.data_source = driver.CreateDataSource(file_path_name)
+        self.layer = self.data_source.CreateLayer('area', spatial_reference, ogr.wkbMultiPolygon,
+                ['SPATIAL_INDEX=%s' % ('NO' if part else 'YES')])
+
+        for (field_name, field_type_name) in FlatGeobufWriter.FIELDS:
+            self.layer.CreateField(ogr.FieldDefn(field_name, getattr(ogr, field_type_name)))
+
+    def append_part(self, part_file_path_name):
+        part_data_source = self.ogr.Open(part_file_path_name)
+        for part_feature in part_data_source.GetLayer():
+            feature = self.ogr.Feature(self.layer.GetLayerDefn())
+            feature.SetFrom(part_feature)
+            self.layer.CreateFeature(feature)
+        part_data_source = None
+
+    def close(self):
+        # OGR writes the index and closes the file when the data source is
+        # dereferenced.
+        self.layer = None
+        self.data_source = None
+
+    def write_country(self, country_code, administrative_subdivisions):
+        for subdivision in administrative_subdivisions.itervalues():
+            feature = self.ogr.Feature(self.layer.GetLayerDefn())
+            feature.SetField('area_id', str(subdivision.id))
+            if subdivision.level > 0:
+                feature.SetField('parent_area_id', str(administrative_subdivisions[subdivision.parent_code].id))
+            feature.SetField('country_code', country_code)
+            feature.SetField('area_code', subdivision.code)
+            if subdivision.area_type:
+                feature.SetField('area_type', subdivision.area_type.encode('utf-8'))
+            feature.SetField('area_level', subdivision.level)
+            feature.SetField('name', subdivision.name.encode('utf-8'))
+            feature.SetGeometry(self.ogr.CreateGeometryFromWkb(build_wkb_multipolygon(subdivision.boundaries)))
+            self.layer.CreateFeature(feature)
+
+
+class GeoParquetWriter(OutputWriter):
+    """
+    Write the administrative subdivisions to a `GeoParquet
+    <https://geoparquet.org/>`_ file, with their boundaries encoded in
+    Well-Known Binary (WKB), and the coordinates of their bounding box
+    stored in the columns ``xmin``, ``ymin``, ``xmax``, and ``ymax``.
 
-        if not os.path.exists(cache_path):
-            file_util.make_directory_if_not_exists(cache_path)
+    The administrative subdivisions of a country are sorted along a
+    Hilbert curve, by the center of their bounding box, so that row
+    groups cover compact geographic areas and can be skipped by queries
+    filtering on the bounding box column.
 
-        zip_file_path_name = os.path.join(cache_path, archive_file_name)
-        if os.path.exists(zip_file_path_name) and time.time() - os.stat(zip_file_path_name).st_mtime < cache_expiration_time:
-            zip_file = zipfile.ZipFile(zip_file_path_name)
+    @note: this writer requires the Python library ``pyarrow``.
+    """
+    def __init__(self, file_path_name, part=False):
+        super(GeoParquetWriter, self).__init__(file_path_name, part=part)
+        if not file_path_name:
+            raise Exception('The GeoParquet format cannot be written to the standard output')
 
-    if not zip_file:
-        print '[INFO] Download %s' % archive_url
-        (zip_file, zip_file_path_name) = zip_util.download_archive_file(archive_url,
-                file_path_name=zip_file_path_name if cache_required else None,
-                memory_mapped=memory_mapped,
-                verbose=False)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise Exception('The Python library pyarrow has not been found while it is required to write GeoParquet files')
+
+        self.pyarrow = pyarrow
+
+        self.schema = pyarrow.schema([
+                ('area_id', pyarrow.string()),
+                ('parent_area_id', pyarrow.string()),
+                ('country_code', pyarrow.string()),
+                ('area_code', pyarrow.string()),
+                ('area_type', pyarrow.string()),
+                ('area_level', pyarrow.int16()),
+                ('name', pyarrow.string()),
+                ('geometry', pyarrow.binary()),
+                ('xmin', pyarrow.float64()),
+                ('ymin', pyarrow.float64()),
+                ('xmax', pyarrow.float64()),
+                ('ymax', pyarrow.float64()) ],
+            metadata={ 'geo': json.dumps({
+                'version': '1.0.0',
+                'primary_column': 'geometry',
+                'columns': {
+                    'geometry': {
+                        'encoding': 'WKB',
+                        'geometry_types': [ 'MultiPolygon' ] } } }) })
+
+        self.parquet = pyarrow.parquet
+        self.parquet_writer = pyarrow.parquet.ParquetWriter(file_path_name, self.schema)
+
+    def append_part(self, part_file_path_name):
+        self.parquet_writer.write_table(self.parquet.read_table(part_file_path_name),
+                row_group_size=GEOPARQUET_ROW_GROUP_SIZE)
+
+    def close(self):
+        self.parquet_writer.close()
+
+    def write_country(self, country_code, administrative_subdivisions):
+        rows = [ (subdivision, calculate_boundaries_bbox(subdivision.boundaries))
+                for subdivision in sort_administrative_subdivisions(administrative_subdivisions, 'global').itervalues() ]
+
+        columns = [
+                [ str(subdivision.id) for (subdivision, _) in rows ],
+                [ None if subdivision.level == 0 else str(administrative_subdivisions[subdivision.parent_code].id)
+                    for (subdivision, _) in rows ],
+                [ country_code ] * len(rows),
+                [ subdivision.code for (subdivision, _) in rows ],
+                [ subdivision.area_type for (subdivision, _) in rows ],
+                [ subdivision.level for (subdivision, _) in rows ],
+                [ subdivision.name for (subdivision, _) in rows ],
+                [ build_wkb_multipolygon(subdivision.boundaries) for (subdivision, _) in rows ] ] + \
+                [ [ bbox[i] for (_, bbox) in rows ] for i in range(4) ]
+
+        self.parquet_writer.write_table(
+                self.pyarrow.Table.from_arrays([ self.pyarrow.array(column, type=field.type)
+                        for (column, field) in zip(columns, self.schema) ], schema=self.schema),
+                row_group_size=GEOPARQUET_ROW_GROUP_SIZE)
+
+
+class ShapeFileSplit(object):
+    """
+    Represent the shapes and the dBase IV records of one country that are
+    extracted from a shape file covering the whole world.  The shapes and
+    the records are stored as they are, without being decoded, in
+    temporary files that are kept in memory until they grow too big.
+    """
+    def __init__(self):
+        self.shape_spool = tempfile.SpooledTemporaryFile(max_size=GADM_SPLIT_SPOOL_MAX_SIZE)
+        self.dbase_spool = tempfile.SpooledTemporaryFile(max_size=GADM_SPLIT_SPOOL_MAX_SIZE)
+        self.content_lengths = []
+        self.dbase_record_count = 0
+        self.bbox = None
+
+    def append(self, content, dbase_record):
+        """
+        Append a shape and its attributes to this split.
 
-    return zip_file, zip_file_path_name
+        @param content: the raw bytes of the content of a shape record,
+            without the record header.
 
+        @param dbase_record: the raw bytes of the dBase IV record of this
+            shape.
+        """
+        self.shape_spool.write(content)
+        self.content_lengths.append(len(content))
+        self.dbase_spool.write(dbase_record)
+        self.dbase_record_count += 1
+
+        (shape_type,) = struct.unpack('<i', content[:4])
+        if shape_type != 0: # Null shape has no bounding box.
+            (xmin, ymin, xmax, ymax) = struct.unpack('<4d', content[4:36])
+            self.bbox = (xmin, ymin, xmax, ymax) if self.bbox is None else \
+                (min(self.bbox[0], xmin), min(self.bbox[1], ymin), max(self.bbox[2], xmax), max(self.bbox[3], ymax))
+
+    def write(self, zip_file, entry_base_name, shape_type, dbase_header, additional_entries):
+        """
+        Write the shape file, its index, and its dBase IV file, to the
+        specified ZIP archive.
 
-def fetch_country_data(country_code,
-        cache_path=None,
-        cache_required=False,
-        cache_expiration_time=GADM_CACHE_EXPIRATION_TIME):
-    """
-    Fetch shape and ESRI ZIP archive files from either the locale cache,
-    either GADM Web site.  Extract shape and ESRI files of the available
-    administrative subdivisions of the specified country.
+        The shape file and the dBase IV file are written to temporary files
+        on the disk, which are then compressed to the ZIP archive chunk by
+        chunk, so that the data of a large country are never entirely kept
+        in memory.
 
+        @param zip_file: a ``ZipFile`` instance opened in write or append
+            mode.
 
-    @param country_code: an ISO 3166-1 alpha-2 code representing the
-        country to retrieve its administrative subdivision data.
+        @param entry_base_name: the name of the entries without extension,
+            such as ``{country_code}_adm{administrative_level}``.
 
-    @param cache_path: absolute path of the cache where downloaded files
-        are stored in.
+        @param shape_type: the type of the shapes stored in this file.
 
-    @param cache_required: indicate whether the store the downloaded files
-        in the local cache, or whether to generate temporary files that
-        the caller is responsible for deleting.
+        @param dbase_header: the ``DBaseFileHeader`` of the dBase IV file of
+            the whole world, which fields are the same for this split.
 
-    @param cache_expiration_time: time in seconds during which the cached
-        representation of the GADM data is considered fresh.  Fresh data
-        are served directly from the cache, otherwise they are fetched
-        from the origin server.
+        @param additional_entries: a dictionary of additional entries to
+            copy as they are, such as the ``.prj`` file.  The key corresponds
+            to the extension of the entry, while the value is its content.
+        """
+        def build_file_header(file_length):
+            return struct.pack('>7i', 9994, 0, 0, 0, 0, 0, file_length / 2) + \
+                   struct.pack('<2i', 1000, shape_type) + \
+                   struct.pack('<8d', *((self.bbox or (0.0, 0.0, 0.0, 0.0)) + (0.0, 0.0, 0.0, 0.0)))
 
+        shape_file_length = 100 + sum([ 8 + content_length for content_length in self.content_lengths ])
+        index_data = [ build_file_header(100 + 8 * len(self.content_lengths)) ]
 
-    @return: a tuple containing the following member in this order:
+        (file_descriptor, temporary_file_path_name) = tempfile.mkstemp()
+        try:
+            with os.fdopen(file_descriptor, 'wb') as shape_file_handle:
+                shape_file_handle.write(build_file_header(shape_file_length))
 
-        * ``country_code``: an ISO 3166-1 alpha-2 code representing the
-            country which the administrative subdivision data are
-            returned.
+                self.shape_spool.seek(0)
+                offset = 100
+                for (record_index, content_length) in enumerate(self.content_lengths):
+                    shape_file_handle.write(struct.pack('>2i', record_index + 1, content_length / 2))
+                    shape_file_handle.write(self.shape_spool.read(content_length))
+                    index_data.append(struct.pack('>2i', offset / 2, content_length / 2))
+                    offset += 8 + content_length
 
-        * ``administrative_level_count``: the number of administrative
-          subdivisions available for this country.
+            zip_file.write(temporary_file_path_name, '%s.shp' % entry_base_name)
 
-        * ``shape_zip_file_path_name``: the absolute path and name of the
-          shape ZIP archive file.
+            with open(temporary_file_path_name, 'wb') as dbase_file_handle:
+                dbase_file_handle.write(dbase_header.data[:4] + struct.pack('<I', self.dbase_record_count) + dbase_header.data[8:])
+                self.dbase_spool.seek(0)
+                shutil.copyfileobj(self.dbase_spool, dbase_file_handle)
+                dbase_file_handle.write('\x1a')
 
-        * ``esri_zip_file_path_name``: the absolute path and name of the
-          ESRI geodatabase ZIP archive file.
+            zip_file.write(temporary_file_path_name, '%s.dbf' % entry_base_name)
 
-        * ``esri_file_path_names``: a list of absolute path and name of
-          files containing the CSV data of each administrative subdivision
-          of the given country.  These files are sorted by ascending order
-          of their administrative subdivision level (the data of country
-          level have been stripped from this list as they do not contain
-          any interested information).
+        finally:
+            os.remove(temporary_file_path_name)
 
+        zip_file.writestr('%s.shx' % entry_base_name, ''.join(index_data))
 
-    @note: the caller is responsible for deleting the files returned by
-        this function, when the caller didn't want to cache them.
-    """
-    # Fetch the shape and the ESRI archives, either from the local cache,
-    # either directly form the GADM Web site.
-    shape_zip_file, shape_zip_file_path_name = fetch_archive_file(GADM_SHAPEFILE_ARCHIVE_URL_TEMPLATE % country_code,
-            archive_file_name='%s_gadm.dbf.zip' % country_code,
-            cache_path=cache_path,
-            cache_required=cache_required,
-            cache_expiration_time=cache_expiration_time,
-            memory_mapped=False)
+        for (extension, data) in additional_entries.iteritems():
+            zip_file.writestr('%s.%s' % (entry_base_name, extension), data)
 
-    # Determine the number of available administrative subdivisions for
+        self.shape_spool.close()
+        self.dbase_spool.close()
+
+
+class ShardedCopyWriter(OutputWriter):
+    """
+    Write the administrative subdivisions to a directory, with one file
+    (shard) per country and table, ``{country_code}/{table_name}.copy``,
+    in the text format of the PostgreSQL command ``COPY``, and a manifest
+    that lists these shards with their number of rows, their size, and
+    their SHA-256 checksum.
+
+    The function ``load_shards`` loads these shards into a database with
+    concurrent sessions.
+    """
+    def __init__(self, file_path_name, part=False):
+        super(ShardedCopyWriter, self).__init__(file_path_name, part=part)
+        if not file_path_name:
+            raise Exception('The shards cannot be written to the standard output')
+
+        # Only a directory of shards previously written by the script can be
+        # overridden.
+        if os.path.exists(file_path_name):
+            if not os.path.exists(os.path.join(file_path_name, SHARD_MANIFEST_FILE_NAME)) and os.listdir(file_path_name):
+                raise Exception('The directory %s is not empty while it contains no manifest of shards' % file_path_name)
+            shutil.rmtree(file_path_name)
+
+        file_util.make_directory_if_not_exists(file_path_name)
+        self.shards = []
+
+    def append_part(self, part_file_path_name):
+        with open(os.path.join(part_file_path_name, SHARD_MANIFEST_FILE_NAME)) as file_handle:
+            shards = json.load(file_handle)['shards']
+
+        for shard in shards:
+            file_util.make_directory_if_not_exists(os.path.join(self.file_path_name, shard['country_code']))
+            shutil.move(os.path.join(part_file_path_name, shard['file_name']),
+                    os.path.join(self.file_path_name, shard['file_name']))
+            self.shards.append(shard)
+
+    def close(self):
+        with open(os.path.join(self.file_path_name, SHARD_MANIFEST_FILE_NAME), 'wt') as file_handle:
+            json.dump({
+                    'tables': COPY_TABLE_COLUMNS + TOPOLOGY_COPY_TABLE_COLUMNS + GEOMETRY_REFERENCE_COPY_TABLE_COLUMNS + PIECE_COPY_TABLE_COLUMNS,
+                    'shards': self.shards },
+                file_handle, indent=2)
+
+    def write_country(self, country_code, administrative_subdivisions):
+        file_util.make_directory_if_not_exists(os.path.join(self.file_path_name, country_code))
+
+        for (table_name, _) in get_copy_table_columns(administrative_subdivisions):
+            shard_file_name = '%s/%s.copy' % (country_code, table_name)
+            with open(os.path.join(self.file_path_name, shard_file_name), 'wb') as file_handle:
+                output_buffer = CopyOutputBuffer(file_handle, checksum=hashlib.sha256())
+                row_count = output_buffer.write_rows(iter_copy_rows(table_name, administrative_subdivisions))
+                output_buffer.flush()
+
+            self.shards.append({
+                'country_code': country_code,
+                'table_name': table_name,
+                'file_name': shard_file_name,
+                'row_count': row_count,
+                'size': output_buffer.size,
+                'checksum': output_buffer.checksum.hexdigest() })
+
+
+class SqliteWriter(OutputWriter):
+    """
+    Write the administrative subdivisions to a single SQLite database,
+    with the tables ``area``, ``area_label``, and ``area_index``, and an
+    R*Tree virtual table ``area_rtree`` of the bounding boxes of the
+    boundaries of these administrative subdivisions, which ``id``
+    corresponds to the column ``area_rowid`` of the table ``area``.
+
+    The boundaries are stored in the Well-Known Binary (WKB) format,
+    which SpatiaLite reads with its function ``GeomFromWKB``.
+
+    The rows are inserted in batches, in one transaction per country,
+    while the secondary indexes are created once all the countries have
+    been written.  The database is then analyzed and vacuumed, resulting
+    in a compact file that is intended to be read only.
+    """
+    def __init__(self, file_path_name, part=False):
+        super(SqliteWriter, self).__init__(file_path_name, part=part)
+        if not file_path_name:
+            raise Exception('The SQLite format cannot be written to the standard output')
+
+        if os.path.exists(file_path_name):
+            os.remove(file_path_name)
+
+        self.connection = sqlite3.connect(file_path_name)
+        self.connection.executescript("""
+            PRAGMA page_size = %(page_size)d;
+            PRAGMA journal_mode = MEMORY;
+            PRAGMA synchronous = OFF;
+
+            CREATE TABLE area(
+              area_rowid INTEGER PRIMARY KEY,
+              area_id TEXT NOT NULL UNIQUE,
+              parent_area_id TEXT,
+              country_code TEXT NOT NULL,
+              area_code TEXT NOT NULL,
+              area_type TEXT,
+              area_level INTEGER NOT NULL,
+              boundaries BLOB NOT NULL);
+
+            CREATE TABLE area_label(
+              area_id TEXT NOT NULL,
+              content TEXT NOT NULL);
+
+            CREATE TABLE area_index(
+              area_id TEXT NOT NULL,
+              keyword TEXT NOT NULL);
+
+            CREATE VIRTUAL TABLE area_rtree USING rtree(id, xmin, xmax, ymin, ymax);
+            """ % { 'page_size': SQLITE_PAGE_SIZE })
+
+    def append_part(self, part_file_path_name):
+        # The statements are executed one by one, in the transaction of the
+        # connection, as the method ``executescript`` commits the pending
+        # transaction before running its script.  The database is attached
+        # outside of this transaction, as SQLite requires.
+        self.connection.execute('ATTACH DATABASE ? AS part', (part_file_path_name,))
+        try:
+            with self.connection:
+                self.connection.execute("""
+                    INSERT INTO area(area_id, parent_area_id, country_code, area_code, area_type, area_level, boundaries)
+                      SELECT area_id, parent_area_id, country_code, area_code, area_type, area_level, boundaries
+                        FROM part.area
+                        ORDER BY area_rowid""")
+
+                self.connection.execute("""
+                    INSERT INTO area_rtree(id, xmin, xmax, ymin, ymax)
+                      SELECT area.area_rowid, part_rtree.xmin, part_rtree.xmax, part_rtree.ymin, part_rtree.ymax
+                        FROM part.area_rtree AS part_rtree
+                        INNER JOIN part.area AS part_area
+                          ON part_area.area_rowid = part_rtree.id
+                        INNER JOIN area
+                          USING (area_id)""")
+
+                self.connection.execute('INSERT INTO area_label SELECT * FROM part.area_label')
+                self.connection.execute('INSERT INTO area_index SELECT * FROM part.area_index')
+        finally:
+            self.connection.execute('DETACH DATABASE part')
+
+    def close(self):
+        if not self.part:
+            self.connection.executescript("""
+                CREATE INDEX idx_area__parent_area_id ON area(parent_area_id);
+                CREATE INDEX idx_area__area_code ON area(country_code, area_code);
+                CREATE INDEX idx_area_label__area_id ON area_label(area_id);
+                CREATE INDEX idx_area_index__keyword ON area_index(keyword);
+                """)
+            self.connection.commit()
+
+            self.connection.isolation_level = None # VACUUM cannot run inside a transaction.
+            self.connection.execute('ANALYZE')
+            self.connection.execute('VACUUM')
+
+        self.connection.close()
+
+    def write_country(self, country_code, administrative_subdivisions):
+        def iter_batches(rows):
+            rows = iter(rows)
+            while True:
+                batch = list(itertools.islice(rows, SQLITE_BATCH_SIZE))
+                if not batch:
+                    break
+                yield batch
+
+        with self.connection:
+            (last_rowid,) = self.connection.execute('SELECT COALESCE(MAX(area_rowid), 0) FROM area').fetchone()
+
+            for batch in iter_batches(administrative_subdivisions.itervalues()):
+                self.connection.executemany("""
+                    INSERT INTO area(area_rowid, area_id, parent_area_id, country_code, area_code, area_type, area_level, boundaries)
+                      VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    [ (last_rowid + 1 + i,
+                       str(subdivision.id),
+                       None if subdivision.level == 0 else str(administrative_subdivisions[subdivision.parent_code].id),
+                       country_code,
+                       subdivision.code,
+                       subdivision.area_type,
+                       subdivision.level,
+                       sqlite3.Binary(build_wkb_multipolygon(subdivision.boundaries)))
+                        for (i, subdivision) in enumerate(batch) ])
+
+                self.connection.executemany('INSERT INTO area_rtree(id, xmin, ymin, xmax, ymax) VALUES (?, ?, ?, ?, ?)',
+                    [ (last_rowid + 1 + i,) + calculate_boundaries_bbox(subdivision.boundaries)
+                        for (i, subdivision) in enumerate(batch) ])
+
+                self.connection.executemany('INSERT INTO area_label(area_id, content) VALUES (?, ?)',
+                    [ (str(subdivision.id), subdivision.name) for subdivision in batch ])
+
+                self.connection.executemany('INSERT INTO area_index(area_id, keyword) VALUES (?, ?)',
+                    [ (str(subdivision.id), keyword) for subdivision in batch
+                        for keyword in extract_keywords(subdivision.name) ])
+
+                last_rowid += len(batch)
+
+
+class SqlCopyWriter(OutputWriter):
+    """
+    Write the administrative subdivisions as a list of `COPY commands
+    <http://www.postgresql.org/docs/current/static/sql-copy.html>`_ to
+    populate the tables ``area``, ``area_label``, and ``area_index``,
+    followed by the PL/pgSQL command to generate the simplified boundaries
+    of the geographical areas.
+
+    The COPY commands can be surrounded with a bulk-load envelope: the
+    preamble drops the foreign keys, the unique constraints, and the
+    secondary indexes of these tables, saving their definition in the
+    table ``_gadm2sql_deferred_ddl``, and switches these tables to
+    unlogged; the COPY commands of each country are run in a transaction;
+    the postamble switches the tables back to logged, recreates the
+    constraints and the indexes once, and analyzes the tables.
+
+    @note: the bulk-load envelope requires PostgreSQL 9.5+.  The saved
+        definitions survive an interrupted load, and are restored by the
+        postamble of the next load.
+    """
+    # Session settings, and PL/pgSQL commands run before loading the data.
+    BULK_LOAD_PREAMBLE = """
+        SET maintenance_work_mem = '%(maintenance_work_mem)s';
+        SET synchronous_commit = off;
+
+        DO $$
+        DECLARE
+          _tables regclass[] := ARRAY['area'::regclass, 'area_label'::regclass, 'area_index'::regclass];
+          _record record;
+        BEGIN
+          CREATE TABLE IF NOT EXISTS _gadm2sql_deferred_ddl(
+            ddl_id serial NOT NULL PRIMARY KEY,
+            ddl_rank smallint NOT NULL,
+            create_command text NOT NULL);
+
+          -- Foreign keys defined on, or referencing, the tables to load.
+          FOR _record IN
+            SELECT conrelid::regclass AS table_name, conname, pg_get_constraintdef(oid) AS definition
+              FROM pg_constraint
+              WHERE contype = 'f'
+                AND (conrelid = ANY(_tables) OR confrelid = ANY(_tables))
+          LOOP
+            INSERT INTO _gadm2sql_deferred_ddl(ddl_rank, create_command)
+              VALUES (3, format('ALTER TABLE %%s ADD CONSTRAINT %%I %%s', _record.table_name, _record.conname, _record.definition));
+            EXECUTE format('ALTER TABLE %%s DROP CONSTRAINT %%I', _record.table_name, _record.conname);
+          END LOOP;
+
+          -- Unique and exclusion constraints.
+          FOR _record IN
+            SELECT conrelid::regclass AS table_name, conname, pg_get_constraintdef(oid) AS definition
+              FROM pg_constraint
+              WHERE contype IN ('u', 'x')
+                AND conrelid = ANY(_tables)
+          LOOP
+            INSERT INTO _gadm2sql_deferred_ddl(ddl_rank, create_command)
+              VALUES (2, format('ALTER TABLE %%s ADD CONSTRAINT %%I %%s', _record.table_name, _record.conname, _record.definition));
+            EXECUTE format('ALTER TABLE %%s DROP CONSTRAINT %%I', _record.table_name, _record.conname);
+          END LOOP;
+
+          -- Secondary indexes, except the primary keys.
+          FOR _record IN
+            SELECT indexrelid::regclass AS index_name, pg_get_indexdef(indexrelid) AS definition
+              FROM pg_index
+              WHERE indrelid = ANY(_tables)
+                AND NOT indisprimary
+          LOOP
+            INSERT INTO _gadm2sql_deferred_ddl(ddl_rank, create_command)
+              VALUES (1, _record.definition);
+            EXECUTE format('DROP INDEX %%s', _record.index_name);
+          END LOOP;
+
+          -- Tables are switched back to logged before rebuilding their
+          -- indexes, which are then written once to the WAL.
+          FOR _record IN
+            SELECT oid::regclass AS table_name
+              FROM pg_class
+              WHERE oid = ANY(_tables)
+                AND relpersistence = 'p'
+          LOOP
+            INSERT INTO _gadm2sql_deferred_ddl(ddl_rank, create_command)
+              VALUES (0, format('ALTER TABLE %%s SET LOGGED', _record.table_name));
+            EXECUTE format('ALTER TABLE %%s SET UNLOGGED', _record.table_name);
+          END LOOP;
+        END $$;
+        """
+
+    # PL/pgSQL commands run after loading the data.
+    BULK_LOAD_POSTAMBLE = """
+        DO $$
+        DECLARE
+          _record record;
+        BEGIN
+          IF to_regclass('_gadm2sql_deferred_ddl') IS NOT NULL THEN
+            RAISE NOTICE 'Restoring constraints and indexes of geographic areas...';
+
+            FOR _record IN
+              SELECT create_command
+                FROM _gadm2sql_deferred_ddl
+                ORDER BY ddl_rank, ddl_id
+            LOOP
+              BEGIN
+                EXECUTE _record.create_command;
+              EXCEPTION WHEN duplicate_table OR duplicate_object THEN
+                -- The index idx_area__boundaries may have been recreated
+                -- when simplifying the boundaries of geographic areas.
+                RAISE NOTICE 'Skip %%: already exists', _record.create_command;
+              END;
+            END LOOP;
+
+            DROP TABLE _gadm2sql_deferred_ddl;
+          END IF;
+        END $$;
+
+        ANALYZE area;
+        ANALYZE area_label;
+        ANALYZE area_index;
+        """
+
+    # PL/pgSQL command run after loading the data to rebuild the
+    # boundaries of the geographical areas, written ``NULL``, from the
+    # sequence of arcs of each of their boundaries, when their topology
+    # has been written.
+    REBUILD_BOUNDARIES_COMMAND = """
+                DO $$
+                BEGIN
+                  IF to_regclass('area_arc_ref') IS NOT NULL THEN
+                    RAISE NOTICE 'Rebuilding boundaries of each geographic area from its arcs...';
+
+                    UPDATE area
+                      SET boundaries = _area.boundaries
+                      FROM (
+                        SELECT _ring.area_id,
+                            ST_Multi(ST_Collect(ST_MakePolygon(_ring.path) ORDER BY _ring.ring_index)) AS boundaries
+                          FROM (
+                            SELECT area_arc_ref.area_id, area_arc_ref.ring_index,
+                                ST_RemoveRepeatedPoints(ST_MakeLine(
+                                  CASE WHEN area_arc_ref.is_reversed THEN ST_Reverse(area_arc.path) ELSE area_arc.path END
+                                  ORDER BY area_arc_ref.arc_index)) AS path
+                              FROM area_arc_ref
+                                INNER JOIN area_arc
+                                  ON area_arc.arc_id = area_arc_ref.arc_id
+                              GROUP BY area_arc_ref.area_id, area_arc_ref.ring_index) AS _ring
+                          GROUP BY _ring.area_id) AS _area
+                      WHERE area.area_id = _area.area_id
+                        AND area.boundaries IS NULL;
+                  END IF;
+                END $$;
+                """
+
+    # PL/pgSQL command run after loading the data, and before the
+    # postamble of the bulk-load envelope, to generate the simplified
+    # boundaries of the geographical areas.
+    SIMPLIFY_BOUNDARIES_COMMAND = """
+                DO $$
+                BEGIN
+                  IF EXISTS(
+                    SELECT true
+                      FROM pg_proc
+                      WHERE proname = '_simplify_area_boundaries') THEN
+                    RAISE NOTICE 'Simplifying boundaries of each geographic area...';
+
+                    DROP INDEX IF EXISTS idx_area__boundaries;
+
+                    PERFORM _simplify_area_boundaries();
+
+                    -- ALTER TABLE area
+                    --  ALTER COLUMN _boundaries SET NOT NULL;
+
+                    CREATE INDEX idx_area__boundaries
+                      ON area USING GIST (_boundaries);
+                  ELSE
+                    RAISE NOTICE 'No function found to simplify boundaries of each geographic area.';
+                  END IF;
+                END $$;
+                """
+
+    def __init__(self, file_path_name, part=False, bulk_load=False):
+        """
+        Build a writer of COPY commands.
+
+
+        @param file_path_name: absolute path and name of the output file, or
+            ``None`` to write to the standard output.
+
+        @param part: indicate whether this writer writes a part of the
+            output.
+
+        @param bulk_load: indicate whether to surround the COPY commands
+            with the bulk-load envelope.
+        """
+        super(SqlCopyWriter, self).__init__(file_path_name, part=part)
+        self.bulk_load = bulk_load
+
+        if part:
+            self.file_handle = open(file_path_name, 'wb')
+        else:
+            self.file_handle = open(file_path_name, 'ab') if file_path_name \
+                else getattr(sys.stdout, 'stream', sys.stdout)
+
+            if bulk_load:
+                print >> self.file_handle, SqlCopyWriter.BULK_LOAD_PREAMBLE % {
+                        'maintenance_work_mem': BULK_LOAD_MAINTENANCE_WORK_MEM }
+
+    def close(self):
+        # Write the PL/pgSQL command to generate the simplified boundaries of
+        # the geographical areas.
+        if not self.part:
+            print >> self.file_handle, SqlCopyWriter.REBUILD_BOUNDARIES_COMMAND
+            print >> self.file_handle, SqlCopyWriter.SIMPLIFY_BOUNDARIES_COMMAND
+            print >> self.file_handle
+
+            if self.bulk_load:
+                print >> self.file_handle, SqlCopyWriter.BULK_LOAD_POSTAMBLE % {}
+
+        if self.file_path_name:
+            self.file_handle.close()
+        else:
+            self.file_handle.flush()
+
+    def write_country(self, country_code, administrative_subdivisions):
+        if self.bulk_load:
+            print >> self.file_handle, 'BEGIN;'
+
+        write_sql_commands(administrative_subdivisions, country_code=country_code, file_handle=self.file_handle)
+
+        if self.bulk_load:
+            print >> self.file_handle, 'COMMIT;'
+            print >> self.file_handle
+
+
+def assemble_work_parts(work_path, output_writer_class, file_path_name, settings):
+    """
+    Append the parts that the workers of a shared work directory have
+    written for the countries of this directory to an output file, once
+    all these countries have been completed.
+
+
+    @param work_path: absolute path of the shared work directory.
+
+    @param output_writer_class: a subclass of ``OutputWriter``, or a
+        callable with the same signature, of the format that the workers
+        have written their parts in.
+
+    @param file_path_name: absolute path and name of the output file, or
+        ``None`` to write to the standard output, if the format supports
+        it.
+
+    @param settings: a dictionary of the settings of the output, as
+        defined by the function ``open_work_queue``.
+
+
+    @raise Exception: if a country of the work directory has not been
+        completed yet.
+    """
+    country_codes = open_work_queue(work_path, settings)
+
+    pending_country_codes = [ country_code for country_code in country_codes
+            if not os.path.exists(os.path.join(work_path, country_code + WORK_QUEUE_DONE_MARKER_FILE_NAME_SUFFIX)) ]
+    if pending_country_codes:
+        raise Exception('The countries %s of the work directory %s have not been completed yet' % \
+                (', '.join(pending_country_codes), work_path))
+
+    output_writer = output_writer_class(file_path_name)
+
+    for country_code in country_codes:
+        with open(os.path.join(work_path, country_code + WORK_QUEUE_DONE_MARKER_FILE_NAME_SUFFIX)) as file_handle:
+            done_marker = json.load(file_handle)
+
+        output_writer.append_part(os.path.join(work_path, done_marker['part_file_name']))
+        print '[INFO] Assembled country %s (processed by worker %s)' % (country_code, done_marker['worker_id'])
+
+    output_writer.close()
+
+
+def build_administrative_subdivisions(zip_file, country_code, administrative_level_count, dbase_encodings=None,
+        job_count=1, bbox=None):
+    """
+    Download the ZIP archive of the shape files of the administrative
+    subdivisions of the specified country, uncompress it into memory, and
+    retrieve the geographical boundaries, from the first-level -- which is
+    the largest administrative subdivision of a country -- to the smallest
+    administrative level, which depends on this country.
+
+    The Database of Global Administrative Areas (GADM) provides a ZIP
+    archive which contains the following mandatory files:
+
+    * (country_code)_adm(administrative_level).shp: the geographical
+      boundaries of all the administrative subdivision of this country of
+      a particular administrative level.
+
+    * (country_code)_adm(administrative_level).dbf: columnar attributes, in
+      dBase IV format for each administrative subdivision shape of this
+      country of a particular administrative level.
+
+    This ZIP archive may contain additional file that this function
+    doesn't uses.
+
+    The administrative levels are independent from each other, and are
+    parsed in parallel by a pool of processes when several jobs are
+    allowed; the administrative subdivisions are then linked to their
+    parent, from the first level to the smallest level.
+
+
+    @param country_code: an ISO 3166-1 alpha-2 code representing the
+        country to retrieve is administrative subdivision shapes.
+
+    @param dbase_encodings: a list of the code pages of the dBase IV files
+        of each administrative level of this country, if they have been
+        determined.
+
+    @param job_count: maximum number of administrative levels to parse in
+        parallel.
+
+    @param bbox: a tuple ``(xmin, ymin, xmax, ymax)`` of the bounding box
+        that the boundaries of the administrative subdivisions to retrieve
+        need to intersect, or ``None`` to retrieve all the administrative
+        subdivisions.
+
+
+    @return: a dictionary of ``AdministrativeSubdivision`` instances of
+        all the administrative subdivisions of this country, whatever
+        their administrative level.  The key corresponds to the code of
+        an administrative subdivision, while the value is the instance
+        itself.
+
+    @raise Exception: if a network issue occurs.
+    """
+    # Parse the smallest administrative levels first, which are usually
+    # the largest ones.
+    levels_arguments = [ (zip_file.filename, country_code, administrative_level,
+                dbase_encodings and dbase_encodings[administrative_level], bbox)
+            for administrative_level in reversed(range(administrative_level_count)) ]
+
+    if job_count > 1 and administrative_level_count > 1:
+        pool = multiprocessing.Pool(min(job_count, administrative_level_count))
+        try:
+            levels_subdivisions = pool.map(parse_administrative_level, levels_arguments, chunksize=1)
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+    else:
+        levels_subdivisions = [ parse_administrative_level(level_arguments) for level_arguments in levels_arguments ]
+
+    administrative_subdivisions = {}
+
+    for level_subdivisions in reversed(levels_subdivisions):
+        for administrative_subdivision in level_subdivisions:
+            # [PATCH:20150615] Check this subdivision has a parent, and if not,
+            # try to link this subdivision to a grand-parent.
+            if administrative_subdivision.level > 0:
+                subcodes = administrative_subdivision.code.split('.')
+                parent_subdivision_code = '.'.join([ subcode for subcode in subcodes[:-1] ])
+                if not administrative_subdivisions.get(parent_subdivision_code):
+                    while True:
+                        subcodes = subcodes[:-1]
+                        parent_subdivision_code = '.'.join([ subcode for subcode in subcodes[:-1] ])
+                        parent_subdivision = administrative_subdivisions.get(parent_subdivision_code)
+                        if parent_subdivision:
+                            sys.stderr.write('[WARNING] %s (%s-%s) does have a direct parent; fix with grand parent %s\n' % \
+                                    (administrative_subdivision.name, country_code, administrative_subdivision.code, parent_subdivision.code))
+                            administrative_subdivision.parent_code = parent_subdivision_code
+                            break
+
+                        else:
+                            if len(subcodes) == 1:
+                                sys.stderr.write('[ERROR] The administrative subdivision %s (%s-%s) CANNOT be linked to a parent!\n' % \
+                                    (administrative_subdivision.name, country_code, administrative_subdivision.code))
+                                break
+
+            administrative_subdivisions[administrative_subdivision.code] = administrative_subdivision
+
+    return administrative_subdivisions
+
+
+def build_archive_catalog(zip_file, country_code):
+    """
+    Build the catalog of a shape ZIP archive of a country from the
+    central directory of this archive, without reading the data of its
+    entries.
+
+    The number of shapes of an administrative level is deduced from the
+    size of its ``.shx`` file, which is composed of a header of 100 bytes
+    followed by a record of 8 bytes per shape.  The number of vertices is
+    estimated from the size of its ``.shp`` file, which is composed of a
+    header of 100 bytes, followed by a header of 52 bytes per polygon and
+    by 16 bytes per vertex (the indices of the parts are neglected).
+
+
+    @param zip_file: a shape ZIP archive instance.
+
+    @param country_code: an ISO 3166-1 alpha-3 code representing the
+        country of this archive.
+
+
+    @return: a dictionary with the following keys:
+
+        * ``entries``: a dictionary of the entries of the archive, which
+          key corresponds to the name of an entry, while the value is a
+          dictionary of its ``size``, its ``compressed_size``, and its
+          ``crc``.
+
+        * ``levels``: a list of the administrative levels of the country, in
+          ascending order, each represented by a dictionary with the keys
+          ``level``, ``entry_names``, ``record_count``, and
+          ``vertex_count``.
+    """
+    entries = dict([ (zip_info.filename, {
+                'size': zip_info.file_size,
+                'compressed_size': zip_info.compress_size,
+                'crc': zip_info.CRC })
+            for zip_info in zip_file.infolist() ])
+
+    levels = []
+    while '%s_adm%d.shp' % (country_code, len(levels)) in entries:
+        entry_base_name = '%s_adm%d' % (country_code, len(levels))
+        index_entry = entries.get('%s.shx' % entry_base_name)
+        record_count = (index_entry['size'] - 100) / 8 if index_entry else None
+
+        levels.append({
+            'level': len(levels),
+            'entry_names': sorted([ entry_name for entry_name in entries
+                    if os.path.splitext(entry_name)[0] == entry_base_name ]),
+            'record_count': record_count,
+            'vertex_count': max(0, entries['%s.shp' % entry_base_name]['size'] - 100 - 52 * (record_count or 0)) / 16 })
+
+    return { 'entries': entries, 'levels': levels }
+
+
+def build_topology(administrative_subdivisions, tolerance=None):
+    """
+    Build the topology of the boundaries of the administrative
+    subdivisions of a country, i.e., the arcs that these boundaries
+    share, TopoJSON-style, and attach to each administrative subdivision
+    the list of the arcs of each of its boundaries.
+
+    Adjacent subdivisions, and each administrative level and its parent
+    level, share most of the vertices of their boundaries.  A vertex is a
+    junction when it is connected to distinct neighbours in distinct
+    boundaries; boundaries are cut into arcs at their junctions, and the
+    arcs that have the same vertices, in either direction, are stored
+    once.  A boundary without junction is a single closed arc.
+
+    The arcs are simplified, if requested, with the Douglas-Peucker
+    algorithm, keeping their end vertices, and the boundaries rebuilt
+    from their simplified arcs: the boundaries that share an arc are
+    simplified identically, without slivers between them.  The boundaries
+    that collapse are removed, unless all the boundaries of a subdivision
+    collapse, in which case the subdivision keeps its original boundaries,
+    each stored as a closed arc of its own, so that the arcs of every
+    subdivision always rebuild its boundaries.
+
+
+    @param administrative_subdivisions: a dictionary of
+        ``AdministrativeSubdivision`` instances of all the administrative
+        subdivisions of a country.
+
+    @param tolerance: the maximum distance, in degrees, between the
+        simplified arcs and the original vertices, or ``None`` not to
+        simplify the arcs.
+
+
+    @return: the list of the arcs of the boundaries, each represented by
+        a tuple ``(arc_id, coordinates)`` where ``arc_id`` is the
+        identification of the arc, and ``coordinates`` a NumPy array of
+        the coordinates ``(longitude, latitude)`` of its vertices.
+    """
+    subdivisions = administrative_subdivisions.values()
+    boundaries = [ boundary for subdivision in subdivisions for boundary in subdivision.boundaries ]
+    if not boundaries:
+        return []
+
+    # Identify each distinct vertex with an integer, and detect the
+    # junctions: the vertices that have more than one distinct pair of
+    # neighbours in the boundaries.  The boundaries are closed, i.e., their
+    # last vertex is their first vertex.
+    (vertices, vertex_ids) = numpy.unique(numpy.concatenate(boundaries), axis=0, return_inverse=True)
+
+    ring_vertex_ids = []
+    offset = 0
+    for boundary in boundaries:
+        ring_vertex_ids.append(vertex_ids[offset:offset + len(boundary) - 1])
+        offset += len(boundary)
+
+    neighbours = numpy.concatenate([ numpy.column_stack((ids, numpy.roll(ids, 1), numpy.roll(ids, -1)))
+            for ids in ring_vertex_ids ])
+    neighbours[:, 1:].sort(axis=1)
+    neighbours = numpy.unique(neighbours, axis=0)
+    is_junction = numpy.bincount(neighbours[:, 0], minlength=len(vertices)) > 1
+
+    # Cut the boundaries into arcs at their junctions, and store once the
+    # arcs that have the same vertices in either direction.
+    arc_keys = {}
+    arcs = []
+
+    def get_arc_reference(ids):
+        key = ids.tobytes()
+        if key in arc_keys:
+            return (arc_keys[key], False)
+
+        reversed_key = ids[::-1].tobytes()
+        if reversed_key in arc_keys:
+            return (arc_keys[reversed_key], True)
+
+        arc_keys[key] = len(arcs)
+        arcs.append(ids)
+        return (arc_keys[key], False)
+
+    ring_arc_references = []
+    for ids in ring_vertex_ids:
+        junctions = numpy.flatnonzero(is_junction[ids])
+
+        # Rotate a boundary without junction so that it starts with its
+        # smallest vertex, in the direction of the smallest neighbour, for
+        # the same boundaries to result in the same arc.
+        if len(junctions) == 0:
+            start = int(numpy.argmin(ids))
+            ids = numpy.roll(ids, -start)
+            is_reversed = len(ids) > 1 and ids[-1] < ids[1]
+            if is_reversed:
+                ids = numpy.roll(ids[::-1], 1)
+            (arc_index, is_arc_reversed) = get_arc_reference(numpy.append(ids, ids[:1]))
+            ring_arc_references.append([ (arc_index, is_reversed != is_arc_reversed) ])
+            continue
+
+        ids = numpy.roll(ids, -junctions[0])
+        ids = numpy.append(ids, ids[:1])
+        junctions = numpy.append(junctions - junctions[0], len(ids) - 1)
+        ring_arc_references.append([ get_arc_reference(ids[start:end + 1])
+                for (start, end) in zip(junctions[:-1], junctions[1:]) ])
+
+    arcs = [ vertices[ids] for ids in arcs ]
+    if tolerance:
+        arcs = [ simplify_arc(coordinates, tolerance) for coordinates in arcs ]
+
+    arcs = [ (uuid.uuid4(), coordinates) for coordinates in arcs ]
+
+    # Attach the arcs of its boundaries to each administrative subdivision,
+    # and rebuild its boundaries from their simplified arcs.
+    ring_index = 0
+    for subdivision in subdivisions:
+        subdivision_arcs = [ [ (arcs[arc_index], is_reversed) for (arc_index, is_reversed) in arc_references ]
+                for arc_references in ring_arc_references[ring_index:ring_index + len(subdivision.boundaries)] ]
+        ring_index += len(subdivision.boundaries)
+
+        if tolerance:
+            simplified_boundaries = []
+            simplified_arcs = []
+            for ring_arcs in subdivision_arcs:
+                boundary = numpy.concatenate([ coordinates[::-1] if is_reversed else coordinates
+                        for ((_, coordinates), is_reversed) in ring_arcs ])
+                boundary = boundary[numpy.append([ True ], numpy.any(boundary[1:] != boundary[:-1], axis=1))]
+                if len(boundary) >= 4:
+                    simplified_boundaries.append(boundary)
+                    simplified_arcs.append(ring_arcs)
+
+            if simplified_boundaries:
+                subdivision.boundaries = simplified_boundaries
+                subdivision_arcs = simplified_arcs
+            else:
+                subdivision_arcs = []
+                for boundary in subdivision.boundaries:
+                    arc = (uuid.uuid4(), boundary)
+                    arcs.append(arc)
+                    subdivision_arcs.append([ (arc, False) ])
+
+        subdivision.arcs = subdivision_arcs
+
+    return arcs
+
+
+def build_wkb_multipolygon(boundaries):
+    """
+    Encode the boundaries of an administrative subdivision into a
+    multipolygon in the Well-Known Binary (WKB) format, little endian.
+
+
+    @param boundaries: a list of boundaries, each of them being a NumPy
+        array of coordinates ``(longitude, latitude)`` that define a closed
+        line.
+
+
+    @return: the WKB representation of the multipolygon.
+    """
+    wkb = [ struct.pack('<BII', 1, 6, len(boundaries)) ] # wkbMultiPolygon
+    for boundary in boundaries:
+        wkb.append(struct.pack('<BIII', 1, 3, 1, len(boundary))) # wkbPolygon of 1 ring
+        wkb.append(boundary.astype('<f8').tobytes())
+    return ''.join(wkb)
+
+
+def calculate_boundaries_bbox(boundaries):
+    """
+    Calculate the bounding box of the boundaries of an administrative
+    subdivision.
+
+
+    @param boundaries: a list of boundaries, each of them being a NumPy
+        array of coordinates ``(longitude, latitude)`` that define a closed
+        line.
+
+
+    @return: a tuple ``(xmin, ymin, xmax, ymax)``.
+    """
+    coordinates = numpy.concatenate(boundaries)
+    (xmin, ymin) = coordinates.min(axis=0).tolist()
+    (xmax, ymax) = coordinates.max(axis=0).tolist()
+    return xmin, ymin, xmax, ymax
+
+
+def calculate_country_data_checksum(country_data, bbox=None):
+    """
+    Calculate the checksum of the data of a country that the parsed data
+    of this country depend on: the entries of the shape ZIP archive, the
+    entries of the ESRI geodatabase ZIP archive, and the code pages of the
+    dBase IV files.
+
+    The entries of the shape ZIP archive are identified by their name,
+    their size, and their CRC-32, as listed in the catalog of the archive,
+    so that the checksum doesn't depend on the modification time of these
+    entries, which changes each time the global archive is split.  The
+    entries of the ESRI geodatabase ZIP archive are identified the same
+    way, from the central directory of this archive, so that the checksum
+    is calculated without exporting the geodatabase.
+
+
+    @param country_data: a ``CountryData`` named tuple of the data of a
+        country, as returned by the function ``fetch_country_data``.
+
+    @param bbox: the bounding box that the parsed administrative
+        subdivisions intersect, if any.
+
+
+    @return: the hexadecimal SHA-256 digest of these data.
+    """
+    (_, administrative_level_count, _, esri_zip_file_path_name, dbase_encodings, catalog) = country_data
+
+    esri_entries = []
+    if esri_zip_file_path_name:
+        with zipfile.ZipFile(esri_zip_file_path_name) as esri_zip_file:
+            esri_entries = sorted([ (zip_info.filename, zip_info.file_size, zip_info.CRC) for zip_info in esri_zip_file.infolist() ])
+
+    checksum = hashlib.sha256()
+    checksum.update(json.dumps([ PARSED_COUNTRY_CACHE_FORMAT_VERSION, administrative_level_count, dbase_encodings, bbox,
+            [ (entry_name, entry['size'], entry['crc']) for (entry_name, entry) in sorted(catalog['entries'].iteritems()) ],
+            esri_entries ]))
+
+    return checksum.hexdigest()
+
+
+def calculate_hilbert_index(longitude, latitude, order=HILBERT_CURVE_ORDER):
+    """
+    Calculate the index, along a Hilbert curve, of the cell of a grid
+    covering the whole world that contains the specified location.
+    Locations that are close to each other generally have close indices.
+
+
+    @param longitude: longitude of the location.
+
+    @param latitude: latitude of the location.
+
+    @param order: the order of the Hilbert curve; the grid is composed of
+        ``2 ** order`` by ``2 ** order`` cells.
+
+
+    @return: the index of the cell along the Hilbert curve.
+    """
+    side = 1 << order
+    x = max(0, min(side - 1, int((longitude + 180.0) / 360.0 * side)))
+    y = max(0, min(side - 1, int((latitude + 90.0) / 180.0 * side)))
+
+    index = 0
+    s = side >> 1
+    while s > 0:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        index += s * s * ((3 * rx) ^ ry)
+
+        # Rotate the quadrant so that the curve is continuous.
+        if ry == 0:
+            if rx == 1:
+                x = side - 1 - x
+                y = side - 1 - y
+            (x, y) = (y, x)
+
+        s >>= 1
+
+    return index
+
+
+def claim_country_lease(work_path, country_code, worker_id, lease_expiration_time=WORK_QUEUE_LEASE_EXPIRATION_TIME):
+    """
+    Claim the lease of a country of a shared work directory, so that no
+    other worker processes this country at the same time.
+
+    A lease is a file which name ends with its generation.  The worker
+    that claims a country creates the lease of the next generation with
+    the flags ``O_CREAT`` and ``O_EXCL``, which only one worker succeeds
+    in, either when the country has never been leased, or when the lease
+    of the current generation is stale, i.e., its holder has not renewed
+    it, updating its modification time, since ``lease_expiration_time``
+    seconds, in which case the country is reassigned.
+
+    The lease files are never deleted, so that the generations of the
+    leases of a country, which the names of their parts end with, are
+    monotonic.  The completion marker of the country is checked again
+    once the lease has been created, as the holder of the previous lease
+    may have completed the country in the meantime, in which case the
+    lease just created is released.  A lease that cannot be read, such as
+    a lease which holder has crashed while writing it, is considered as
+    being written while it is still fresh, and is reclaimed once stale.
+
+    @note: the workers running on several hosts need to have their clocks
+        synchronized with the file server of the work directory.
+
+
+    @param work_path: absolute path of the shared work directory.
+
+    @param country_code: an ISO 3166-1 alpha-3 code representing the
+        country to claim.
+
+    @param worker_id: the identification of the worker that claims the
+        country.
+
+    @param lease_expiration_time: time in seconds after which a lease that
+        has not been renewed is stale.
+
+
+    @return: the generation of the lease claimed, or ``None`` if this
+        country has been completed, or is leased by another worker.
+    """
+    if os.path.exists(os.path.join(work_path, country_code + WORK_QUEUE_DONE_MARKER_FILE_NAME_SUFFIX)):
+        return None
+
+    lease_file_name_prefix = country_code + WORK_QUEUE_LEASE_FILE_NAME_INFIX
+    generations = [ int(file_name[len(lease_file_name_prefix):]) for file_name in os.listdir(work_path)
+            if file_name.startswith(lease_file_name_prefix) and file_name[len(lease_file_name_prefix):].isdigit() ]
+
+    generation = max(generations) if generations else 0
+    if generation:
+        lease_file_path_name = os.path.join(work_path, lease_file_name_prefix + str(generation))
+        if time.time() - os.path.getmtime(lease_file_path_name) < lease_expiration_time:
+            return None
+
+        # The stale lease may be empty or truncated, when its holder has
+        # crashed while writing it, in which case it is reclaimed as well.
+        try:
+            with open(lease_file_path_name) as file_handle:
+                holder_worker_id = json.load(file_handle).get('worker_id')
+        except (IOError, ValueError):
+            holder_worker_id = None
+
+        sys.stderr.write('[WARNING] The lease of country %s held by worker %s is stale; reassign it.\n' % \
+                (country_code, holder_worker_id))
+
+    lease_file_path_name = os.path.join(work_path, lease_file_name_prefix + str(generation + 1))
+    try:
+        file_descriptor = os.open(lease_file_path_name, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except OSError as exception:
+        if exception.errno != errno.EEXIST:
+            raise
+        return None
+
+    with os.fdopen(file_descriptor, 'wt') as file_handle:
+        json.dump({ 'worker_id': worker_id, 'claim_time': time.time() }, file_handle)
+
+    if os.path.exists(os.path.join(work_path, country_code + WORK_QUEUE_DONE_MARKER_FILE_NAME_SUFFIX)):
+        os.utime(lease_file_path_name, (0, 0))
+        return None
+
+    return generation + 1
+
+
+def clip_boundary(boundary, axis, value, lower_side):
+    """
+    Clip a closed boundary, oriented counterclockwise, to the half-plane
+    on one side of a line parallel to an axis.
+
+    The parts of the boundary inside the half-plane are chains that enter
+    and exit the half-plane on the line.  Walking along the line in the
+    direction that keeps the inside of the half-plane on the left, each
+    chain is joined from its exit to the nearest entry, so that a concave
+    boundary that crosses the line several times is clipped into several
+    valid boundaries, instead of a single boundary with degenerate
+    bridges along the line.
+
+    @note: the intersection of an edge with the line is computed from the
+        endpoint of this edge with the smallest other coordinate, so that
+        both sides of the line share the exact same vertices.
+
+
+    @param boundary: a NumPy array of shape ``(n, 2)`` of the coordinates
+        ``(longitude, latitude)`` of a closed boundary, oriented
+        counterclockwise.
+
+    @param axis: ``0`` for a line of constant longitude, ``1`` for a line
+        of constant latitude.
+
+    @param value: the longitude, or the latitude, of the line.
+
+    @param lower_side: indicate whether to keep the half-plane of the
+        coordinates lower than or equal to ``value``, or greater than or
+        equal to ``value``.
+
+
+    @return: a list of NumPy arrays of the closed boundaries, oriented
+        counterclockwise, of the parts of the boundary inside the
+        half-plane.
+    """
+    # Transform the coordinates so that the half-plane to keep is x <= c.
+    # Swapping the axes, or negating x, reverses the orientation of the
+    # boundary, which is restored by reversing the order of its vertices.
+    columns = [ axis, 1 - axis ]
+    factors = (1 if lower_side else -1, 1)
+    is_mirrored = (axis == 1) != (not lower_side)
+
+    vertices = boundary[:-1, columns] * factors
+    c = value * factors[0]
+    if is_mirrored:
+        vertices = vertices[::-1]
+
+    inside = vertices[:, 0] <= c
+    if inside.all():
+        return [ boundary ]
+    if not inside.any():
+        return []
+
+    # Start and end the walk on a vertex outside the half-plane, so that the
+    # chains inside the half-plane are entered before being exited.
+    vertices = numpy.roll(vertices, -int(numpy.argmin(inside)), axis=0)
+    vertices = numpy.vstack((vertices, vertices[:1]))
+    inside = vertices[:, 0] <= c
+
+    def calculate_crossings(indices):
+        starts = vertices[indices]
+        ends = vertices[indices + 1]
+        swapped = (ends[:, 1] < starts[:, 1])[:, numpy.newaxis]
+        (starts, ends) = (numpy.where(swapped, ends, starts), numpy.where(swapped, starts, ends))
+        return starts[:, 1] + (c - starts[:, 0]) * (ends[:, 1] - starts[:, 1]) / (ends[:, 0] - starts[:, 0])
+
+    entries = numpy.flatnonzero(~inside[:-1] & inside[1:])
+    exits = numpy.flatnonzero(inside[:-1] & ~inside[1:])
+
+    chains = [ numpy.vstack(([ c, entry_y ], vertices[entry + 1:exit + 1], [ c, exit_y ]))
+            for (entry, exit, entry_y, exit_y) in zip(entries, exits, calculate_crossings(entries), calculate_crossings(exits))
+            if (vertices[entry + 1:exit + 1, 0] < c).any() ]
+
+    # Join each chain from its exit to the chain which entry is the nearest
+    # above, until returning to the first chain of the boundary.
+    boundaries = []
+    pending_chain_indices = range(len(chains))
+    while pending_chain_indices:
+        first_chain_index = pending_chain_indices.pop(0)
+        boundary_chains = [ chains[first_chain_index] ]
+
+        while True:
+            exit_y = boundary_chains[-1][-1, 1]
+            candidate_chain_indices = [ chain_index for chain_index in pending_chain_indices + [ first_chain_index ]
+                    if chains[chain_index][0, 1] >= exit_y ]
+            if not candidate_chain_indices:
+                break
+
+            next_chain_index = min(candidate_chain_indices, key=lambda chain_index: chains[chain_index][0, 1])
+            if next_chain_index == first_chain_index:
+                break
+
+            pending_chain_indices.remove(next_chain_index)
+            boundary_chains.append(chains[next_chain_index])
+
+        clipped_boundary = numpy.vstack(boundary_chains + [ boundary_chains[0][:1] ])
+
+        distinct_vertices = numpy.ones(len(clipped_boundary), dtype=bool)
+        distinct_vertices[1:] = numpy.any(clipped_boundary[1:] != clipped_boundary[:-1], axis=1)
+        clipped_boundary = clipped_boundary[distinct_vertices]
+
+        if len(clipped_boundary) >= 4:
+            if is_mirrored:
+                clipped_boundary = clipped_boundary[::-1]
+            boundaries.append((clipped_boundary * factors)[:, columns])
+
+    return boundaries
+
+
+def deduplicate_boundaries(administrative_subdivisions):
+    """
+    Deduplicate the boundaries of the administrative subdivisions of a
+    country which are identical, such as the boundaries of a subdivision
+    that has a single child, or of a city-state which first level is the
+    country itself.
+
+    The boundaries are identified by a SHA-1 digest of their coordinates.
+    The boundaries of the subdivision of the smallest administrative level
+    are kept, while the other subdivisions with the same boundaries
+    reference this subdivision.
+
+
+    @param administrative_subdivisions: a dictionary of
+        ``AdministrativeSubdivision`` instances of all the administrative
+        subdivisions of a country.
+
+
+    @return: the number of administrative subdivisions which boundaries
+        reference the boundaries of another subdivision.
+    """
+    subdivisions_by_digest = {}
+    reference_count = 0
+
+    for subdivision in sorted(administrative_subdivisions.itervalues(), key=lambda subdivision: (subdivision.level, subdivision.code)):
+        digest = hashlib.sha1()
+        for boundary in subdivision.boundaries:
+            digest.update(struct.pack('<i', len(boundary)))
+            digest.update(boundary.astype('<f8').tobytes())
+
+        geometry_reference = subdivisions_by_digest.setdefault(digest.digest(), subdivision)
+        if geometry_reference is not subdivision:
+            subdivision.geometry_reference = geometry_reference
+            reference_count += 1
+
+    return reference_count
+
+
+def detect_dbase_encoding(zip_file, country_code, administrative_level):
+    """
+    Determine the code page of the text fields of the dBase IV file of
+    the specified administrative level of a country, and check whether
+    these fields are decoded without any loss with this code page.
+
+    The candidate code pages are, in this order: UTF-8, when the text
+    fields contains non-ASCII characters that form valid UTF-8 sequences;
+    the code page declared in the ``.cpg`` file that comes with the
+    shape file; the code page corresponding to the language driver
+    identifier of the dBase IV file; the encoding guessed by ``chardet``.
+
+    A code page passes the round-trip check when every text value is
+    decoded and then encoded back to the exact same bytes, and when the
+    decoded text contains neither control characters, nor replacement
+    characters, nor question marks that GADM uses to replace the
+    characters it lost.
+
+    As any text decoded with a single-byte code page passes the
+    round-trip check, a code page is only verified when the text is
+    ASCII or UTF-8, which invalid sequences reveal a wrong encoding, or
+    when this code page is declared by the ``.cpg`` file or by the
+    language driver identifier, and the decoded text is plausible: its
+    non-ASCII characters are letters, marks, spaces or punctuation, and
+    no word of at least ``DBASE_MOJIBAKE_WORD_MIN_LENGTH`` Latin letters
+    is only composed of non-ASCII letters, as the text of another script,
+    such as Cyrillic or Greek, decoded with a Latin code page is.
+
+
+    @param zip_file: a shape ZIP archive instance.
+
+    @param country_code: an ISO 3166-1 alpha-3 code representing the
+        country of the dBase IV file.
+
+    @param administrative_level: the administrative level of the dBase IV
+        file.
+
+
+    @return: a tuple ``(encoding, verified)`` where:
+
+        * ``encoding``: the name of the most probable code page of the
+          text fields of this dBase IV file.
+
+        * ``verified``: ``True`` if the text fields pass the round-trip
+          check with this code page; ``False`` otherwise.
+    """
+    data = zip_file.read('%s_adm%d.dbf' % (country_code, administrative_level))
+    dbase_header = DBaseFileHeader(data[:struct.unpack('<H', data[8:10])[0]])
+
+    values = []
+    for record_offset in xrange(dbase_header.header_length,
+            dbase_header.header_length + dbase_header.record_count * dbase_header.record_length,
+            dbase_header.record_length):
+        for (_, field_type, field_offset, field_length) in dbase_header.fields:
+            if field_type == 'C':
+                value = data[record_offset + field_offset:record_offset + field_offset + field_length].strip()
+                if value:
+                    values.append(value)
+
+    text = '\n'.join(values)
+
+    def is_lossless(encoding):
+        try:
+            decoded_text = text.decode(encoding)
+            return decoded_text.encode(encoding) == text \
+                    and u'?' not in decoded_text \
+                    and u'\ufffd' not in decoded_text \
+                    and not any([ u'\x00' <= c < u' ' and c != u'\n' or u'\x7f' <= c <= u'\x9f' for c in decoded_text ])
+        except (UnicodeError, LookupError):
+            return False
+
+    def is_plausible(encoding):
+        decoded_text = text.decode(encoding)
+        if any([ ord(c) >= 128 and unicodedata.category(c)[0] not in 'LMZP' for c in decoded_text ]):
+            return False
+
+        for word in re.findall(r'[^\W\d_]+', decoded_text, re.UNICODE):
+            if len(word) >= DBASE_MOJIBAKE_WORD_MIN_LENGTH \
+                    and all([ ord(c) >= 128 and unicodedata.name(c, '').startswith('LATIN') for c in word ]):
+                return False
+
+        return True
+
+    candidate_encodings = []
+    if any([ ord(c) >= 128 for c in text ]):
+        candidate_encodings.append('utf-8')
+
+    # Code pages declared by the shape file or by the dBase IV file, which
+    # are the only single-byte code pages that can be verified.
+    declared_encodings = []
+
+    try:
+        code_page = zip_file.read('%s_adm%d.cpg' % (country_code, administrative_level)).strip().lower()
+        if code_page.startswith('8859'):
+            declared_encodings.append('iso-8859-%s' % code_page[4:].lstrip('-_'))
+        elif code_page.isdigit():
+            declared_encodings.append('cp%s' % code_page)
+        else:
+            declared_encodings.append(code_page)
+    except KeyError:
+        pass
+
+    if dbase_header.language_driver_id in DBASE_LANGUAGE_DRIVER_CODE_PAGES:
+        declared_encodings.append(DBASE_LANGUAGE_DRIVER_CODE_PAGES[dbase_header.language_driver_id])
+
+    candidate_encodings.extend(declared_encodings)
+    candidate_encodings.append(chardet.detect(text)['encoding'] or 'cp1252')
+
+    if not any([ ord(c) >= 128 for c in text ]):
+        return 'ascii', True
+
+    for encoding in candidate_encodings:
+        if is_lossless(encoding) and (encoding == 'utf-8' or encoding in declared_encodings) and is_plausible(encoding):
+            return codecs.lookup(encoding).name, True
+
+    for encoding in candidate_encodings:
+        try:
+            text.decode(encoding)
+            return codecs.lookup(encoding).name, False
+        except (UnicodeError, LookupError):
+            pass
+
+    # ISO-8859-1 decodes any sequence of bytes.
+    return 'iso8859-1', False
+
+
+def escape_copy_text(value):
+    """
+    Escape a text value to be written in the text format of the
+    PostgreSQL command COPY, in which a backslash, a tab, a newline, and
+    a carriage return have a special meaning.
+
+
+    @param value: a string or a Unicode string.
+
+
+    @return: the escaped value.
+    """
+    return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def estimate_country_cost(country_data, level_job_count=1):
+    """
+    Estimate the cost of parsing the data of a country and writing the
+    corresponding SQL commands, and the memory that this processing
+    requires, from the catalog of the shape ZIP archive of this country
+    and the size of its ESRI geodatabase.
+
+
+    @param country_data: a ``CountryData`` named tuple of the data of a
+        country, as returned by the function ``fetch_country_data``.
+
+    @param level_job_count: maximum number of administrative levels of
+        this country parsed in parallel, each by a process of a pool which
+        base memory is added to the projected memory of the country.
+
+
+    @return: a tuple ``(cost, memory)`` where:
+
+        * ``cost``: an estimate of the processing time of the country, in
+          arbitrary units, that is only used to compare countries.
+
+        * ``memory``: the projected memory in bytes of the process that
+          parses the data of this country, and of the pool of processes
+          that parse its administrative levels in parallel, if any.
+    """
+    vertex_count = sum([ level['vertex_count'] for level in country_data.catalog['levels'] ])
+    esri_size = os.path.getsize(country_data.esri_zip_file_path_name) if country_data.esri_zip_file_path_name else 0
+
+    level_process_count = min(level_job_count, len(country_data.catalog['levels'])) \
+        if vertex_count >= GADM_PARALLEL_LEVELS_MIN_VERTEX_COUNT and level_job_count > 1 else 0
+
+    return vertex_count + esri_size / 16, \
+           GADM_COUNTRY_BASE_MEMORY * (1 + level_process_count) + vertex_count * GADM_COUNTRY_MEMORY_PER_VERTEX
+
+
+def execute_psql(dsn, command=None, file_path_name=None):
+    """
+    Execute SQL commands in a PostgreSQL database with the command line
+    ``psql``, stopping at the first error.
+
+
+    @param dsn: connection string or name of the database, as accepted by
+        the option ``--dbname`` of ``psql``.
+
+    @param command: SQL commands to execute.
+
+    @param file_path_name: absolute path and name of a file of SQL
+        commands to execute, instead of ``command``.
+
+
+    @return: the output of the commands, in unaligned format without
+        header, the fields being separated with ``|``.
+
+    @raise Exception: if the commands fail.
+    """
+    process = subprocess.Popen([ 'psql', '--no-psqlrc', '--quiet', '--no-align', '--tuples-only',
+            '--set', 'ON_ERROR_STOP=1',
+            '--dbname', dsn ] + ([ '--file', file_path_name ] if file_path_name else []),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    (output, _) = process.communicate(None if file_path_name else command)
+    if process.returncode != 0:
+        raise Exception('The execution of the SQL commands failed with the exit status %d' % process.returncode)
+
+    return output
+
+
+def extract_esri_files(zip_file, country_code, administrative_level_count):
+    """
+    Providing a ZIP archive file of a Environmental Systems Research
+    Institute (ESRI) geodatabase, this function returns a list of files
+    where it has stored CSV-formatted data extracted from the Microsoft
+    Access database for every administrative subdivision of the given
+    country.  There is one file per administrative subdivision level.
+
+    @param zip_file: a ESRI ZIP archive instance.
+
+    @param country_code: a ISO 3166-1 alpha-2 code referencing the
+        country of the administrative subdivisions stored in the given
+        ESRI geodatabase.
+
+    @param administrative_level_count: the number of administrative
+        subdivision levels defined for this country
+
+
+    @return: a list of absolute path and name of files containing the CSV
+        data of each administrative subdivision of the given country.
+        These files are sorted by ascending order of their administrative
+        subdivision level (the data of country level have been stripped
+        from this list as they do not contain any interested information).
+
+
+    @note: the caller is responsible for deleting the files returned by
+        this function.
+    """
+    # The command line executable mdb-export may not be installed when the
+    # names are decoded from the dBase IV files, which code pages of some
+    # countries cannot be verified.
+    if file_util.which('mdb-export') is None:
+        raise Exception('The mdb-export executable has not been found while this program is required to export '
+                'the ESRI geodatabase of country %s' % country_code)
+
+    # Extract the ESRI archive in a temporary file that this function will
+    # delete later.
+    mdb_file_entry_name = '%s_adm.mdb' % country_code
+    (fd, mdb_file_path_name) = tempfile.mkstemp()
+    with os.fdopen(fd, 'wb') as file_handle:
+        file_handle.write(zip_file.read(mdb_file_entry_name))
+
+    # Export each administrative subdivision data in the MDB database
+    # table to a CSV-formatted file.
+    file_path_names = []
+
+    for administrative_level in range(1, administrative_level_count): # Skip country level (nothing interesting to retrieve)
+        command_line = 'mdb-export -Q -d %s -R %s -b strip %s %s' % \
+                (MDB_COLUMN_DELIMITER,
+                 MDB_ROW_DELIMITER,
+                 mdb_file_path_name,
+                 '%s_adm%d' % (country_code.replace('-', '_'), administrative_level))
+
+        (fd, file_path_name) = tempfile.mkstemp()
+        file_path_names.append(file_path_name)
+        with os.fdopen(fd, 'wt') as file_handle:
+            file_handle.write(subprocess.check_output(command_line, shell=True))
+
+    # Delete the temporary file.
+    os.remove(mdb_file_path_name)
+
+    return file_path_names
+
+
+def extract_keywords(name):
+    """
+    Return the list of keywords of at least 2 characters composing the
+    name of an administrative subdivision, converted to lowercase ASCII
+    characters, and excluding numbers.
+
+
+    @param name: the name of an administrative subdivision.
+
+
+    @return: the list of keywords of this name.
+    """
+    ascii_name = unidecode.unidecode(name).lower()
+    punctuationless = re.sub(r"""[.,\/#!$%\^&\*;:{}=\-_`~()<>"']""", ' ', ascii_name)
+    keywords = re.sub(r'\s{2,}', ' ', punctuationless).split(' ')
+    return [ keyword for keyword in keywords if len(keyword) > 1 and not keyword.isdigit() ]
+
+
+def fetch_archive_file(archive_url,
+        archive_file_name=None,
+        memory_mapped=False,
+        cache_path=None,
+        cache_required=False,
+        cache_expiration_time=GADM_CACHE_EXPIRATION_TIME,
+        mirror_path=None):
+    """
+    Fetch a GADM ZIP archive referenced by the specified Uniform Resource
+    Locator (URL) from either a local mirror, either the local cache,
+    either the GADM server.
+
+
+    @param archive_url: Uniform Resource Locator (URL) referencing the
+        GADM ZIP archive to fetch.
+
+    @param url: Uniform Resource Locator that specifies the location of
+        the ZIP archive file on a computer network and a mechanism for
+        retrieving it.
+
+    @param archive_file_name: The name of the file in which the archive
+        will be stored in.  If not defined, the function downloads the
+        archive file in a temporary file created in the most secure
+        manner possible; the user is responsible for deleting this
+        temporary file when done with it.
+
+    @param memory_mapped: indicate whether to map the ZIP archive file-
+        like object into memory, for performance optimization, or whether
+        to store this archive into disk, for memory optimization.
+        If the archive is directly stored into disk, the caller is
+        responsible for deleting the temporary file when done with it.
+
+    @param cache_path: absolute path of the cache where downloaded files
+        are stored in.
+
+    @param cache_required: indicate whether the store the downloaded files
+        in the local cache, or whether to generate temporary files that
+        the caller is responsible for deleting.
+
+    @param cache_expiration_time: time in seconds during which the cached
+        representation of the GADM data is considered fresh.  Fresh data
+        are served directly from the cache, otherwise they are fetched
+        from the origin server.
+
+    @param mirror_path: absolute path of a local directory that mirrors
+        the GADM ZIP archives, named after the last component of their
+        URL.  When defined, the archive is never downloaded.
+
+
+    @return: a tuple ``(file_path_name, zip_file)`` where:
+
+    * ``file_path_name``: the absolute path and name of the file where
+      the ZIP archive has been downloaded and stored in.
+
+    * ``zip_file``: a ``ZipFile`` instance of the remote ZIP archive
+      file.
+    """
+    zip_file = None
+
+    if mirror_path:
+        zip_file_path_name = os.path.join(mirror_path, os.path.basename(archive_url))
+        if not os.path.exists(zip_file_path_name):
+            raise Exception('The archive %s has not been found in the mirror %s' % (os.path.basename(archive_url), mirror_path))
+        return zipfile.ZipFile(zip_file_path_name), zip_file_path_name
+
+    if cache_required:
+        assert cache_path, 'The GADM cache path is not defined'
+
+        if not os.path.exists(cache_path):
+            file_util.make_directory_if_not_exists(cache_path)
+
+        zip_file_path_name = os.path.join(cache_path, archive_file_name)
+        if os.path.exists(zip_file_path_name) and time.time() - os.stat(zip_file_path_name).st_mtime < cache_expiration_time:
+            zip_file = zipfile.ZipFile(zip_file_path_name)
+
+    if not zip_file:
+        print '[INFO] Download %s' % archive_url
+        (zip_file, zip_file_path_name) = zip_util.download_archive_file(archive_url,
+                file_path_name=zip_file_path_name if cache_required else None,
+                memory_mapped=memory_mapped,
+                verbose=False)
+
+    return zip_file, zip_file_path_name
+
+
+def fetch_country_data(country_code,
+        cache_path=None,
+        cache_required=False,
+        cache_expiration_time=GADM_CACHE_EXPIRATION_TIME,
+        mirror_path=None,
+        shape_zip_file_path_name=None,
+        esri_required=True,
+        dbase_decoding_required=False,
+        max_administrative_level_count=None):
+    """
+    Fetch shape and ESRI ZIP archive files from either the locale cache,
+    either GADM Web site, and determine the available administrative
+    subdivisions of the specified country.
+
+    The CSV data of the ESRI geodatabase are not exported by this
+    function, but by the function ``prepare_administrative_subdivisions``,
+    only when the parsed data of the country are not already cached.
+
+
+    @param country_code: an ISO 3166-1 alpha-2 code representing the
+        country to retrieve its administrative subdivision data.
+
+    @param cache_path: absolute path of the cache where downloaded files
+        are stored in.
+
+    @param cache_required: indicate whether the store the downloaded files
+        in the local cache, or whether to generate temporary files that
+        the caller is responsible for deleting.
+
+    @param cache_expiration_time: time in seconds during which the cached
+        representation of the GADM data is considered fresh.  Fresh data
+        are served directly from the cache, otherwise they are fetched
+        from the origin server.
+
+    @param mirror_path: absolute path of a local directory that mirrors
+        the GADM ZIP archives of every country.
+
+    @param shape_zip_file_path_name: absolute path and name of the shape
+        ZIP archive file of this country, when this file has already been
+        extracted from a global archive.
+
+    @param esri_required: indicate whether to fetch the ESRI geodatabase
+        of this country to extract the metadata of its administrative
+        subdivisions.
+
+    @param dbase_decoding_required: indicate whether to determine the
+        code page of the dBase IV files of this country, in which case the
+        ESRI geodatabase is not fetched when the text of every dBase IV
+        file of this country passes a round-trip check with its code page.
+
+    @param max_administrative_level_count: the maximum number of
+        administrative levels of this country to fetch, or ``None`` to
+        fetch all of them.  The entries of the other levels are ignored,
+        and their ESRI data are not exported.
+
+
+    @return: a ``CountryData`` named tuple containing the following
+        members in this order:
+
+        * ``country_code``: an ISO 3166-1 alpha-2 code representing the
+            country which the administrative subdivision data are
+            returned.
+
+        * ``administrative_level_count``: the number of administrative
+          subdivisions available for this country.
+
+        * ``shape_zip_file_path_name``: the absolute path and name of the
+          shape ZIP archive file.
+
+        * ``esri_zip_file_path_name``: the absolute path and name of the
+          ESRI geodatabase ZIP archive file, or ``None`` if this archive
+          has not been fetched.
+
+        * ``dbase_encodings``: a list of the code pages of the dBase IV file
+          of each administrative level of this country, or ``None`` if the
+          metadata need to be extracted from the ESRI geodatabase.
+
+        * ``catalog``: the catalog of the shape ZIP archive file, as
+          returned by the function ``load_archive_catalog``.
+
+
+    @note: the caller is responsible for deleting the files returned by
+        this function, when the caller didn't want to cache them.
+    """
+    # Fetch the shape and the ESRI archives, either from the local cache,
+    # either directly form the GADM Web site.
+    if shape_zip_file_path_name:
+        shape_zip_file = zipfile.ZipFile(shape_zip_file_path_name)
+    else:
+        shape_zip_file, shape_zip_file_path_name = fetch_archive_file(GADM_SHAPEFILE_ARCHIVE_URL_TEMPLATE % country_code,
+                archive_file_name='%s_gadm.dbf.zip' % country_code,
+                cache_path=cache_path,
+                cache_required=cache_required,
+                cache_expiration_time=cache_expiration_time,
+                memory_mapped=False,
+                mirror_path=mirror_path)
+
+    # Determine the number of available administrative subdivisions for
     # this country.  It corresponds to the number of available entries in
-    # the ZIP file.
-    administrative_level_count = 0
-    while True:
-        try:
-            zip_util.open_entry_file(shape_zip_file, '%s_adm%d.shp' % (country_code, administrative_level_count))
-            administrative_level_count += 1
-        except KeyError: # No smaller administrative subdivision
-            break
-
-    # Extract the CSV files of the data extracted from the ESRI
-    # geodatabase for every administrative subdivision of the given
-    # country.  There is one file per administrative subdivision level.
+    # the ZIP file, as listed in the catalog of this archive.
+    catalog = load_archive_catalog(shape_zip_file, shape_zip_file_path_name, country_code,
+            persistent=cache_required or bool(mirror_path))
+    validate_archive_catalog(catalog, country_code)
+    administrative_level_count = len(catalog['levels'])
+
+    if max_administrative_level_count is not None and administrative_level_count > max_administrative_level_count:
+        administrative_level_count = max_administrative_level_count
+        catalog = dict(catalog, levels=catalog['levels'][:administrative_level_count])
+
+    # Determine the code page of the dBase IV file of each administrative
+    # level.  The ESRI geodatabase is useless when the text of every file
+    # is decoded without loss.
+    dbase_encodings = None
+    if dbase_decoding_required:
+        dbase_encodings, verifications = zip(*[ detect_dbase_encoding(shape_zip_file, country_code, administrative_level)
+                for administrative_level in range(administrative_level_count) ]) or ([], [])
+        if all(verifications):
+            esri_required = False
+        elif esri_required:
+            dbase_encodings = None
+
+    shape_zip_file.close()
+
+    if not esri_required:
+        return CountryData(country_code, administrative_level_count, shape_zip_file_path_name, None, dbase_encodings, catalog)
+
+    # Fetch the ESRI geodatabase, which CSV data of every administrative
+    # subdivision are extracted later, when the country is processed.
     esri_zip_file, esri_zip_file_path_name = fetch_archive_file(GADM_ESRI_ARCHIVE_URL_TEMPLATE % country_code,
             archive_file_name='%s_gadm.mdb.zip' % country_code,
             cache_path=cache_path,
             cache_required=cache_required,
             cache_expiration_time=cache_expiration_time,
-            memory_mapped=False)
+            memory_mapped=False,
+            mirror_path=mirror_path)
+
+    esri_zip_file.close()
+
+    return CountryData(country_code,
+           administrative_level_count,
+           shape_zip_file_path_name,
+           esri_zip_file_path_name,
+           dbase_encodings,
+           catalog)
+
+
+def format_boundary(boundary):
+    """
+    Return the text representation of the coordinates of a boundary, as
+    a comma-separated list of ``longitude latitude`` pairs.
+
+    The coordinates of the whole boundary are formatted with a single
+    string formatting operation, instead of one operation per vertex.
+
+    @note: Python formats a float with at most 12 significant digits,
+        which is the shortest representation of a coordinate rounded to at
+        most 9 decimal places.
+
+
+    @param boundary: a NumPy array of coordinates ``(longitude, latitude)``.
+
+
+    @return: the text representation of the coordinates.
+    """
+    return ('%s %s,' * len(boundary))[:-1] % tuple(boundary.ravel().tolist())
+
+
+def get_copy_table_columns(administrative_subdivisions):
+    """
+    Return the list of the tables to populate with the data of the
+    specified administrative subdivisions, with their columns.
+
+
+    @param administrative_subdivisions: a dictionary of
+        ``AdministrativeSubdivision`` instances of all the administrative
+        subdivisions of a country.
+
+
+    @return: the list ``COPY_TABLE_COLUMNS``, followed by the list
+        ``TOPOLOGY_COPY_TABLE_COLUMNS`` if the topology of the boundaries
+        of these administrative subdivisions has been built, by the list
+        ``GEOMETRY_REFERENCE_COPY_TABLE_COLUMNS`` if the boundaries of some
+        of these administrative subdivisions have been deduplicated, and by
+        the list ``PIECE_COPY_TABLE_COLUMNS`` if their boundaries have been
+        subdivided into pieces.
+    """
+    table_columns = list(COPY_TABLE_COLUMNS)
+
+    if any([ subdivision.arcs is not None for subdivision in administrative_subdivisions.itervalues() ]):
+        table_columns.extend(TOPOLOGY_COPY_TABLE_COLUMNS)
+
+    if any([ subdivision.geometry_reference is not None for subdivision in administrative_subdivisions.itervalues() ]):
+        table_columns.extend(GEOMETRY_REFERENCE_COPY_TABLE_COLUMNS)
+
+    if any([ subdivision.pieces is not None for subdivision in administrative_subdivisions.itervalues() ]):
+        table_columns.extend(PIECE_COPY_TABLE_COLUMNS)
+
+    return table_columns
+
+
+def iter_copy_rows(table_name, administrative_subdivisions):
+    """
+    Return the rows of a table to populate with the data of the specified
+    administrative subdivisions, in the text format of the PostgreSQL
+    command ``COPY``, with the columns defined in ``COPY_TABLE_COLUMNS``.
+
+    The table ``area`` is populated with the administrative subdivisions'
+    information, including their boundaries; the table ``area_label``
+    with their names; the table ``area_index`` with the list of keywords
+    of at least 2 characters composing their names; the tables
+    ``area_arc`` and ``area_arc_ref`` with the topology of their
+    boundaries, when it has been built, in which case their boundaries
+    are written ``NULL`` in the table ``area``, to be rebuilt from their
+    arcs once loaded; the table ``area_geometry_ref`` with the references
+    of the subdivisions which boundaries, written ``NULL`` in the table
+    ``area``, are those of another subdivision, and which arcs are not
+    written either; the
+    table ``area_piece`` with the pieces which their boundaries have been
+    subdivided into, when requested.
+
+    @note: the rows are generated one by one, as building the list of all
+        the rows of a country with massive data would lead to a
+        ``MemoryError``.
+
+
+    @param table_name: the name of the table, as defined in
+        ``COPY_TABLE_COLUMNS``.
+
+    @param administrative_subdivisions: a dictionary of
+        ``AdministrativeSubdivision`` instances of all the administrative
+        subdivisions of a country.  The key corresponds to the code of an
+        administrative subdivision, while the value is the instance itself.
+
+
+    @return: a generator of the rows of the table, without line
+        terminator.
+    """
+    if table_name == 'area':
+        for subdivision in administrative_subdivisions.itervalues():
+            yield """%(area_id)s\t%(parent_area_id)s\t%(area_code)s\t%(area_type)s\t%(area_level)s\t%(boundaries)s""" % {
+                    'area_id': subdivision.id,
+                    'area_code': escape_copy_text(subdivision.code),
+                    'area_type': r'\N' if not subdivision.area_type else escape_copy_text(subdivision.area_type),
+                    'area_level': subdivision.level,
+                    'boundaries': r'\N' if subdivision.geometry_reference or subdivision.arcs is not None \
+                        else r'SRID=4326;MULTIPOLYGON(%s)' % (
+                            (','.join([ '((%s))' % format_boundary(boundary) for boundary in subdivision.boundaries ]))),
+                    'parent_area_id': r'\N' if subdivision.level == 0 \
+                        else administrative_subdivisions[subdivision.parent_code].id }
+
+    elif table_name == 'area_label':
+        for subdivision in administrative_subdivisions.itervalues():
+            yield """%(area_id)s\t%(content)s""" % {
+                    'area_id': subdivision.id,
+                    'content': escape_copy_text(subdivision.name) }
+
+    elif table_name == 'area_index':
+        for subdivision in administrative_subdivisions.itervalues():
+            for keyword in extract_keywords(subdivision.name):
+                yield """%(area_id)s\t%(keyword)s""" % {
+                        'area_id': subdivision.id,
+                        'keyword': escape_copy_text(keyword) }
+
+    elif table_name == 'area_arc':
+        arc_ids = set()
+        for subdivision in administrative_subdivisions.itervalues():
+            if subdivision.geometry_reference:
+                continue
+
+            for (arc_id, coordinates) in [ arc for ring_arcs in subdivision.arcs or [] for (arc, _) in ring_arcs ]:
+                if arc_id not in arc_ids:
+                    arc_ids.add(arc_id)
+                    yield """%(arc_id)s\t%(path)s""" % {
+                            'arc_id': arc_id,
+                            'path': r'SRID=4326;LINESTRING(%s)' % format_boundary(coordinates) }
+
+    elif table_name == 'area_arc_ref':
+        for subdivision in administrative_subdivisions.itervalues():
+            if subdivision.geometry_reference:
+                continue
+
+            for (ring_index, ring_arcs) in enumerate(subdivision.arcs or []):
+                for (arc_index, ((arc_id, _), is_reversed)) in enumerate(ring_arcs):
+                    yield """%(area_id)s\t%(ring_index)s\t%(arc_index)s\t%(arc_id)s\t%(is_reversed)s""" % {
+                            'area_id': subdivision.id,
+                            'ring_index': ring_index,
+                            'arc_index': arc_index,
+                            'arc_id': arc_id,
+                            'is_reversed': 't' if is_reversed else 'f' }
+
+    elif table_name == 'area_geometry_ref':
+        for subdivision in administrative_subdivisions.itervalues():
+            if subdivision.geometry_reference:
+                yield """%(area_id)s\t%(geometry_area_id)s""" % {
+                        'area_id': subdivision.id,
+                        'geometry_area_id': subdivision.geometry_reference.id }
+
+    elif table_name == 'area_piece':
+        for subdivision in administrative_subdivisions.itervalues():
+            for piece in subdivision.pieces or []:
+                yield """%(area_id)s\t%(geom)s""" % {
+                        'area_id': subdivision.id,
+                        'geom': r'SRID=4326;POLYGON((%s))' % format_boundary(piece) }
+
+
+def iter_countries(country_codes=None, archive_path=None, cache_path=None,
+        cache_expiration_time=GADM_CACHE_EXPIRATION_TIME,
+        administrative_level_count=None,
+        dbase_decoding_required=False,
+        progress_file_handle=None):
+    """
+    Fetch the data of the supported countries one by one, so that a Python
+    program can process them, with the function ``iter_subdivisions``,
+    without generating a file of SQL commands.
+
+    The archive files that are not stored in the local cache are deleted
+    when the caller requests the next country, or closes the generator.
+    The CSV data of the ESRI geodatabase of a country are exported, and
+    deleted, by the function ``iter_subdivisions``.
+
+    @note: contrary to the command line, the archives of a country are
+        only fetched when the caller requests this country, which is
+        suitable for processing the countries sequentially, in the
+        process of the caller.
+
+
+    @param country_codes: a set of the ISO 3166-1 alpha-3 codes of the
+        countries to fetch, or ``None`` to fetch all the supported
+        countries.
+
+    @param archive_path: absolute path and name of a global archive of the
+        whole world, or absolute path of a local directory that mirrors
+        the GADM ZIP archives of every country, or ``None`` to download
+        the archives from GADM Web site.
+
+    @param cache_path: absolute path of the local cache where the archive
+        files are stored in, or ``None`` to store them in temporary files.
+
+    @param cache_expiration_time: time in seconds during which the cached
+        representation of the GADM data is considered fresh.
+
+    @param administrative_level_count: the maximum number of
+        administrative levels of each country to fetch, or ``None`` to
+        fetch all of them.
+
+    @param dbase_decoding_required: indicate whether to determine the
+        code page of the dBase IV files of each country, as defined by the
+        function ``fetch_country_data``.
+
+    @param progress_file_handle: a file-like object where to write the
+        progress messages, as defined by the function
+        ``redirect_progress``, or ``None`` to write them to the standard
+        error, leaving the standard output to the caller.
+
+
+    @return: a generator of the ``CountryData`` named tuples of the
+        countries, as returned by the function ``fetch_country_data``.
+    """
+    global_archive_required = archive_path and os.path.isfile(archive_path)
+    mirror_path = archive_path if archive_path and not global_archive_required else None
+
+    if not (global_archive_required or dbase_decoding_required) and file_util.which('mdb-export') is None:
+        raise Exception('The mdb-export executable has not been found while this program is required to use this script')
+
+    split_path = None
+    try:
+        country_zip_file_path_names = {}
+        if global_archive_required:
+            split_path = os.path.join(cache_path, SPLIT_ARCHIVE_CACHE_DIRECTORY_NAME) if cache_path else tempfile.mkdtemp()
+            file_util.make_directory_if_not_exists(split_path)
+            with redirect_progress(progress_file_handle):
+                print '[INFO] Splitting the global archive %s...' % archive_path
+                country_zip_file_path_names = split_global_archive(archive_path, split_path,
+                        country_codes=country_codes,
+                        administrative_level_count=administrative_level_count)
+
+        for (country_code, country_name) in GADM_SUPPORTED_COUNTRIES:
+            if global_archive_required and country_code not in country_zip_file_path_names:
+                continue
+
+            if country_codes and country_code not in country_codes:
+                continue
+
+            with redirect_progress(progress_file_handle):
+                print '[INFO] Fetching %s data...' % country_name
+                country_data = fetch_country_data(country_code,
+                        cache_path=cache_path,
+                        cache_required=cache_path is not None,
+                        cache_expiration_time=cache_expiration_time,
+                        mirror_path=mirror_path,
+                        shape_zip_file_path_name=country_zip_file_path_names.get(country_code),
+                        esri_required=not global_archive_required,
+                        dbase_decoding_required=dbase_decoding_required or global_archive_required,
+                        max_administrative_level_count=administrative_level_count)
+
+            try:
+                yield country_data
+            finally:
+                if cache_path is None and not mirror_path:
+                    os.remove(country_data.shape_zip_file_path_name)
+                    if country_data.esri_zip_file_path_name:
+                        os.remove(country_data.esri_zip_file_path_name)
+
+    finally:
+        if split_path and cache_path is None:
+            shutil.rmtree(split_path)
+
+
+def iter_subdivisions(country_data, progress_file_handle=None, **processing_options):
+    """
+    Return the administrative subdivisions of a country, as records that
+    a Python program can consume directly, for instance to write them
+    with its own subclass of ``OutputWriter``, or to load them into a
+    database through its own driver.
+
+
+    @param country_data: a ``CountryData`` named tuple of the data of a
+        country, as returned by the functions ``fetch_country_data`` or
+        ``iter_countries``.
+
+    @param progress_file_handle: a file-like object where to write the
+        progress messages, as defined by the function
+        ``redirect_progress``, or ``None`` to write them to the standard
+        error, leaving the standard output to the caller.
+
+    @param processing_options: the options of the preparation of the
+        administrative subdivisions, as defined by the function
+        ``prepare_administrative_subdivisions``.
+
+
+    @return: a generator of the ``AreaRecord`` named tuples of the
+        administrative subdivisions of this country, in any order, unless
+        a spatial order is requested.
+    """
+    with redirect_progress(progress_file_handle):
+        administrative_subdivisions = prepare_administrative_subdivisions(country_data, **processing_options)
+
+    for subdivision in administrative_subdivisions.itervalues():
+        yield AreaRecord(
+                area_id=subdivision.id,
+                parent_area_id=None if subdivision.level == 0 \
+                    else administrative_subdivisions[subdivision.parent_code].id,
+                country_code=country_data.country_code,
+                area_code=subdivision.code,
+                parent_area_code=subdivision.parent_code if subdivision.level > 0 else None,
+                area_level=subdivision.level,
+                area_type=subdivision.area_type,
+                name=subdivision.name,
+                boundaries=(subdivision.geometry_reference or subdivision).boundaries)
+
+
+def load_archive_catalog(zip_file, zip_file_path_name, country_code, persistent=False):
+    """
+    Return the catalog of a shape ZIP archive of a country, either from
+    the catalog file stored next to this archive, if this file is still
+    valid, either by building this catalog from the central directory of
+    the archive.
+
+
+    @param zip_file: a shape ZIP archive instance.
+
+    @param zip_file_path_name: absolute path and name of the file of this
+        archive.
+
+    @param country_code: an ISO 3166-1 alpha-3 code representing the
+        country of this archive.
+
+    @param persistent: indicate whether to store the catalog next to the
+        archive, when this archive is kept in the local cache.
+
+
+    @return: the catalog of this archive, as returned by the function
+        ``build_archive_catalog``, with the additional keys
+        ``archive_size`` and ``archive_mtime`` that the catalog file is
+        validated against.
+    """
+    catalog_file_path_name = zip_file_path_name + GADM_ARCHIVE_CATALOG_FILE_NAME_SUFFIX
+    archive_stat = os.stat(zip_file_path_name)
+
+    if os.path.exists(catalog_file_path_name):
+        with open(catalog_file_path_name) as file_handle:
+            catalog = json.load(file_handle)
+
+        if catalog.get('archive_size') == archive_stat.st_size and catalog.get('archive_mtime') == archive_stat.st_mtime:
+            return catalog
+
+    catalog = build_archive_catalog(zip_file, country_code)
+    catalog['archive_size'] = archive_stat.st_size
+    catalog['archive_mtime'] = archive_stat.st_mtime
+
+    if persistent:
+        try:
+            with open(catalog_file_path_name, 'wt') as file_handle:
+                json.dump(catalog, file_handle)
+        except (IOError, OSError) as error: # Read-only mirror
+            sys.stderr.write('[WARNING] Cannot store the catalog %s: %s\n' % (catalog_file_path_name, error))
+
+    return catalog
+
+
+def load_parsed_country(parsed_cache_path, country_code, checksum):
+    """
+    Load the parsed data of a country from the cache, as stored by the
+    function ``save_parsed_country``.
+
+    The coordinates of the boundaries are memory-mapped, without being
+    read nor copied: each boundary is a view of the array of all the
+    coordinates of the country.
+
+
+    @param parsed_cache_path: absolute path of the directory where the
+        parsed data of the countries are stored.
+
+    @param country_code: an ISO 3166-1 alpha-3 code representing the
+        country.
+
+    @param checksum: the checksum of the data of the country, as returned
+        by the function ``calculate_country_data_checksum``.
+
+
+    @return: a dictionary of ``AdministrativeSubdivision`` instances of
+        all the administrative subdivisions of this country, or ``None``
+        if the cache doesn't contain the parsed data of this country for
+        this checksum.
+    """
+    file_path_name_prefix = os.path.join(parsed_cache_path, '%s.%s' % (country_code, checksum))
+    if not os.path.exists(file_path_name_prefix + '.json'):
+        return None
+
+    with open(file_path_name_prefix + '.json', 'rt') as file_handle:
+        subdivisions = json.load(file_handle)
+
+    coordinates = numpy.load(file_path_name_prefix + '.coordinates.npy', mmap_mode='r')
+    ring_offsets = numpy.load(file_path_name_prefix + '.offsets.npy').tolist()
+
+    administrative_subdivisions = {}
+    ring_index = 0
+    for (code, parent_code, name, level, area_type, ring_count) in subdivisions:
+        administrative_subdivisions[code] = AdministrativeSubdivision.restore(code, parent_code, name, level, area_type,
+                [ coordinates[ring_offsets[i]:ring_offsets[i + 1]] for i in range(ring_index, ring_index + ring_count) ])
+        ring_index += ring_count
+
+    return administrative_subdivisions
+
+
+def load_shards(shard_path, dsn, session_count, bulk_load=False):
+    """
+    Load the shards written by ``ShardedCopyWriter`` into a PostgreSQL
+    database, running the command line ``psql`` with at most the
+    specified number of concurrent sessions, one session per shard.
+
+    The shards of the table ``area`` of a country are loaded before the
+    other shards of this country, which rows reference the rows of this
+    table, and the shards of the table ``area_arc`` before the shards of
+    the table ``area_arc_ref``.  The rows of an administrative subdivision and of its parent
+    are always in the same shard.  The largest shards are loaded first.
+
+    A marker file is written next to each shard successfully loaded, so
+    that a failed load can be resumed, skipping the shards already loaded.
+
+    Once all the shards are loaded, the function rebuilds the boundaries
+    of the geographical areas from their arcs, if their topology has been
+    written, and generates their simplified boundaries, as the output of
+    the format ``sql`` does, so that both loads end in the same state.
+
+
+    @param shard_path: absolute path of the directory of the shards.
+
+    @param dsn: connection string or name of the database, as accepted by
+        the option ``--dbname`` of ``psql``.
+
+    @param session_count: maximum number of concurrent sessions.
+
+    @param bulk_load: indicate whether to drop the secondary indexes and
+        constraints of the tables before loading the shards, and to
+        restore them once all the shards are loaded.
+
+
+    @raise Exception: if the checksum of a shard doesn't match the
+        manifest, or if the load of a shard fails.
+    """
+    with open(os.path.join(shard_path, SHARD_MANIFEST_FILE_NAME)) as file_handle:
+        manifest = json.load(file_handle)
+
+    column_names = dict(manifest['tables'])
+
+    loaded_shards = set()
+    pending_shards = []
+    for shard in sorted(manifest['shards'], key=lambda shard: shard['size'], reverse=True):
+        if os.path.exists(os.path.join(shard_path, shard['file_name'] + SHARD_LOADED_MARKER_FILE_NAME_SUFFIX)):
+            loaded_shards.add((shard['country_code'], shard['table_name']))
+        else:
+            pending_shards.append(shard)
+
+    print '[INFO] Loading %d shards (%d already loaded)...' % (len(pending_shards), len(loaded_shards))
+
+    if bulk_load:
+        execute_psql(dsn, SqlCopyWriter.BULK_LOAD_PREAMBLE % {
+                'maintenance_work_mem': BULK_LOAD_MAINTENANCE_WORK_MEM })
+
+    running_shards = []
+
+    try:
+        while pending_shards or running_shards:
+            for shard in list(pending_shards):
+                if len(running_shards) >= session_count:
+                    break
+
+                if any([ (shard['country_code'], table_name) not in loaded_shards
+                        for table_name in COPY_TABLE_DEPENDENCIES.get(shard['table_name'], ()) ]):
+                    continue
+
+                shard_file_path_name = os.path.join(shard_path, shard['file_name'])
+                checksum = hashlib.sha256()
+                with open(shard_file_path_name, 'rb') as file_handle:
+                    for data in iter(lambda: file_handle.read(1024 * 1024), ''):
+                        checksum.update(data)
+                if checksum.hexdigest() != shard['checksum']:
+                    raise Exception('The checksum of the shard %s does not match the manifest' % shard['file_name'])
+
+                with open(shard_file_path_name, 'rb') as file_handle:
+                    process = subprocess.Popen([ 'psql', '--no-psqlrc', '--quiet',
+                            '--set', 'ON_ERROR_STOP=1',
+                            '--dbname', dsn,
+                            '--command', 'COPY %s(%s) FROM STDIN' % (shard['table_name'], ', '.join(column_names[shard['table_name']])) ],
+                        stdin=file_handle)
+
+                running_shards.append((process, shard))
+                pending_shards.remove(shard)
+
+            completed_shards = [ running_shard for running_shard in running_shards if running_shard[0].poll() is not None ]
+            if not completed_shards:
+                time.sleep(GADM_SCHEDULER_POLLING_INTERVAL)
+                continue
+
+            for running_shard in completed_shards:
+                (process, shard) = running_shard
+                running_shards.remove(running_shard)
+                if process.returncode != 0:
+                    raise Exception('The load of the shard %s failed' % shard['file_name'])
+
+                open(os.path.join(shard_path, shard['file_name'] + SHARD_LOADED_MARKER_FILE_NAME_SUFFIX), 'w').close()
+                loaded_shards.add((shard['country_code'], shard['table_name']))
+                print '[INFO] Loaded %s (%d rows)' % (shard['file_name'], shard['row_count'])
+
+    finally:
+        for (process, _) in running_shards:
+            if process.poll() is None:
+                process.terminate()
+
+    # Run the commands that the format ``sql`` writes after the data,
+    # in a single session so that the setting of the memory applies to
+    # the restoration of the indexes.
+    execute_psql(dsn, ''.join([
+            "SET maintenance_work_mem = '%s';\n" % BULK_LOAD_MAINTENANCE_WORK_MEM,
+            SqlCopyWriter.REBUILD_BOUNDARIES_COMMAND,
+            SqlCopyWriter.SIMPLIFY_BOUNDARIES_COMMAND,
+            SqlCopyWriter.BULK_LOAD_POSTAMBLE % {} if bulk_load else '' ]))
+
+
+def open_work_queue(work_path, settings, country_codes=None):
+    """
+    Return the countries of a shared work directory, creating the queue
+    file of this directory with the specified countries if it doesn't
+    exist yet.
+
+    The queue file is written to a temporary file that is then linked to
+    its final name, which only the first worker succeeds in, so that the
+    workers never read a partially written queue file.
+
+
+    @param work_path: absolute path of the shared work directory.
+
+    @param settings: a dictionary of the settings of the caller that
+        change the output, such as ``{'output_format': 'sql', 'precision':
+        6}``, which need to be the same for all the workers of this
+        directory.  Only the settings of this dictionary are compared with
+        the settings of the work directory, so that the caller that only
+        assembles the parts passes the settings of the output format.
+
+    @param country_codes: the list of the ISO 3166-1 alpha-3 codes of the
+        countries to process, if the queue file needs to be created, or
+        ``None`` if the queue file needs to exist.
+
+
+    @return: the list of the ISO 3166-1 alpha-3 codes of the countries of
+        the work directory.
+
+
+    @raise Exception: if the queue file doesn't exist and no country is
+        specified, or if the settings of the work directory differ from
+        the specified settings.
+    """
+    queue_file_path_name = os.path.join(work_path, WORK_QUEUE_FILE_NAME)
+
+    # Compare the settings as they are stored in the queue file, where
+    # tuples, such as a bounding box, are stored as lists.
+    settings = json.loads(json.dumps(settings))
+
+    if country_codes is not None and not os.path.exists(queue_file_path_name):
+        temporary_file_path_name = '%s.%s.%d' % (queue_file_path_name, socket.gethostname(), os.getpid())
+        with open(temporary_file_path_name, 'wt') as file_handle:
+            json.dump({ 'countries': country_codes, 'settings': settings }, file_handle, indent=2)
+
+        try:
+            os.link(temporary_file_path_name, queue_file_path_name)
+        except OSError as exception:
+            if exception.errno != errno.EEXIST:
+                raise
+        finally:
+            os.remove(temporary_file_path_name)
+
+    if not os.path.exists(queue_file_path_name):
+        raise Exception('The directory %s contains no queue of countries' % work_path)
+
+    with open(queue_file_path_name) as file_handle:
+        queue = json.load(file_handle)
+
+    if any([ queue['settings'].get(name) != value for (name, value) in settings.iteritems() ]):
+        raise Exception('The settings %s of the work directory %s differ from the settings %s' % \
+                (json.dumps(queue['settings'], sort_keys=True), work_path, json.dumps(settings, sort_keys=True)))
+
+    return queue['countries']
+
+
+def parse_administrative_level(level_arguments):
+    """
+    Retrieve the administrative subdivisions of an administrative level
+    of a country, decoding the shape file and the dBase IV file of this
+    level, without linking these subdivisions to their parent.
+
+    This function is the entry point of the processes of the pool that
+    the function ``build_administrative_subdivisions`` runs to parse the
+    administrative levels of a country in parallel.
+
+
+    @param level_arguments: a tuple ``(zip_file_path_name, country_code,
+        administrative_level, encoding, bbox)`` where:
+
+        * ``zip_file_path_name``: absolute path and name of the shape ZIP
+          archive of the country.
+
+        * ``country_code``: an ISO 3166-1 alpha-3 code representing the
+          country.
+
+        * ``administrative_level``: the administrative level to parse.
+
+        * ``encoding``: the code page of the dBase IV file of this level,
+          or ``None`` if it has not been determined.
+
+        * ``bbox``: a tuple ``(xmin, ymin, xmax, ymax)`` of the bounding
+          box that the shapes to decode need to intersect, or ``None`` to
+          decode all the shapes.  The other shapes are skipped, without
+          being decoded, as defined by the function
+          ``select_shape_records``.
+
+
+    @return: a list of ``AdministrativeSubdivision`` instances, in the
+        order of the records of the shape file.
+    """
+    (zip_file_path_name, country_code, administrative_level, encoding, bbox) = level_arguments
+    print '[INFO] Parsing administrative level %d...' % administrative_level
+
+    with zipfile.ZipFile(zip_file_path_name) as zip_file:
+        shape_memory_mapped_file = zip_util.open_entry_file(zip_file, '%s_adm%d.shp' % (country_code, administrative_level))
+        dbase_memory_mapped_file = zip_util.open_entry_file(zip_file, '%s_adm%d.dbf' % (country_code, administrative_level))
+        reader = shapefile.Reader(shp=shape_memory_mapped_file, dbf=dbase_memory_mapped_file)
+
+        field_names = [ field[0] for field in reader.fields[1:] ]
+
+        if bbox:
+            index_memory_mapped_file = zip_util.open_entry_file(zip_file, '%s_adm%d.shx' % (country_code, administrative_level))
+            (offsets, record_indices) = select_shape_records(shape_memory_mapped_file, index_memory_mapped_file, bbox)
+
+            # [PATCH:20261019] pyshp reads the offsets of the shapes from the
+            # index file with ``array.fromfile``, which requires a real file
+            # object.  The selected shapes are read at the offsets that
+            # ``select_shape_records`` has read from the index file instead.
+            shape_records = ((read_shape_boundaries(shape_memory_mapped_file, offsets[i]), reader.record(i))
+                    for i in record_indices)
+        else:
+            def get_shape_boundaries(shape):
+                geometry = shape.__geo_interface__
+                geomerty_type = geometry['type']
+                if geomerty_type != 'Polygon' and geomerty_type != 'MultiPolygon':
+                    raise Exception('Unexpected geometry type "%s"' % geomerty_type)
+
+                geomerty_coordinates = geometry['coordinates']
+                return [ geomerty_coordinates[0] ] if geomerty_type == 'Polygon' \
+                    else [ geometry[0] for geometry in geomerty_coordinates ]
+
+            shape_records = ((get_shape_boundaries(shapeRecord.shape), shapeRecord.record) for shapeRecord in reader.shapeRecords())
+
+        administrative_subdivisions = []
+
+        for (boundaries, record) in shape_records:
+            attributes = dict(zip(field_names, record))
+
+            administrative_subdivisions.append(AdministrativeSubdivision(
+                    '.'.join([ str(attributes['ID_%d' % i]) for i in range(administrative_level + 1) ]),
+                     attributes['NAME_ENGLI'].strip() if administrative_level == 0 \
+                            else attributes['NAME_%d' % administrative_level].strip(), # VARNAME_%d not always exists
+                     administrative_level,
+                     'Country' if administrative_level == 0 else attributes['ENGTYPE_%d' % administrative_level].strip(),
+                     boundaries,
+                     encoding=encoding))
+
+    return administrative_subdivisions
+
+
+def parse_memory_size(value):
+    """
+    Convert a memory size expressed with an optional binary unit suffix,
+    such as ``512M`` or ``4G``, into a number of bytes.
+
+
+    @param value: a memory size, such as ``1073741824``, ``1024M``, or
+        ``1G``.
+
+
+    @return: the number of bytes of this memory size.
+
+    @raise argparse.ArgumentTypeError: if the value is not a valid memory
+        size.
+    """
+    match = re.match(r'^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*$', value, re.IGNORECASE)
+    if not match:
+        raise argparse.ArgumentTypeError('invalid memory size "%s"' % value)
+    return int(float(match.group(1)) * 1024 ** ' KMGT'.index(match.group(2).upper() or ' '))
+
+
+def prepare_administrative_subdivisions(country_data, precision=None,
+        topology_required=False, tolerance=None, level_job_count=1, spatial_order=None, parsed_cache_path=None,
+        bbox=None, boundary_dedup_required=False, max_piece_vertex_count=None):
+    """
+    Retrieve the shapes and the names of the administrative subdivisions
+    of a country, and prepare them to be written to an output.
+
+
+    @param country_data: a ``CountryData`` named tuple of the data of a
+        country, as returned by the function ``fetch_country_data``.
+
+    @param precision: the number of decimal places to round the coordinates
+        of the boundaries to, or ``None`` to keep their full precision.
+
+    @param topology_required: indicate whether to write the topology of
+        the boundaries, i.e., the arcs shared between them, instead of
+        the boundaries themselves.
+
+    @param tolerance: the maximum distance, in degrees, to simplify the
+        arcs of the topology, or ``None`` not to simplify them.  This
+        parameter is ignored if ``topology_required`` is ``False``.
+
+    @param level_job_count: maximum number of administrative levels of
+        this country to parse in parallel, if the boundaries of this
+        country have at least ``GADM_PARALLEL_LEVELS_MIN_VERTEX_COUNT``
+        vertices.
+
+    @param spatial_order: ``level`` or ``global`` to write the
+        administrative subdivisions in the Hilbert order of their bounding
+        box, as defined by the function ``sort_administrative_subdivisions``,
+        or ``None`` to write them in any order.
+
+    @param parsed_cache_path: absolute path of the directory of the cache
+        where the parsed data of the countries are stored, or ``None`` not
+        to use this cache.
+
+    @param bbox: a tuple ``(xmin, ymin, xmax, ymax)`` of the bounding box
+        that the boundaries of the administrative subdivisions to write
+        need to intersect, or ``None`` to write all of them.
+
+    @param boundary_dedup_required: indicate whether to write once the
+        boundaries that are identical for several administrative
+        subdivisions, as defined by the function ``deduplicate_boundaries``.
+
+    @param max_piece_vertex_count: the maximum number of vertices of the
+        pieces which the boundaries of the administrative subdivisions are
+        subdivided into, as defined by the function ``subdivide_boundary``,
+        or ``None`` not to subdivide them.
+
+
+    @return: a dictionary of ``AdministrativeSubdivision`` instances of
+        all the administrative subdivisions of this country.  The key
+        corresponds to the code of an administrative subdivision, while the
+        value is the instance itself.
+    """
+    (country_code, administrative_level_count, shape_zip_file_path_name, esri_zip_file_path_name, dbase_encodings, catalog) = country_data
+
+    country_vertex_count = sum([ level['vertex_count'] for level in catalog['levels'] ])
+
+    # Load the data of this country from the cache, if they have been
+    # already parsed from the same archive, instead of parsing them again.
+    administrative_subdivisions = None
+    if parsed_cache_path:
+        checksum = calculate_country_data_checksum(country_data, bbox=bbox)
+        administrative_subdivisions = load_parsed_country(parsed_cache_path, country_code, checksum)
+        if administrative_subdivisions is not None:
+            print '[INFO] Loaded the parsed data of country %s from the cache' % country_code
+
+    if administrative_subdivisions is None:
+        # Extract the CSV files of the data extracted from the ESRI
+        # geodatabase for every administrative subdivision of the given
+        # country, before parsing the shape files, while this process
+        # still has a small memory footprint to fork ``mdb-export``.
+        # There is one file per administrative subdivision level.
+        esri_file_path_names = []
+        if esri_zip_file_path_name:
+            with zipfile.ZipFile(esri_zip_file_path_name) as esri_zip_file:
+                esri_file_path_names = extract_esri_files(esri_zip_file, country_code, administrative_level_count)
+
+        try:
+            with zipfile.ZipFile(shape_zip_file_path_name) as shape_zip_file:
+                administrative_subdivisions = build_administrative_subdivisions(shape_zip_file, country_code, administrative_level_count,
+                        dbase_encodings=dbase_encodings,
+                        job_count=level_job_count if country_vertex_count >= GADM_PARALLEL_LEVELS_MIN_VERTEX_COUNT else 1,
+                        bbox=bbox)
+
+            update_administrative_subdivision_metadata(country_code, administrative_subdivisions, esri_file_path_names,
+                    partial=bool(bbox))
+        finally:
+            for esri_file_path_name in esri_file_path_names:
+                os.remove(esri_file_path_name)
+
+        if parsed_cache_path:
+            save_parsed_country(parsed_cache_path, country_code, checksum, administrative_subdivisions)
+
+    if precision is not None:
+        for subdivision in administrative_subdivisions.itervalues():
+            subdivision.boundaries = quantize_boundaries(subdivision.boundaries, precision)
+
+    if topology_required:
+        vertex_count = sum([ len(boundary) for subdivision in administrative_subdivisions.itervalues()
+                for boundary in subdivision.boundaries ])
+        arcs = build_topology(administrative_subdivisions, tolerance=tolerance)
+        print '[INFO] Built the topology of country %s: %d arcs of %d vertices (%d vertices in boundaries)' % \
+                (country_code, len(arcs), sum([ len(coordinates) for (_, coordinates) in arcs ]), vertex_count)
+
+    if boundary_dedup_required:
+        print '[INFO] Deduplicated the boundaries of %d administrative subdivisions of country %s' % \
+                (deduplicate_boundaries(administrative_subdivisions), country_code)
+
+    # Subdivide the boundaries into pieces, except the boundaries of the
+    # administrative subdivisions that reference the boundaries of another
+    # subdivision, which pieces are those of this other subdivision: the
+    # queries of the pieces find these subdivisions through the table
+    # ``area_geometry_ref``.
+    if max_piece_vertex_count:
+        for subdivision in administrative_subdivisions.itervalues():
+            if subdivision.geometry_reference is None:
+                subdivision.pieces = [ piece for boundary in subdivision.boundaries
+                        for piece in subdivide_boundary(boundary, max_piece_vertex_count) ]
+                if precision is not None:
+                    subdivision.pieces = quantize_boundaries(subdivision.pieces, precision)
+
+        print '[INFO] Subdivided the boundaries of country %s into %d pieces of at most %d vertices' % \
+                (country_code, sum([ len(subdivision.pieces or []) for subdivision in administrative_subdivisions.itervalues() ]),
+                 max_piece_vertex_count)
+
+    if spatial_order:
+        administrative_subdivisions = sort_administrative_subdivisions(administrative_subdivisions, spatial_order)
+
+    return administrative_subdivisions
+
+
+def process_country(country_data, part_file_path_name, output_writer_class=None, **processing_options):
+    """
+    Retrieve the shapes and the names of the administrative subdivisions
+    of a country, and write them to a part of the output.
+
+    This function is the entry point of the processes that the function
+    ``schedule_countries`` runs in parallel.
+
+
+    @param country_data: a ``CountryData`` named tuple of the data of a
+        country, as returned by the function ``fetch_country_data``.
+
+    @param part_file_path_name: absolute path and name of the part where
+        the administrative subdivisions of this country needs to be
+        written in.
+
+    @param output_writer_class: a subclass of ``OutputWriter``, or a
+        callable with the same signature, to create the writer of the part;
+        defaults to ``SqlCopyWriter``.
+
+    @param processing_options: the options of the preparation of the
+        administrative subdivisions, as defined by the function
+        ``prepare_administrative_subdivisions``.
+    """
+    print '[INFO] Processing country %s...' % country_data.country_code
+
+    administrative_subdivisions = prepare_administrative_subdivisions(country_data, **processing_options)
+
+    output_writer = (output_writer_class or SqlCopyWriter)(part_file_path_name, part=True)
+    output_writer.write_country(country_data.country_code, administrative_subdivisions)
+    output_writer.close()
+
+
+def process_leased_country(country_code, part_file_path_name, fetch_options, **processing_options):
+    """
+    Fetch the data of a country leased by a worker of a shared work
+    directory, and write its administrative subdivisions to a part of
+    this directory.
+
+    This function is the entry point of the processes that the function
+    ``run_worker`` runs in parallel.
+
 
-    esri_file_path_names = extract_esri_files(esri_zip_file, country_code, administrative_level_count)
+    @param country_code: an ISO 3166-1 alpha-3 code representing the
+        country to process.
 
-    shape_zip_file.close()
-    esri_zip_file.close()
+    @param part_file_path_name: absolute path and name of the part where
+        the administrative subdivisions of this country needs to be
+        written in.
+
+    @param fetch_options: a dictionary of the keyword arguments passed to
+        the function ``fetch_country_data``.
+
+    @param processing_options: additional keyword arguments passed to the
+        function ``process_country``.
+    """
+    country_data = fetch_country_data(country_code, **fetch_options)
+
+    try:
+        process_country(country_data, part_file_path_name, **processing_options)
+
+    finally:
+        # Delete the archive files, if no caching is required.
+        if not fetch_options.get('cache_required') and not fetch_options.get('mirror_path'):
+            os.remove(country_data.shape_zip_file_path_name)
+            if country_data.esri_zip_file_path_name:
+                os.remove(country_data.esri_zip_file_path_name)
+
+
+def quantize_boundaries(boundaries, precision):
+    """
+    Round the coordinates of the boundaries of an administrative
+    subdivision to the specified number of decimal places, removing the
+    consecutive duplicate vertices that this rounding creates.
+
+    Rings remain closed.  Rings that collapse to less than three distinct
+    vertices are removed; if all the rings of the subdivision collapse,
+    its boundaries are returned unchanged so that the subdivision is not
+    lost.
+
+
+    @param boundaries: a list of boundaries, each of them being a NumPy
+        array of coordinates ``(longitude, latitude)`` that define a closed
+        line.
+
+    @param precision: the number of decimal places to keep.  A precision
+        of 6 corresponds to about 10 centimeters at the equator.
+
+
+    @return: the list of quantized boundaries.
+    """
+    quantized_boundaries = []
+
+    for boundary in boundaries:
+        quantized_boundary = numpy.round(boundary, precision)
+
+        distinct_vertices = numpy.ones(len(quantized_boundary), dtype=bool)
+        distinct_vertices[1:] = numpy.any(quantized_boundary[1:] != quantized_boundary[:-1], axis=1)
+        quantized_boundary = quantized_boundary[distinct_vertices]
+
+        if not numpy.array_equal(quantized_boundary[0], quantized_boundary[-1]):
+            quantized_boundary = numpy.vstack((quantized_boundary, quantized_boundary[:1]))
+
+        if len(quantized_boundary) >= 4:
+            quantized_boundaries.append(quantized_boundary)
+
+    return quantized_boundaries or boundaries
+
+
+def read_shape_boundaries(shape_file_handle, offset):
+    """
+    Read the boundaries of the polygon shape stored at the specified
+    offset of a shape file, without decoding the other shapes.
+
+    The content of a polygon record starts, after a header of 8 bytes,
+    with its shape type, its bounding box, its number of parts, and its
+    number of points, followed by the index of the first point of each
+    part, and by the coordinates ``(x, y)`` of every point.  The Z and M
+    values that follow the points of the types PolygonZ and PolygonM are
+    ignored.
+
+
+    @param shape_file_handle: a file-like object of the shape file.
+
+    @param offset: the offset in bytes of the record of the shape, as read
+        from the index file (``.shx``) by ``select_shape_records``.
+
+
+    @return: a list of the boundaries of the shape, one per part, each
+        represented by a list of tuples ``(longitude, latitude)``.
+
+    @raise Exception: if the shape is not a polygon.
+    """
+    shape_file_handle.seek(offset + 8)
+    (shape_type, _, _, _, _, part_count, point_count) = struct.unpack('<i4d2i', shape_file_handle.read(44))
+    if shape_type not in (5, 15, 25): # Polygon, PolygonZ, PolygonM
+        raise Exception('Unexpected shape type %d' % shape_type)
+
+    part_indices = list(struct.unpack('<%di' % part_count, shape_file_handle.read(part_count * 4))) + [ point_count ]
+    coordinates = struct.unpack('<%dd' % (point_count * 2), shape_file_handle.read(point_count * 16))
+    points = zip(coordinates[::2], coordinates[1::2])
+
+    return [ points[start:end] for (start, end) in zip(part_indices[:-1], part_indices[1:]) ]
+
+
+@contextlib.contextmanager
+def redirect_progress(file_handle):
+    """
+    Redirect the progress messages that the functions of this script
+    print to the standard output, such as the ``[INFO]`` messages, to the
+    specified file-like object, for the duration of a ``with`` block.
+    The warnings are still written to the standard error.
+
+    @note: the processes forked within this block, such as the pool of
+        processes that parse the administrative levels of a large country,
+        inherit this redirection, and write their messages to their own
+        copy of the file-like object, which is thus expected to be backed
+        by a file descriptor, such as a file or a pipe.
+
+    @param file_handle: a file-like object, or ``None`` to redirect the
+        progress messages to the standard error, wrapped, as the standard
+        output is in the main function, in a writer that encodes the
+        unicode characters of these messages, such as the names of some
+        countries.
+    """
+    standard_output = sys.stdout
+    sys.stdout = file_handle or codecs.getwriter(sys.stderr.encoding if sys.stderr.isatty() \
+            else locale.getpreferredencoding())(sys.stderr)
+    try:
+        yield
+    finally:
+        sys.stdout = standard_output
+
+
+def run_benchmark(sql_file_path_name, dsn, result_file_path_name):
+    """
+    Measure the time to load SQL commands generated by the script into a
+    PostgreSQL database with the extension PostGIS, and the performance
+    of the loaded tables, and append the results to a file, so that the
+    results of distinct versions of the script can be compared.
+
+    The benchmark drops and creates the tables defined in
+    ``BENCHMARK_SCHEMA``, loads the SQL commands, builds the indexes
+    defined in ``BENCHMARK_INDEXES``, and measures the size of the tables
+    and of their indexes, and the latency of representative queries:
+
+    * ``point_lookup``: the smallest administrative subdivision that
+      contains a point;
+
+    * ``children``: the children of the administrative subdivision that
+      has the most children;
+
+    * ``name_search``: the administrative subdivisions which a keyword of
+      their name starts with a prefix.
+
+    The latency of a query is its execution time reported by the command
+    ``EXPLAIN ANALYZE``, which excludes the network round trip.
+
+
+    @param sql_file_path_name: absolute path and name of the file of SQL
+        commands generated by the script.
+
+    @param dsn: connection string or name of the database, as accepted by
+        the option ``--dbname`` of ``psql``.
+
+    @param result_file_path_name: absolute path and name of the file, in
+        JSON Lines format, which the results are appended to.
+
+
+    @return: a dictionary of the results of the benchmark.
+    """
+    result = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'script_checksum': hashlib.sha256(open(__file__, 'rb').read()).hexdigest(),
+        'sql_file_name': os.path.basename(sql_file_path_name),
+        'sql_file_size': os.path.getsize(sql_file_path_name),
+        'server_version': execute_psql(dsn, 'SHOW server_version').strip(),
+    }
+
+    print '[INFO] Creating the schema...'
+    execute_psql(dsn, BENCHMARK_SCHEMA)
+
+    print '[INFO] Loading %s...' % sql_file_path_name
+    start_time = time.time()
+    execute_psql(dsn, file_path_name=sql_file_path_name)
+    load_duration = time.time() - start_time
+
+    row_counts = dict([ line.split('|') for line in execute_psql(dsn, ' UNION ALL '.join([
+                "SELECT '%s', count(*) FROM %s" % (table_name, table_name)
+                for (table_name, _) in COPY_TABLE_COLUMNS + TOPOLOGY_COPY_TABLE_COLUMNS + GEOMETRY_REFERENCE_COPY_TABLE_COLUMNS + PIECE_COPY_TABLE_COLUMNS ])).splitlines() ])
+    row_count = sum([ int(count) for count in row_counts.itervalues() ])
+
+    result['load'] = {
+        'duration': load_duration,
+        'row_count': row_count,
+        'rows_per_second': row_count / load_duration,
+        'bytes_per_second': result['sql_file_size'] / load_duration }
+
+    print '[INFO] Building indexes...'
+    result['indexes'] = {}
+    for (index_name, command) in BENCHMARK_INDEXES:
+        start_time = time.time()
+        execute_psql(dsn, command)
+        result['indexes'][index_name] = time.time() - start_time
+
+    execute_psql(dsn, 'ANALYZE')
+
+    result['tables'] = {}
+    for line in execute_psql(dsn, """
+            SELECT relname, pg_relation_size(oid), pg_indexes_size(oid), pg_total_relation_size(oid)
+              FROM pg_class
+              WHERE relname IN (%s)""" % ', '.join([ "'%s'" % table_name
+                    for (table_name, _) in COPY_TABLE_COLUMNS + TOPOLOGY_COPY_TABLE_COLUMNS + GEOMETRY_REFERENCE_COPY_TABLE_COLUMNS + PIECE_COPY_TABLE_COLUMNS ])).splitlines():
+        (table_name, table_size, indexes_size, total_size) = line.split('|')
+        result['tables'][table_name] = {
+            'row_count': int(row_counts[table_name]),
+            'table_size': int(table_size),
+            'indexes_size': int(indexes_size),
+            'total_size': int(total_size) }
+
+    # Pick the parameters of the queries from the loaded data.
+    print '[INFO] Measuring query latencies...'
+    (longitude, latitude) = execute_psql(dsn, """
+            SELECT ST_X(point), ST_Y(point)
+              FROM (SELECT ST_PointOnSurface(boundaries) AS point
+                      FROM area
+                      WHERE area_level = (SELECT max(area_level) FROM area)
+                      ORDER BY area_code
+                      LIMIT 1) AS sample""").strip().split('|')
+    parent_area_id = execute_psql(dsn, """
+            SELECT parent_area_id
+              FROM area
+              WHERE parent_area_id IS NOT NULL
+              GROUP BY parent_area_id
+              ORDER BY count(*) DESC
+              LIMIT 1""").strip()
+    keyword = execute_psql(dsn, """
+            SELECT keyword
+              FROM area_index
+              GROUP BY keyword
+              ORDER BY count(*) DESC, keyword
+              LIMIT 1""").strip().decode('utf-8')
+
+    queries = {
+        'point_lookup': """
+            SELECT area_id
+              FROM area
+              WHERE ST_Contains(boundaries, ST_SetSRID(ST_MakePoint(%s, %s), 4326))
+              ORDER BY area_level DESC
+              LIMIT 1""" % (longitude, latitude),
+        'point_lookup_pieces': """
+            SELECT area.area_id
+              FROM area_piece
+                INNER JOIN (
+                  SELECT area_id, area_id AS geometry_area_id
+                    FROM area
+                  UNION ALL
+                  SELECT area_id, geometry_area_id
+                    FROM area_geometry_ref) AS area_geometry
+                  ON area_geometry.geometry_area_id = area_piece.area_id
+                INNER JOIN area
+                  ON area.area_id = area_geometry.area_id
+              WHERE ST_Contains(area_piece.geom, ST_SetSRID(ST_MakePoint(%s, %s), 4326))
+              ORDER BY area.area_level DESC
+              LIMIT 1""" % (longitude, latitude),
+        'children': """
+            SELECT area_id, area_code
+              FROM area
+              WHERE parent_area_id = '%s'""" % parent_area_id,
+        'name_search': u"""
+            SELECT DISTINCT area_label.area_id, area_label.content
+              FROM area_index
+                INNER JOIN area_label
+                  ON area_label.area_id = area_index.area_id
+              WHERE area_index.keyword LIKE '%s%%'""" % keyword[:3].replace("'", "''").replace('%', '').replace('_', '') }
+
+    result['queries'] = {}
+    for (query_name, query) in queries.iteritems():
+        output = execute_psql(dsn, (u'EXPLAIN (ANALYZE, FORMAT JSON) %s;\n' % query * BENCHMARK_QUERY_EXECUTION_COUNT).encode('utf-8'))
+
+        decoder = json.JSONDecoder()
+        latencies = []
+        offset = 0
+        output = output.strip()
+        while offset < len(output):
+            (plan, offset) = decoder.raw_decode(output, offset)
+            latencies.append(plan[0]['Execution Time'])
+            while offset < len(output) and output[offset].isspace():
+                offset += 1
+
+        latencies.sort()
+        result['queries'][query_name] = {
+            'min_latency': latencies[0],
+            'median_latency': latencies[len(latencies) / 2] }
+
+    with open(result_file_path_name, 'at') as file_handle:
+        file_handle.write(json.dumps(result, sort_keys=True) + '\n')
+
+    print '[INFO] Loaded %d rows in %.1fs (%.0f rows/s, %.1f MB/s)' % \
+            (row_count, load_duration, result['load']['rows_per_second'], result['load']['bytes_per_second'] / (1024 * 1024))
+    for (index_name, _) in BENCHMARK_INDEXES:
+        print '[INFO] Built index %s in %.1fs' % (index_name, result['indexes'][index_name])
+    for (table_name, table) in sorted(result['tables'].iteritems()):
+        print '[INFO] Table %s: %d rows, %d bytes, %d bytes of indexes' % \
+                (table_name, table['row_count'], table['table_size'], table['indexes_size'])
+    for (query_name, query) in sorted(result['queries'].iteritems()):
+        print '[INFO] Query %s: %.3f ms (median), %.3f ms (min)' % (query_name, query['median_latency'], query['min_latency'])
+
+    return result
+
+
+def run_worker(work_path, country_codes, job_count, settings, fetch_options, shape_zip_file_path_names=None,
+        lease_expiration_time=WORK_QUEUE_LEASE_EXPIRATION_TIME, **processing_options):
+    """
+    Process the countries of a shared work directory, as one of several
+    workers running on the same host, or on several hosts sharing this
+    directory, until all the countries of this directory are completed.
+
+    The worker claims a country with the function ``claim_country_lease``,
+    renews the lease of each country it processes while its process is
+    running, writes the administrative subdivisions of this country to a
+    part of the work directory, and then writes the completion marker of
+    this country, with the flags ``O_CREAT`` and ``O_EXCL``, so that the
+    part of only one worker is kept when a stale lease has been reassigned
+    while its former holder was still processing the country, and which
+    stores the generation of the lease of the part kept.  The worker
+    then waits for the countries leased by other workers, to reassign
+    their lease when it becomes stale.
+
+    The function ``assemble_work_parts`` appends the parts of the
+    completed countries to an output file.
+
+
+    @param work_path: absolute path of the shared work directory.
+
+    @param country_codes: the list of the ISO 3166-1 alpha-3 codes of the
+        countries that this worker is able to process, which the queue of
+        the work directory is created with, if it doesn't exist yet.
+
+    @param job_count: maximum number of countries to process in parallel.
+
+    @param settings: a dictionary of the settings of the output, as
+        defined by the function ``open_work_queue``.
+
+    @param fetch_options: a dictionary of the keyword arguments passed to
+        the function ``fetch_country_data``.
+
+    @param shape_zip_file_path_names: a dictionary of the absolute path
+        and name of the shape ZIP archive file of each country, when these
+        files have been extracted from a global archive, or ``None``.
+
+    @param lease_expiration_time: time in seconds after which a lease that
+        has not been renewed is stale.
+
+    @param processing_options: additional keyword arguments passed to the
+        function ``process_country``.
+
+
+    @raise Exception: if the processing of a country fails.
+    """
+    worker_id = '%s:%d' % (socket.gethostname(), os.getpid())
+
+    file_util.make_directory_if_not_exists(work_path)
+    queue_country_codes = open_work_queue(work_path, settings, country_codes=country_codes)
+
+    for country_code in queue_country_codes:
+        if country_code not in country_codes:
+            sys.stderr.write('[WARNING] The country %s of the work directory cannot be processed by this worker; ignore it.\n' % country_code)
+    available_country_codes = [ country_code for country_code in queue_country_codes if country_code in country_codes ]
+
+    print '[INFO] Worker %s processing the work directory %s...' % (worker_id, work_path)
+
+    heartbeat_interval = min(WORK_QUEUE_HEARTBEAT_INTERVAL, lease_expiration_time / 4.0)
+    heartbeat_time = time.time()
+    claim_time = 0
+    running_countries = []
+
+    try:
+        while True:
+            if len(running_countries) < job_count and time.time() >= claim_time:
+                for country_code in available_country_codes:
+                    if len(running_countries) >= job_count:
+                        break
+
+                    if country_code in [ running_country[1] for running_country in running_countries ]:
+                        continue
+
+                    generation = claim_country_lease(work_path, country_code, worker_id,
+                            lease_expiration_time=lease_expiration_time)
+                    if generation is None:
+                        continue
+
+                    print '[INFO] Claimed country %s (lease generation %d)' % (country_code, generation)
+                    part_file_path_name = os.path.join(work_path,
+                            '%s.%d%s' % (country_code, generation, WORK_QUEUE_PART_FILE_NAME_SUFFIX))
+                    process = multiprocessing.Process(target=process_leased_country,
+                            args=(country_code, part_file_path_name,
+                                  dict(fetch_options, shape_zip_file_path_name=(shape_zip_file_path_names or {}).get(country_code))),
+                            kwargs=processing_options)
+                    process.start()
+                    running_countries.append((process, country_code, generation, part_file_path_name))
+
+                claim_time = time.time() + WORK_QUEUE_POLLING_INTERVAL
+
+            if not running_countries:
+                if all([ os.path.exists(os.path.join(work_path, country_code + WORK_QUEUE_DONE_MARKER_FILE_NAME_SUFFIX))
+                        for country_code in available_country_codes ]):
+                    break
+
+                time.sleep(GADM_SCHEDULER_POLLING_INTERVAL)
+                continue
+
+            # Renew the leases of the countries being processed, updating the
+            # modification time of their file.
+            if time.time() - heartbeat_time >= heartbeat_interval:
+                for (_, country_code, generation, _) in running_countries:
+                    os.utime(os.path.join(work_path, '%s%s%d' % (country_code, WORK_QUEUE_LEASE_FILE_NAME_INFIX, generation)), None)
+                heartbeat_time = time.time()
+
+            completed_countries = [ running_country for running_country in running_countries if not running_country[0].is_alive() ]
+            if not completed_countries:
+                time.sleep(GADM_SCHEDULER_POLLING_INTERVAL)
+                continue
+
+            for running_country in completed_countries:
+                (process, country_code, generation, part_file_path_name) = running_country
+                running_countries.remove(running_country)
+                process.join()
+
+                lease_file_path_name = os.path.join(work_path, '%s%s%d' % (country_code, WORK_QUEUE_LEASE_FILE_NAME_INFIX, generation))
+                if process.exitcode != 0:
+                    # Expire the lease, so that another worker reassigns this
+                    # country without waiting for the lease to become stale.
+                    os.utime(lease_file_path_name, (0, 0))
+                    raise Exception('The processing of the country %s failed' % country_code)
+
+                try:
+                    file_descriptor = os.open(os.path.join(work_path, country_code + WORK_QUEUE_DONE_MARKER_FILE_NAME_SUFFIX),
+                            os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                except OSError as exception:
+                    if exception.errno != errno.EEXIST:
+                        raise
+
+                    sys.stderr.write('[WARNING] The country %s has been completed by another worker; discard its part.\n' % country_code)
+                    if os.path.isdir(part_file_path_name):
+                        shutil.rmtree(part_file_path_name)
+                    elif os.path.exists(part_file_path_name):
+                        os.remove(part_file_path_name)
+                else:
+                    with os.fdopen(file_descriptor, 'wt') as file_handle:
+                        json.dump({
+                                'worker_id': worker_id,
+                                'generation': generation,
+                                'part_file_name': os.path.basename(part_file_path_name) },
+                            file_handle)
+                    print '[INFO] Completed country %s' % country_code
+
+                # Keep the lease file, expired, so that the generations of the
+                # leases of this country remain monotonic.
+                os.utime(lease_file_path_name, (0, 0))
+                claim_time = 0
+
+        print '[INFO] All the countries of the work directory %s have been completed' % work_path
+
+    finally:
+        for (process, country_code, generation, _) in running_countries:
+            process.terminate()
+            os.utime(os.path.join(work_path, '%s%s%d' % (country_code, WORK_QUEUE_LEASE_FILE_NAME_INFIX, generation)), (0, 0))
+
+
+def save_parsed_country(parsed_cache_path, country_code, checksum, administrative_subdivisions):
+    """
+    Store the parsed data of a country in the cache, replacing the data
+    stored for a previous checksum of the data of this country.
+
+    The parsed data are stored in three files:
+
+    * ``(country_code).(checksum).coordinates.npy``: the coordinates of
+      the boundaries of all the administrative subdivisions, one after
+      the other, as a NumPy array of shape ``(n, 2)``.
+
+    * ``(country_code).(checksum).offsets.npy``: the offset of the first
+      vertex of each boundary in the array of coordinates, followed by
+      the number of vertices.
+
+    * ``(country_code).(checksum).json``: the list of the administrative
+      subdivisions, each represented by a list ``[code, parent_code,
+      name, level, area_type, ring_count]``, in the order of their
+      boundaries; this file is written last.
+
+
+    @param parsed_cache_path: absolute path of the directory where the
+        parsed data of the countries are stored.
+
+    @param country_code: an ISO 3166-1 alpha-3 code representing the
+        country.
+
+    @param checksum: the checksum of the data of the country, as returned
+        by the function ``calculate_country_data_checksum``.
+
+    @param administrative_subdivisions: a dictionary of
+        ``AdministrativeSubdivision`` instances of all the administrative
+        subdivisions of this country.
+    """
+    subdivisions = administrative_subdivisions.values()
+    boundaries = [ boundary for subdivision in subdivisions for boundary in subdivision.boundaries ]
+
+    file_path_name_prefix = os.path.join(parsed_cache_path, '%s.%s' % (country_code, checksum))
+    for (file_path_name_suffix, array) in [
+            ('.coordinates.npy', numpy.concatenate(boundaries) if boundaries else numpy.zeros((0, 2))),
+            ('.offsets.npy', numpy.cumsum([ 0 ] + [ len(boundary) for boundary in boundaries ], dtype=numpy.int64)) ]:
+        with open(file_path_name_prefix + file_path_name_suffix + '.tmp', 'wb') as file_handle:
+            numpy.save(file_handle, array)
+        os.rename(file_path_name_prefix + file_path_name_suffix + '.tmp', file_path_name_prefix + file_path_name_suffix)
+
+    with open(file_path_name_prefix + '.json.tmp', 'wt') as file_handle:
+        json.dump([ [ subdivision.code, subdivision.parent_code, subdivision.name, subdivision.level,
+                      subdivision.area_type, len(subdivision.boundaries) ]
+                for subdivision in subdivisions ], file_handle)
+    os.rename(file_path_name_prefix + '.json.tmp', file_path_name_prefix + '.json')
+
+    # Remove the parsed data stored for a previous checksum.
+    for file_name in os.listdir(parsed_cache_path):
+        if file_name.startswith(country_code + '.') and not file_name.startswith('%s.%s.' % (country_code, checksum)):
+            os.remove(os.path.join(parsed_cache_path, file_name))
+
+
+def schedule_countries(countries_data, job_count, memory_budget=None, **processing_options):
+    """
+    Process countries in parallel, starting with the largest countries
+    first (Longest Processing Time first), while the projected memory of
+    the running processes fits in the specified budget.
+
+    When the largest pending country doesn't fit in the remaining memory,
+    a smaller country that fits is started instead, so that the cores
+    are kept busy.  A country is always started when no other country is
+    running, whatever its projected memory.
+
+
+    @param countries_data: a list of ``CountryData`` named tuples of the
+        data of countries, as returned by the function
+        ``fetch_country_data``.
+
+    @param job_count: maximum number of countries to process in parallel.
+
+    @param memory_budget: maximum memory in bytes that the processes run
+        in parallel are allowed to use, or ``None`` if unlimited.
+
+    @param processing_options: additional keyword arguments passed to the
+        function ``process_country``.
+
+
+    @return: a generator of tuples ``(country_data, part_file_path_name)``,
+        in the order countries complete, where ``part_file_path_name`` is
+        the absolute path and name of a temporary part where the
+        administrative subdivisions of this country have been written in.
+        This part is deleted when the generator is resumed.
+
+    @raise Exception: if the processing of a country fails.
+    """
+    pending_countries = sorted([ (estimate_country_cost(country_data, level_job_count=processing_options.get('level_job_count', 1)),
+                    country_data)
+                for country_data in countries_data ],
+            key=lambda pending_country: pending_country[0][0], reverse=True)
+    running_countries = []
+
+    # Each country writes its administrative subdivisions to a part,
+    # named after the country, in a temporary directory.
+    part_path = tempfile.mkdtemp()
+
+    try:
+        while pending_countries or running_countries:
+            used_memory = sum([ memory for (_, _, _, memory) in running_countries ])
+
+            for pending_country in list(pending_countries):
+                if len(running_countries) >= job_count:
+                    break
+
+                ((_, memory), country_data) = pending_country
+                if running_countries and memory_budget and used_memory + memory > memory_budget:
+                    continue
+
+                part_file_path_name = os.path.join(part_path, country_data.country_code)
+                process = multiprocessing.Process(target=process_country, args=(country_data, part_file_path_name),
+                        kwargs=processing_options)
+                process.start()
+                running_countries.append((process, country_data, part_file_path_name, memory))
+                pending_countries.remove(pending_country)
+                used_memory += memory
+
+            completed_countries = [ running_country for running_country in running_countries if not running_country[0].is_alive() ]
+            if not completed_countries:
+                time.sleep(GADM_SCHEDULER_POLLING_INTERVAL)
+                continue
+
+            for running_country in completed_countries:
+                (process, country_data, part_file_path_name, _) = running_country
+                running_countries.remove(running_country)
+                process.join()
+                if process.exitcode != 0:
+                    raise Exception('The processing of the country %s failed' % country_data.country_code)
+
+                yield country_data, part_file_path_name
+
+                if os.path.isdir(part_file_path_name):
+                    shutil.rmtree(part_file_path_name)
+                elif os.path.exists(part_file_path_name):
+                    os.remove(part_file_path_name)
+
+    finally:
+        for (process, _, _, _) in running_countries:
+            process.terminate()
+        shutil.rmtree(part_path)
+
+
+def select_shape_records(shape_file_handle, index_file_handle, bbox):
+    """
+    Select the records of a shape file which bounding box intersects the
+    specified bounding box, reading the offsets of the records from the
+    index file (``.shx``), and the bounding box from the header of each
+    record of the shape file (``.shp``), without decoding the shapes.
+
+    The index file is composed of a header of 100 bytes, which stores the
+    length of the file in 16-bit words at byte 24, followed by a record of
+    8 bytes per shape: its offset and its length, in 16-bit words.  The
+    content of a record of the shape file starts with its shape type and
+    its bounding box ``(xmin, ymin, xmax, ymax)``, after a header of 8
+    bytes.
+
+
+    @param shape_file_handle: a file-like object of the shape file.
+
+    @param index_file_handle: a file-like object of the index file.
+
+    @param bbox: a tuple ``(xmin, ymin, xmax, ymax)``.
+
+
+    @return: a tuple ``(offsets, record_indices)`` where ``offsets`` is the
+        list of the offsets in bytes of every record of the shape file,
+        and ``record_indices`` the list of the indices of the records which
+        bounding box intersects the specified bounding box.  Null shapes
+        are never selected.
+    """
+    (bbox_xmin, bbox_ymin, bbox_xmax, bbox_ymax) = bbox
+
+    index_file_handle.seek(24)
+    (file_length,) = struct.unpack('>i', index_file_handle.read(4))
+    record_count = (file_length * 2 - 100) / 8
+
+    index_file_handle.seek(100)
+    offsets = [ offset * 2 for offset in struct.unpack('>%di' % (record_count * 2), index_file_handle.read(record_count * 8))[::2] ]
+
+    record_indices = []
+    for (record_index, offset) in enumerate(offsets):
+        shape_file_handle.seek(offset + 8)
+        header = shape_file_handle.read(36)
+        if len(header) < 36 or struct.unpack('<i', header[:4])[0] == 0: # Null shape
+            continue
+
+        (xmin, ymin, xmax, ymax) = struct.unpack('<4d', header[4:])
+        if xmin <= bbox_xmax and xmax >= bbox_xmin and ymin <= bbox_ymax and ymax >= bbox_ymin:
+            record_indices.append(record_index)
+
+    return offsets, record_indices
+
+
+def simplify_arc(coordinates, tolerance):
+    """
+    Simplify an arc with the Douglas-Peucker algorithm, keeping its first
+    and last vertices.
+
+    A closed arc is first split at its vertex the farthest from its first
+    vertex, and is kept unchanged if its simplification would result in
+    less than 4 vertices.
+
+
+    @param coordinates: a NumPy array of the coordinates ``(longitude,
+        latitude)`` of the vertices of the arc.
+
+    @param tolerance: the maximum distance, in degrees, between the
+        simplified arc and the original vertices.
+
+
+    @return: a NumPy array of the coordinates of the vertices of the
+        simplified arc.
+    """
+    if len(coordinates) <= 2:
+        return coordinates
+
+    kept_vertices = numpy.zeros(len(coordinates), dtype=bool)
+    kept_vertices[[0, -1]] = True
+
+    segments = [ (0, len(coordinates) - 1) ]
+    is_closed = numpy.array_equal(coordinates[0], coordinates[-1])
+    if is_closed:
+        farthest = int(numpy.argmax(numpy.hypot(*(coordinates - coordinates[0]).T)))
+        kept_vertices[farthest] = True
+        segments = [ (0, farthest), (farthest, len(coordinates) - 1) ]
+
+    while segments:
+        (start, end) = segments.pop()
+        if end - start < 2:
+            continue
+
+        (dx, dy) = coordinates[end] - coordinates[start]
+        offsets = coordinates[start + 1:end] - coordinates[start]
+        length = numpy.hypot(dx, dy)
+        distances = numpy.abs(dx * offsets[:, 1] - dy * offsets[:, 0]) / length if length \
+            else numpy.hypot(offsets[:, 0], offsets[:, 1])
+
+        farthest = int(numpy.argmax(distances))
+        if distances[farthest] > tolerance:
+            farthest += start + 1
+            kept_vertices[farthest] = True
+            segments.extend([ (start, farthest), (farthest, end) ])
+
+    simplified_coordinates = coordinates[kept_vertices]
+    return coordinates if is_closed and len(simplified_coordinates) < 4 else simplified_coordinates
+
+
+def sort_administrative_subdivisions(administrative_subdivisions, spatial_order):
+    """
+    Sort the administrative subdivisions of a country by the Hilbert
+    index of the center of the bounding box of their boundaries, so that
+    the rows written into the database are spatially clustered.
+
+
+    @param administrative_subdivisions: a dictionary of
+        ``AdministrativeSubdivision`` instances of all the administrative
+        subdivisions of a country.
+
+    @param spatial_order: ``level`` to sort the administrative
+        subdivisions of each administrative level, from the first level to
+        the smallest level, or ``global`` to sort all the administrative
+        subdivisions whatever their level.
+
+
+    @return: an ordered dictionary of the sorted ``AdministrativeSubdivision``
+        instances.  The key corresponds to the code of an administrative
+        subdivision, while the value is the instance itself.
+    """
+    sort_keys = {}
+    for (code, subdivision) in administrative_subdivisions.iteritems():
+        (xmin, ymin, xmax, ymax) = calculate_boundaries_bbox(subdivision.boundaries)
+        hilbert_index = calculate_hilbert_index((xmin + xmax) / 2, (ymin + ymax) / 2)
+        sort_keys[code] = (subdivision.level, hilbert_index) if spatial_order == 'level' else hilbert_index
+
+    return collections.OrderedDict([ (code, administrative_subdivisions[code])
+            for code in sorted(administrative_subdivisions, key=sort_keys.get) ])
+
+
+def split_global_archive(archive_file_path_name, output_path, country_codes=None, administrative_level_count=None):
+    """
+    Split a ZIP archive of the shape files of the whole world, as
+    published by the Global Administrative Areas (GADM) project, into
+    ZIP archives of the shape files of each country, similar to those
+    that the script downloads per country.
+
+    The split is done in a single streaming pass over the shape file and
+    the dBase IV file of each administrative level, reading the shapes
+    record by record, without decoding their geometry.  The country of a
+    shape is determined by the ``ISO`` field of its attributes, or,
+    if not defined, by its ``ID_0`` field, which is mapped to the ISO
+    code of the country defined in the country level.
+
+
+    @param archive_file_path_name: absolute path and name of the ZIP
+        archive file of the shape files of the whole world.
+
+    @param output_path: absolute path of the directory where the ZIP
+        archive files of each country need to be written in.
+
+    @param country_codes: a set of the ISO 3166-1 alpha-3 codes of the
+        countries to split, or ``None`` to split every country.  The shapes
+        of the other countries are skipped.
+
+    @param administrative_level_count: the maximum number of
+        administrative levels to split, or ``None`` to split all of them.
+
+
+    @return: a dictionary of the absolute path and name of the shape ZIP
+        archive file of each country.  The key corresponds to the ISO
+        3166-1 alpha-3 code of a country, while the value is the path of
+        its archive.
+    """
+    country_zip_file_path_names = {}
+    country_codes_by_id = {}
+
+    with zipfile.ZipFile(archive_file_path_name) as zip_file:
+        entry_base_names = {}
+        for entry_name in zip_file.namelist():
+            match = GADM_SHAPE_ENTRY_NAME_REGEX.match(entry_name)
+            if match and (administrative_level_count is None or int(match.group(2)) < administrative_level_count):
+                entry_base_names[int(match.group(2))] = entry_name[:-len('.shp')]
+
+        for administrative_level in sorted(entry_base_names):
+            print '[INFO] Splitting administrative level %d...' % administrative_level
+            entry_base_name = entry_base_names[administrative_level]
+
+            additional_entries = {}
+            for extension in ('prj', 'cpg'):
+                try:
+                    additional_entries[extension] = zip_file.read('%s.%s' % (entry_base_name, extension))
+                except KeyError:
+                    pass
+
+            splits = {}
+            with zip_file.open('%s.shp' % entry_base_name) as shape_file_handle, \
+                 zip_file.open('%s.dbf' % entry_base_name) as dbase_file_handle:
+                (shape_type,) = struct.unpack('<i', shape_file_handle.read(100)[32:36])
+                dbase_header = DBaseFileHeader.read(dbase_file_handle)
+
+                for _ in xrange(dbase_header.record_count):
+                    (_, content_length) = struct.unpack('>2i', shape_file_handle.read(8))
+                    content = shape_file_handle.read(content_length * 2)
+                    dbase_record = dbase_file_handle.read(dbase_header.record_length)
+                    if dbase_record[0] == '*': # Deleted record
+                        continue
+
+                    country_id = dbase_header.get_field_value(dbase_record, 'ID_0')
+                    country_code = dbase_header.get_field_value(dbase_record, 'ISO') or country_codes_by_id.get(country_id)
+                    if not country_code:
+                        sys.stderr.write('[WARNING] A shape of administrative level %d has no country (ID_0=%s); ignore it.\n' % \
+                                (administrative_level, country_id))
+                        continue
+
+                    if administrative_level == 0:
+                        country_codes_by_id[country_id] = country_code
+
+                    if country_codes and country_code not in country_codes:
+                        continue
+
+                    split = splits.get(country_code)
+                    if split is None:
+                        split = splits[country_code] = ShapeFileSplit()
+                    split.append(content, dbase_record)
+
+            for (country_code, split) in splits.iteritems():
+                zip_file_path_name = country_zip_file_path_names.get(country_code)
+                if zip_file_path_name is None:
+                    zip_file_path_name = country_zip_file_path_names[country_code] = \
+                        os.path.join(output_path, '%s_gadm.dbf.zip' % country_code)
+                    if os.path.exists(zip_file_path_name):
+                        os.remove(zip_file_path_name)
+
+                with zipfile.ZipFile(zip_file_path_name, 'a', zipfile.ZIP_DEFLATED) as country_zip_file:
+                    split.write(country_zip_file, '%s_adm%d' % (country_code, administrative_level),
+                            shape_type, dbase_header, additional_entries)
+
+    return country_zip_file_path_names
+
+
+def subdivide_boundary(boundary, max_vertex_count):
+    """
+    Subdivide a boundary into pieces of at most the specified number of
+    vertices, similar to the PostGIS function ``ST_Subdivide``, so that
+    the bounding box of each piece is tight, and that a containment test
+    only reads the vertices of the few pieces which bounding box contains
+    the point.
+
+    The boundary is recursively split in two halves of its bounding box,
+    across its longest side, with the function ``clip_boundary``, until
+    each piece has at most ``max_vertex_count`` vertices, or the maximum
+    depth ``SUBDIVISION_MAX_DEPTH`` is reached.  A piece is kept as is
+    when none of its halves has fewer vertices than this piece, as it is
+    the case of a self-overlapping ring, or when splitting it would result
+    in more than ``SUBDIVISION_MAX_PIECE_COUNT_RATIO`` pieces per vertex
+    of the boundary.
+
+
+    @param boundary: a NumPy array of shape ``(n, 2)`` of the coordinates
+        ``(longitude, latitude)`` of a closed boundary.
+
+    @param max_vertex_count: the maximum number of vertices of a piece,
+        including the vertex that closes this piece.
+
+
+    @return: a list of NumPy arrays of the closed boundaries of the
+        pieces, oriented counterclockwise.
+    """
+    # Orient the boundary counterclockwise, i.e., with a positive signed
+    # area, as expected by the function ``clip_boundary``.
+    if numpy.sum(boundary[:-1, 0] * boundary[1:, 1] - boundary[1:, 0] * boundary[:-1, 1]) < 0:
+        boundary = boundary[::-1]
+
+    pieces = []
+    pending_pieces = [ (boundary, 0) ]
+
+    while pending_pieces:
+        (piece, depth) = pending_pieces.pop()
+
+        extent = piece.max(axis=0) - piece.min(axis=0)
+        if len(piece) <= max_vertex_count or depth >= SUBDIVISION_MAX_DEPTH or not extent.any():
+            pieces.append(piece)
+            continue
+
+        axis = 0 if extent[0] >= extent[1] else 1
+        value = (piece[:, axis].min() + piece[:, axis].max()) / 2
+        clipped_pieces = [ clipped_piece
+                for lower_side in (True, False)
+                    for clipped_piece in clip_boundary(piece, axis, value, lower_side) ]
+
+        if all([ len(clipped_piece) >= len(piece) for clipped_piece in clipped_pieces ]) or \
+                len(pieces) + len(pending_pieces) + len(clipped_pieces) > SUBDIVISION_MAX_PIECE_COUNT_RATIO * len(boundary):
+            pieces.append(piece)
+            continue
 
-    return country_code,\
-           administrative_level_count, \
-           shape_zip_file_path_name, \
-           esri_zip_file_path_name, \
-           esri_file_path_names
+        pending_pieces.extend([ (clipped_piece, depth + 1) for clipped_piece in clipped_pieces ])
 
+    return pieces
 
-def update_administrative_subdivision_metadata(country_code, administrative_subdivisions, esri_file_path_names):
+
+def update_administrative_subdivision_metadata(country_code, administrative_subdivisions, esri_file_path_names,
+        partial=False):
     """
     Update the metadata of a country's administrative subdivisions,
     overriding those already defined.
@@ -872,6 +4835,11 @@ def update_administrative_subdivision_metadata(country_code, administrative_subd
         itself.
 
 
+    @param partial: indicate whether the administrative subdivisions have
+        been filtered, in which case the administrative subdivisions of the
+        ESRI geodatabase that are missing are ignored without warning.
+
+
     @return: the dictionary of administrative subdivisions that was passed
         to this function.
     """
@@ -904,6 +4872,9 @@ def update_administrative_subdivision_metadata(country_code, administrative_subd
                 administrative_subdivision.area_type = unicode(subdivision_type, 'utf-8').strip() if subdivision_type else None
 
             except KeyError:
+                if partial:
+                    continue
+
                 sys.stderr.write('[WARNING] %s (%s-%s) is referenced in MDB but not in SHP; ignore it.\n' % \
                         (unicode(subdivision_name, 'utf-8').strip(),
                          country_code,
@@ -912,9 +4883,40 @@ def update_administrative_subdivision_metadata(country_code, administrative_subd
     return administrative_subdivisions
 
 
+def validate_archive_catalog(catalog, country_code):
+    """
+    Check that the catalog of the shape ZIP archive of a country defines
+    at least the country level, and that every administrative level
+    comes with its shape file, its index, and its dBase IV file.
+
+
+    @param catalog: the catalog of the shape ZIP archive of the country.
+
+    @param country_code: an ISO 3166-1 alpha-3 code representing the
+        country of this archive.
+
+
+    @raise Exception: if the archive misses an entry, or if the index of
+        a shape file is truncated.
+    """
+    if not catalog['levels']:
+        raise Exception('The shape archive of %s contains no administrative level' % country_code)
+
+    for level in catalog['levels']:
+        for extension in ('shp', 'shx', 'dbf'):
+            entry_name = '%s_adm%d.%s' % (country_code, level['level'], extension)
+            if entry_name not in catalog['entries']:
+                raise Exception('The shape archive of %s misses the entry %s' % (country_code, entry_name))
+
+        index_size = catalog['entries']['%s_adm%d.shx' % (country_code, level['level'])]['size']
+        if index_size < 100 or (index_size - 100) % 8:
+            raise Exception('The index of the shape file %s_adm%d is truncated' % (country_code, level['level']))
+
+
 def write_sql_commands(administrative_subdivisions,
             sql_file_path_name=None,
-            country_code=None):
+            country_code=None,
+            file_handle=None):
     """
     Write on the standard output the list of `COPY commands
     <http://www.postgresql.org/docs/current/static/sql-copy.html>`_ to
@@ -937,97 +4939,72 @@ def write_sql_commands(administrative_subdivisions,
 
     @param sql_file_path_name: absolute path and name of the file where
         the SQL commands needs to be written in.
-    """
-    with file_util.smart_open(sql_file_path_name, 'a') as file_handle:
-        # Write the administrative subdivisions' information, including their
-        # boundaries.
-        print >>file_handle, 'COPY area(area_id, parent_area_id, area_code, area_type, area_level, boundaries) FROM stdin;'
 
-        for subdivision in administrative_subdivisions.itervalues():
-            print >>file_handle, \
-                    """%(area_id)s\t%(parent_area_id)s\t%(area_code)s\t%(area_type)s\t%(area_level)s\t%(boundaries)s""" % {
-                            'area_id': subdivision.id,
-                            'area_code': subdivision.code,
-                            'area_type': r'\N' if not subdivision.area_type else subdivision.area_type,
-                            'area_level': subdivision.level,
-                            'boundaries': r'SRID=4326;MULTIPOLYGON(%s)' % (
-                                    (','.join([ '((%s))' % (','.join([ '%s %s' % (longitude, latitude)
-                                            for (longitude, latitude) in boundary ]))
-                                        for boundary in subdivision.boundaries ]))),
-                            'parent_area_id': r'\N' if subdivision.level == 0 \
-                                else administrative_subdivisions[subdivision.parent_code].id }
-
-        # @note: the following list comprehension is probably a more pythonic
-        #     approach, but with massive data, it would lead to a ``MemoryError``:
-        #
-        # print >>file_handle, '\n'.join([
-        #         """%(area_id)s\t%(parent_area_id)s\t%(area_code)s\t%(area_type)s\t%(area_level)s\t%(boundaries)s""" % {
-        #                 'area_id': subdivision.id,
-        #                 'area_code': subdivision.code,
-        #                 'area_type': r'\N' if not subdivision.area_type else subdivision.area_type,
-        #                 'area_level': subdivision.level,
-        #                 'boundaries': r'SRID=4326;MULTIPOLYGON(%s)' % (
-        #                         (','.join([ '((%s))' % (','.join([ '%s %s' % (longitude, latitude)
-        #                                 for (longitude, latitude) in boundary ]))
-        #                             for boundary in subdivision.boundaries ]))),
-        #                 'parent_area_id': r'\N' if subdivision.level == 0 \
-        #                     else administrative_subdivisions[subdivision.parent_code].id }
-        #         for subdivision in administrative_subdivisions.itervalues() ])
-
-        print >>file_handle, r'\.'
-        print >>file_handle
-
-        # Write the administrative subdivisions' names.
-        print >>file_handle, 'COPY area_label(area_id, content) FROM stdin;'
-
-        print >>file_handle, '\n'.join([
-                    """%(area_id)s\t%(content)s""" % {
-                            'area_id': subdivision.id,
-                            'content': subdivision.name }
-                for subdivision in administrative_subdivisions.itervalues() ])
-        print >>file_handle, r'\.'
-        print >>file_handle
-
-        # Generate the list of keywords of at least 2 characters composing the
-        # name of each administrative subdivision.
-        print >> file_handle, "\echo 'Indexing administrative subdivisions of country %s'" % country_code
-
-        print >>file_handle, 'COPY area_index(area_id, keyword) FROM stdin;'
-
-        for subdivision in administrative_subdivisions.itervalues():
-            subdivision_ascii_name = unidecode.unidecode(subdivision.name).lower()
-            punctuationless = re.sub(r"""[.,\/#!$%\^&\*;:{}=\-_`~()<>"']""", ' ', subdivision_ascii_name)
-            keywords = re.sub(r'\s{2,}', ' ', punctuationless).split(' ')
-
-            for keyword in keywords:
-                if len(keyword) > 1 and not keyword.isdigit():
-                    print >>file_handle, """%(area_id)s\t%(keyword)s""" % {
-                            'area_id': subdivision.id,
-                            'keyword': keyword }
-
-        print >>file_handle, r'\.'
-        print >>file_handle
-
-        # print >>file_handle, """
-        #         DO $$
-        #         BEGIN
-        #           IF EXISTS(
-        #             SELECT true
-        #               FROM pg_proc
-        #               WHERE proname = '_simplify_area_boundaries') THEN
-        #             RAISE NOTICE 'Simplifying boundaries of each geographic area...';
-        #             PERFORM _simplify_area_boundaries();
-        #           ELSE
-        #             RAISE NOTICE 'No function found to simplify boundaries of each geographic area.';
-        #           END IF;
-        #         END $$;"""
-        # print >>file_handle
+    @param file_handle: a file-like object where the SQL commands needs
+        to be written in, instead of the file ``sql_file_path_name``.
+    """
+    if file_handle is None:
+        with file_util.smart_open(sql_file_path_name, 'a') as file_handle:
+            return write_sql_commands(administrative_subdivisions, country_code=country_code, file_handle=file_handle)
+
+    output_buffer = CopyOutputBuffer(file_handle)
+
+    for (table_name, column_names) in get_copy_table_columns(administrative_subdivisions):
+        if table_name == 'area_index':
+            output_buffer.write("\echo 'Indexing administrative subdivisions of country %s'\n" % country_code)
+
+        output_buffer.write('COPY %s(%s) FROM stdin;\n' % (table_name, ', '.join(column_names)))
+        output_buffer.write_rows(iter_copy_rows(table_name, administrative_subdivisions))
+        output_buffer.write('\\.\n\n')
+
+    output_buffer.flush()
+
+    # print >>file_handle, """
+    #         DO $$
+    #         BEGIN
+    #           IF EXISTS(
+    #             SELECT true
+    #               FROM pg_proc
+    #               WHERE proname = '_simplify_area_boundaries') THEN
+    #             RAISE NOTICE 'Simplifying boundaries of each geographic area...';
+    #             PERFORM _simplify_area_boundaries();
+    #           ELSE
+    #             RAISE NOTICE 'No function found to simplify boundaries of each geographic area.';
+    #           END IF;
+    #         END $$;"""
+    # print >>file_handle
 
 
 if __name__ == '__main__':
+    # Python determines the encoding of stdout and stderr based on the
+    # value of the ``LC_CTYPE`` variable, but only if the stdout is a tty.
+    # So if you just output to the terminal, ``LC_CTYPE`` (or ``LC_ALL``)
+    # define the encoding.  However, when the output is piped to a file or
+    # to a different process, the encoding is not defined, and defaults to
+    # 7-bit ASCII, which raise the following exception when outputting
+    # unicode characters:
+    #
+    #   ``UnicodeEncodeError: 'ascii' codec can't encode character u'\x..' in position 18: ordinal not in range(128).``
+    #
+    # @note: using the environment variable ``PYTHONIOENCODING`` is
+    #     another solution, however it requires the user to prefix the
+    #     command line with ``PYTHONIOENCODING=utf-8``, which is more
+    #     cumbersome.
+    sys.stdout = codecs.getwriter(sys.stdout.encoding if sys.stdout.isatty() \
+            else locale.getpreferredencoding())(sys.stdout)
+
+    # Writers of the supported output formats.
+    OUTPUT_WRITER_CLASSES = {
+        'flatgeobuf': FlatGeobufWriter,
+        'geoparquet': GeoParquetWriter,
+        'sql': SqlCopyWriter,
+        'sql-shards': ShardedCopyWriter,
+        'sqlite': SqliteWriter,
+    }
+
     parser = argparse.ArgumentParser()
-    parser.add_argument('-f', '--file', dest='sql_file_path_name', metavar='filename', required=True,
-            help='write the SQL commands to the specified file %(metavar)s')
+    parser.add_argument('-f', '--file', dest='sql_file_path_name', metavar='filename',
+            help='write the SQL commands, or the output of the specified format, to the specified file %(metavar)s')
     parser.add_argument('--cache-path', metavar='cache-path',
             help='specify the absolute path where the ZIP archives downloaded from GADM server need to be cached')
     parser.add_argument('--cache', dest='cache_required', action='store_true',
@@ -1037,22 +5014,297 @@ if __name__ == '__main__':
                  'GADM server and stored in the local cache are allowed to be reused.'
                  'When this time expires, the script needs to fetch data from the origin'
                  'server.')
+    parser.add_argument('--archive-path', metavar='archive-path',
+            help='specify the absolute path of either a local ZIP archive of the shape files of the whole '
+                 'world, which is split into countries instead of downloading the archive of each country, '
+                 'either a local directory that mirrors the ZIP archives of every country')
+    parser.add_argument('--skip-mdb', dest='dbase_decoding_required', action='store_true',
+            help='decode the names stored in the dBase IV files with their code page, and skip the ESRI '
+                 'geodatabase of the countries which names are decoded without loss')
+    parser.add_argument('-j', '--jobs', dest='job_count', type=int, default=multiprocessing.cpu_count(), metavar='jobs',
+            help='specify the maximum number of countries to process in parallel (default: the number of CPUs)')
+    parser.add_argument('--memory-budget', type=parse_memory_size, metavar='size',
+            help='specify the maximum memory, such as 512M or 8G, that the countries processed in parallel '
+                 'are allowed to use; the largest countries are started first, as long as their projected '
+                 'memory fits in this budget (default: unlimited)')
+    parser.add_argument('--format', dest='output_format', choices=sorted(OUTPUT_WRITER_CLASSES), default='sql',
+            help='specify the format of the output file: PostgreSQL COPY commands (sql), a directory of '
+                 'PostgreSQL COPY files per country and table (sql-shards), GeoParquet (geoparquet), '
+                 'FlatGeobuf (flatgeobuf), or SQLite (sqlite) (default: sql)')
+    parser.add_argument('--load-shards', dest='shard_path', metavar='directory',
+            help='load the shards of the specified directory, written with the format sql-shards, into '
+                 'the PostgreSQL database specified with --dsn, instead of generating data')
+    parser.add_argument('--dsn', metavar='dsn',
+            help='specify the connection string, or the name, of the PostgreSQL database to load shards into')
+    parser.add_argument('--sessions', dest='session_count', type=int, default=multiprocessing.cpu_count(), metavar='sessions',
+            help='specify the maximum number of concurrent sessions to load shards (default: the number of CPUs)')
+    parser.add_argument('--bulk-load', action='store_true',
+            help='surround the SQL commands with a bulk-load envelope, which switches the tables to unlogged, '
+                 'drops their secondary indexes and foreign keys, and rebuilds them once after the data are '
+                 'loaded (format sql, or with --load-shards; requires PostgreSQL 9.5+)')
+    parser.add_argument('--precision', type=int, metavar='decimals',
+            help='round the coordinates of the boundaries to the specified number of decimal places, such as 6 '
+                 '(about 10 centimeters), removing the consecutive duplicate vertices this creates (default: '
+                 'full precision)')
+    parser.add_argument('--topology', dest='topology_required', action='store_true',
+            help='write the arcs shared between the boundaries into the table area_arc, and the arcs of each '
+                 'boundary into the table area_arc_ref, instead of the boundaries into the table area, which '
+                 'are rebuilt from their arcs once loaded (formats sql and sql-shards only)')
+    parser.add_argument('--simplify', dest='tolerance', type=float, metavar='tolerance',
+            help='simplify the arcs shared between the boundaries with the specified tolerance in degrees, '
+                 'such as 0.001, so that adjacent boundaries remain without slivers (requires --topology; '
+                 'default: no simplification)')
+    parser.add_argument('--level-jobs', dest='level_job_count', type=int, metavar='jobs',
+            help='specify the maximum number of administrative levels of a large country to parse in parallel '
+                 '(default: the number of CPUs divided by the number of countries processed in parallel)')
+    parser.add_argument('--spatial-order', choices=('level', 'global'),
+            help='write the administrative subdivisions of each country in the Hilbert order of the center of '
+                 'their bounding box, either per administrative level (level), or whatever their level (global), '
+                 'so that their rows are spatially clustered (default: any order)')
+    parser.add_argument('--countries', dest='country_codes', metavar='codes',
+            type=lambda value: set([ country_code.strip().upper() for country_code in value.split(',') ]),
+            help='process only the countries of the specified comma-separated list of ISO 3166-1 alpha-3 codes, '
+                 'such as FRA,VNM (default: all the supported countries)')
+    parser.add_argument('--dedupe', dest='boundary_dedup_required', action='store_true',
+            help='write once the boundaries that are identical for several administrative subdivisions, the '
+                 'boundaries of the others being NULL and referenced in the table area_geometry_ref (formats sql '
+                 'and sql-shards only)')
+    parser.add_argument('--subdivide', dest='max_piece_vertex_count', type=int, metavar='vertices',
+            help='subdivide the boundaries into pieces of at most the specified number of vertices, at least 8, '
+                 'such as 256, written to the table area_piece, so that point-in-area queries only read the '
+                 'vertices of the few pieces which bounding box contains the point (formats sql and sql-shards only)')
+    parser.add_argument('--levels', dest='administrative_level_count', type=int, metavar='count',
+            help='process only the specified number of administrative levels of each country, from the '
+                 'country level, such as 2 for the countries and their first-level subdivisions (default: all '
+                 'the administrative levels)')
+    parser.add_argument('--bbox', metavar='xmin,ymin,xmax,ymax',
+            type=lambda value: tuple([ float(coordinate) for coordinate in value.split(',') ]),
+            help='process only the administrative subdivisions which boundaries intersect the specified '
+                 'bounding box, in degrees (default: the whole world)')
+    parser.add_argument('--benchmark', dest='benchmark_file_path_name', metavar='filename',
+            help='load the specified file of SQL commands, generated by this script, into the PostgreSQL '
+                 'database specified with --dsn, which tables area, area_label, and area_index are dropped '
+                 'and created, and measure the load time, the index build time, the size of the tables, '
+                 'and the latency of representative queries, instead of generating data')
+    parser.add_argument('--benchmark-results', dest='result_file_path_name', default=BENCHMARK_RESULT_FILE_NAME, metavar='filename',
+            help='specify the file, in JSON Lines format, which the results of the benchmark are appended to '
+                 '(default: %(default)s)')
+    parser.add_argument('--work-dir', dest='work_path', metavar='directory',
+            help='run as a worker of the specified shared work directory, claiming countries with lease files, '
+                 'together with other workers running on the same host or on other hosts, and writing a part '
+                 'per country to this directory, instead of writing the output file (the option --memory-budget '
+                 'is ignored)')
+    parser.add_argument('--lease-expiration', dest='lease_expiration_time', type=int,
+            default=WORK_QUEUE_LEASE_EXPIRATION_TIME, metavar='seconds',
+            help='specify the time after which the lease of a country, which its worker has not renewed, is '
+                 'reassigned to another worker (default: %(default)s)')
+    parser.add_argument('--assemble', dest='assembly_required', action='store_true',
+            help='append the parts of the countries of the work directory specified with --work-dir, once all '
+                 'these countries have been completed, to the output file, instead of generating data')
     arguments = parser.parse_args()
 
+    if arguments.job_count < 1:
+        parser.error('argument -j/--jobs must be at least 1')
+
+    # Each of the countries processed in parallel may parse its
+    # administrative levels with a pool of processes: share the CPUs
+    # between these pools, rather than starting as many processes as
+    # there are CPUs per country.
+    if arguments.level_job_count is None:
+        arguments.level_job_count = max(1, multiprocessing.cpu_count() // arguments.job_count)
+    elif arguments.level_job_count < 1:
+        parser.error('argument --level-jobs must be at least 1')
+
+    if arguments.session_count < 1:
+        parser.error('argument --sessions must be at least 1')
+
+    if arguments.precision is not None and not 0 <= arguments.precision <= 9:
+        parser.error('argument --precision must be between 0 and 9')
+
+    if arguments.administrative_level_count is not None and arguments.administrative_level_count < 1:
+        parser.error('argument --levels must be at least 1')
+
+    if arguments.bbox is not None and (len(arguments.bbox) != 4 or
+            arguments.bbox[0] > arguments.bbox[2] or arguments.bbox[1] > arguments.bbox[3]):
+        parser.error('argument --bbox must be xmin,ymin,xmax,ymax with xmin <= xmax and ymin <= ymax')
+
+    if arguments.bulk_load and arguments.output_format != 'sql' and not arguments.shard_path:
+        parser.error('argument --bulk-load is only supported with the format sql, or with --load-shards')
+
+    if arguments.topology_required and arguments.output_format not in ('sql', 'sql-shards'):
+        parser.error('argument --topology is only supported with the formats sql and sql-shards')
+
+    if arguments.tolerance is not None and not arguments.topology_required:
+        parser.error('argument --simplify requires the argument --topology')
+
+    if arguments.boundary_dedup_required and arguments.output_format not in ('sql', 'sql-shards'):
+        parser.error('argument --dedupe is only supported with the formats sql and sql-shards')
+
+    if arguments.max_piece_vertex_count is not None:
+        if arguments.max_piece_vertex_count < 8:
+            parser.error('argument --subdivide must be at least 8')
+        if arguments.output_format not in ('sql', 'sql-shards'):
+            parser.error('argument --subdivide is only supported with the formats sql and sql-shards')
+
+    # Load the shards written by a previous execution of the script, if
+    # requested, instead of generating data.
+    if arguments.shard_path:
+        if not arguments.dsn:
+            parser.error('argument --dsn is required to load shards')
+
+        if file_util.which('psql') is None:
+            raise Exception('The psql executable has not been found while this program is required to load shards')
+
+        load_shards(arguments.shard_path, arguments.dsn, arguments.session_count,
+                bulk_load=arguments.bulk_load)
+        sys.exit(0)
+
+    # Benchmark the load of SQL commands generated by a previous execution
+    # of the script, if requested, instead of generating data.
+    if arguments.benchmark_file_path_name:
+        if not arguments.dsn:
+            parser.error('argument --dsn is required to run the benchmark')
+
+        if file_util.which('psql') is None:
+            raise Exception('The psql executable has not been found while this program is required to run the benchmark')
+
+        run_benchmark(arguments.benchmark_file_path_name, arguments.dsn, arguments.result_file_path_name)
+        sys.exit(0)
+
+    if arguments.assembly_required and not arguments.work_path:
+        parser.error('argument --work-dir is required to assemble the parts of a work directory')
+
+    if not arguments.sql_file_path_name and not (arguments.work_path and not arguments.assembly_required):
+        parser.error('argument -f/--file is required')
+
+    # Check whether the SQL commands need to be written into a file or to
+    # the standard output.  In the first case, this script overrides any
+    # existing file.
+    sql_file_path_name = None if arguments.sql_file_path_name == '-' else arguments.sql_file_path_name
+
+    # The shards are written into a directory, which is never removed.
+    if arguments.output_format == 'sql-shards' and arguments.sql_file_path_name \
+            and (not sql_file_path_name or os.path.isfile(sql_file_path_name)):
+        parser.error('argument -f/--file must be a directory with the format sql-shards')
+
+    if sql_file_path_name and os.path.isfile(sql_file_path_name):
+        os.remove(sql_file_path_name)
+
+    output_writer_class = OUTPUT_WRITER_CLASSES[arguments.output_format]
+    if arguments.bulk_load:
+        output_writer_class = functools.partial(output_writer_class, bulk_load=True)
+
+    # Settings of the output that all the workers of a shared work
+    # directory, and the step that assembles their parts, need to share.
+    work_settings = { 'output_format': arguments.output_format, 'bulk_load': arguments.bulk_load }
+
+    # Append the parts written by the workers of a shared work directory to
+    # the output file, if requested, instead of generating data.
+    if arguments.assembly_required:
+        assemble_work_parts(arguments.work_path, output_writer_class, sql_file_path_name, work_settings)
+        sys.exit(0)
+
+    if arguments.country_codes:
+        for country_code in sorted(arguments.country_codes - set([ country_code for (country_code, _) in GADM_SUPPORTED_COUNTRIES ])):
+            sys.stderr.write('[WARNING] The country %s is not supported; ignore it.\n' % country_code)
+
+    cache_path = arguments.cache_path or os.path.join(os.path.expanduser('~'), '.gadm') if arguments.cache_required else None
+
+    # Store the parsed data of the countries in the local cache, if
+    # required, so that the next executions of the script don't parse
+    # again the archives that have not changed.
+    parsed_cache_path = os.path.join(cache_path, PARSED_COUNTRY_CACHE_DIRECTORY_NAME) if cache_path else None
+    if parsed_cache_path:
+        file_util.make_directory_if_not_exists(parsed_cache_path)
+
+    # Check whether the script needs to read a global archive of the whole
+    # world, in which case there is no ESRI geodatabase per country.
+    global_archive_required = arguments.archive_path and os.path.isfile(arguments.archive_path)
+    mirror_path = arguments.archive_path if arguments.archive_path and not global_archive_required else None
+
     # Sanity test to check that the command line executable mdb-export is
-    # installed on the computer this script is running on.
-    if file_util.which('mdb-export') is None:
+    # installed on the computer this script is running on, unless the
+    # names are decoded from the dBase IV files.
+    if not (global_archive_required or arguments.dbase_decoding_required) and file_util.which('mdb-export') is None:
         raise Exception('The mdb-export executable has not been found while this program is required to use this script')
 
+    # Split the global archive of the whole world into an archive per
+    # country, stored in a directory of the local cache, if required,
+    # separately from the archives downloaded per country, or in a
+    # temporary directory that is deleted at the end of the execution.
+    country_zip_file_path_names = {}
+    if global_archive_required:
+        split_path = os.path.join(cache_path, SPLIT_ARCHIVE_CACHE_DIRECTORY_NAME) if cache_path else tempfile.mkdtemp()
+        file_util.make_directory_if_not_exists(split_path)
+        print '[INFO] Splitting the global archive %s...' % arguments.archive_path
+        country_zip_file_path_names = split_global_archive(arguments.archive_path, split_path,
+                country_codes=arguments.country_codes,
+                administrative_level_count=arguments.administrative_level_count)
+
+        supported_country_codes = set([ country_code for (country_code, _) in GADM_SUPPORTED_COUNTRIES ])
+        for country_code in sorted(set(country_zip_file_path_names) - supported_country_codes):
+            sys.stderr.write('[WARNING] The country %s of the global archive is not supported; ignore it.\n' % country_code)
+
+    # Options of the processing of each country, whether the countries
+    # are processed by this execution, or by the workers of a shared work
+    # directory.
+    processing_options = {
+        'output_writer_class': output_writer_class,
+        'precision': arguments.precision,
+        'topology_required': arguments.topology_required,
+        'tolerance': arguments.tolerance,
+        'level_job_count': arguments.level_job_count,
+        'spatial_order': arguments.spatial_order,
+        'parsed_cache_path': parsed_cache_path,
+        'bbox': arguments.bbox,
+        'boundary_dedup_required': arguments.boundary_dedup_required,
+        'max_piece_vertex_count': arguments.max_piece_vertex_count }
+
+    # The options that change the output need to be the same for all the
+    # workers of a shared work directory.  The class of the output writer
+    # is stored as its format and its bulk-load envelope, while the number
+    # of level jobs and the cache, which depend on the host of each
+    # worker, are not stored.
+    work_settings.update([ (name, value) for (name, value) in processing_options.iteritems()
+            if name not in ('output_writer_class', 'level_job_count', 'parsed_cache_path') ])
+    work_settings.update(
+            administrative_level_count=arguments.administrative_level_count,
+            dbase_decoding_required=arguments.dbase_decoding_required)
+
+    # Process the countries as a worker of a shared work directory, if
+    # requested, fetching the data of each country only once it has been
+    # claimed, instead of writing the output file.
+    if arguments.work_path:
+        run_worker(arguments.work_path,
+                [ country_code for (country_code, _) in GADM_SUPPORTED_COUNTRIES
+                    if (not global_archive_required or country_code in country_zip_file_path_names)
+                        and (not arguments.country_codes or country_code in arguments.country_codes) ],
+                arguments.job_count, work_settings,
+                {
+                    'cache_path': cache_path,
+                    'cache_required': arguments.cache_required,
+                    'cache_expiration_time': arguments.cache_expiration_time,
+                    'mirror_path': mirror_path,
+                    'esri_required': not global_archive_required,
+                    'dbase_decoding_required': arguments.dbase_decoding_required or global_archive_required,
+                    'max_administrative_level_count': arguments.administrative_level_count },
+                shape_zip_file_path_names=country_zip_file_path_names,
+                lease_expiration_time=arguments.lease_expiration_time,
+                **processing_options)
+
+        if global_archive_required and not arguments.cache_required:
+            shutil.rmtree(split_path)
+
+        sys.exit(0)
+
     # Preprocess the countries, fetching archive ZIP files from either the
-    # locale cache, either GADM Web site; extract shape and ESRI files
-    # of the available administrative subdivisions per country.
+    # locale cache, either GADM Web site.
     #
-    # @note: the script extracts all the required files first, instead of
-    # processing each country, and extracting the corresponding files
-    # only, since the latter method raised a non-obvious error when
-    # executing the Shell command mdb-export to extract CSV data from the
-    # ESRI geodatabase:
+    # @note: the CSV data of the ESRI geodatabase of a country are
+    # exported by the process of this country before it parses the shape
+    # files, and only if its parsed data are not cached, as executing the
+    # Shell command mdb-export from a process that has already parsed a
+    # large country raised a non-obvious error:
     #
     #        File "/usr/lib/python2.7/subprocess.py", line xxxx, in _execute_child
     #        self.pid = os.fork()
@@ -1060,67 +5312,50 @@ if __name__ == '__main__':
     #
     countries_data = []
     for (country_code, country_name) in GADM_SUPPORTED_COUNTRIES:
+        if global_archive_required and country_code not in country_zip_file_path_names:
+            continue
+
+        if arguments.country_codes and country_code not in arguments.country_codes:
+            continue
+
         print '[INFO] Fetching %s data...' % country_name
         countries_data.append(fetch_country_data(country_code,
-                cache_path=(arguments.cache_path or os.path.join(os.path.expanduser('~'), '.gadm') if arguments.cache_required else None),
+                cache_path=cache_path,
                 cache_required=arguments.cache_required,
-                cache_expiration_time=arguments.cache_expiration_time))
-
-    # Check whether the SQL commands need to be written into a file or to
-    # the standard output.  In the first case, this script overrides any
-    # existing file.
-    sql_file_path_name = None if arguments.sql_file_path_name == '-' else arguments.sql_file_path_name
-
-    if sql_file_path_name and os.path.exists(sql_file_path_name):
-        os.remove(sql_file_path_name)
+                cache_expiration_time=arguments.cache_expiration_time,
+                mirror_path=mirror_path,
+                shape_zip_file_path_name=country_zip_file_path_names.get(country_code),
+                esri_required=not global_archive_required,
+                dbase_decoding_required=arguments.dbase_decoding_required or global_archive_required,
+                max_administrative_level_count=arguments.administrative_level_count))
+
+    if arguments.dbase_decoding_required:
+        esri_country_codes = [ country_data.country_code for country_data in countries_data if country_data.dbase_encodings is None ]
+        sys.stderr.write('[INFO] %d countries still require the ESRI geodatabase: %s\n' % \
+                (len(esri_country_codes), ', '.join(esri_country_codes)))
 
     # Retrieve the shapes and the names of the administrative subdivisions
     # of each country, and output the SQL commands to insert data into a
     # database.
-    for (country_code, administrative_level_count, shape_zip_file_path_name, esri_zip_file_path_name,  esri_file_path_names) in countries_data:
-        print '[INFO] Processing country %s...' % country_code
-
-        with zipfile.ZipFile(shape_zip_file_path_name) as shape_zip_file:
-            administrative_subdivisions = build_administrative_subdivisions(shape_zip_file, country_code, administrative_level_count)
-            update_administrative_subdivision_metadata(country_code, administrative_subdivisions, esri_file_path_names)
-            write_sql_commands(administrative_subdivisions, sql_file_path_name=sql_file_path_name, country_code=country_code)
+    #
+    # @note: the countries are processed in parallel, each by a distinct
+    #     process, which writes the administrative subdivisions of its
+    #     country to a part that is then appended to the output file.
+    output_writer = output_writer_class(sql_file_path_name)
 
-        # Delete the archive files, if no caching is required, and all the
-        # administrative subdivision CSV temporary files extracted from the
-        # ESRI geodatabase.
-        if not arguments.cache_required:
-            os.remove(shape_zip_file_path_name)
-            os.remove(esri_zip_file_path_name)
+    for (country_data, part_file_path_name) in schedule_countries(countries_data,
+            arguments.job_count, memory_budget=arguments.memory_budget, **processing_options):
+        output_writer.append_part(part_file_path_name)
 
-        for esri_file_path_name in esri_file_path_names:
-            os.remove(esri_file_path_name)
+        # Delete the archive files, if no caching is required.
+        if not arguments.cache_required and not mirror_path:
+            os.remove(country_data.shape_zip_file_path_name)
+            if country_data.esri_zip_file_path_name:
+                os.remove(country_data.esri_zip_file_path_name)
 
         gc.collect()
 
-    # Write the PL/pgSQL command to generate the simplified boundaries of
-    # the geographical areas.
-    with file_util.smart_open(sql_file_path_name, 'a') as file_handle:
-        print >> file_handle, """
-                DO $$
-                BEGIN
-                  IF EXISTS(
-                    SELECT true
-                      FROM pg_proc
-                      WHERE proname = '_simplify_area_boundaries') THEN
-                    RAISE NOTICE 'Simplifying boundaries of each geographic area...';
-
-                    DROP INDEX idx_area__boundaries;
-
-                    PERFORM _simplify_area_boundaries();
-
-                    -- ALTER TABLE area
-                    --  ALTER COLUMN _boundaries SET NOT NULL;
+    if global_archive_required and not arguments.cache_required:
+        shutil.rmtree(split_path)
 
-                    CREATE INDEX idx_area__boundaries
-                      ON area USING GIST (_boundaries);
-                  ELSE
-                    RAISE NOTICE 'No function found to simplify boundaries of each geographic area.';
-                  END IF;
-                END $$;
-                """
-        print >> file_handle
+    output_writer.close()
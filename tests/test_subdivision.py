@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+Test the subdivision of the boundaries of the administrative
+subdivisions into pieces of a maximum number of vertices, including
+degenerate boundaries which pieces cannot be made smaller.
+"""
+import os
+import sys
+import unittest
+
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gadm2sql
+
+
+# Maximum number of vertices of a piece, which is the minimum that the
+# option ``--subdivide`` accepts.
+MAX_PIECE_VERTEX_COUNT = 8
+
+# Vertices of a unit square, oriented counterclockwise.
+UNIT_SQUARE_VERTICES = [ (0, 0), (1, 0), (1, 1), (0, 1) ]
+
+
+def densify_boundary(boundary, segment_count):
+    """
+    Return a closed boundary which edges are each split into the specified
+    number of segments.
+    """
+    vertices = [ boundary[i] + (boundary[i + 1] - boundary[i]) * k / float(segment_count)
+            for i in range(len(boundary) - 1)
+                for k in range(segment_count) ]
+    return numpy.array(vertices + [ vertices[0] ])
+
+
+class SubdivisionTestCase(unittest.TestCase):
+    def assertPiecesCoverBoundary(self, boundary, pieces):
+        for piece in pieces:
+            self.assertTrue((piece[0] == piece[-1]).all())
+        self.assertTrue((numpy.vstack(pieces).min(axis=0) == boundary.min(axis=0)).all())
+        self.assertTrue((numpy.vstack(pieces).max(axis=0) == boundary.max(axis=0)).all())
+
+    def test_subdivide_boundary(self):
+        boundary = densify_boundary(numpy.array(UNIT_SQUARE_VERTICES + UNIT_SQUARE_VERTICES[:1], dtype=float), 16)
+        pieces = gadm2sql.subdivide_boundary(boundary, MAX_PIECE_VERTEX_COUNT)
+
+        self.assertTrue(len(pieces) > 1)
+        self.assertTrue(all([ len(piece) <= MAX_PIECE_VERTEX_COUNT for piece in pieces ]))
+        self.assertPiecesCoverBoundary(boundary, pieces)
+
+    def test_subdivide_self_overlapping_boundary(self):
+        # A square wound twice, which halves have as many vertices as the
+        # square, whatever the number of times it is split.
+        boundary = numpy.array(UNIT_SQUARE_VERTICES * 2 + UNIT_SQUARE_VERTICES[:1], dtype=float)
+        pieces = gadm2sql.subdivide_boundary(boundary, MAX_PIECE_VERTEX_COUNT)
+        self.assertEqual(len(pieces), 1)
+        self.assertEqual(len(pieces[0]), len(boundary))
+
+        boundary = densify_boundary(boundary, 4)
+        pieces = gadm2sql.subdivide_boundary(boundary, MAX_PIECE_VERTEX_COUNT)
+        self.assertTrue(len(pieces) <= gadm2sql.SUBDIVISION_MAX_PIECE_COUNT_RATIO * len(boundary))
+        self.assertPiecesCoverBoundary(boundary, pieces)
+
+
+if __name__ == '__main__':
+    unittest.main()
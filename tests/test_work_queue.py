@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Test the shared work directory of the script: several workers, run as
+local processes, process the countries of a temporary work directory
+together, and the parts of the completed countries are then assembled.
+
+The processing of a country is replaced with a function that writes a
+part naming this country, so that the test doesn't fetch any archive.
+"""
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gadm2sql
+
+
+# List of the ISO 3166-1 alpha-3 codes of the countries of the queue of
+# the work directory.
+COUNTRY_CODES = [ 'BEL', 'CHE', 'DEU', 'ESP', 'FRA', 'ITA', 'LUX', 'NLD' ]
+
+# Settings of the work directory, including a bounding box that the
+# queue file stores as a list.
+WORK_SETTINGS = {
+    'output_format': 'sql',
+    'bulk_load': False,
+    'precision': 6,
+    'bbox': (2.5, 49.4, 6.5, 51.6) }
+
+
+def write_country_part(country_code, part_file_path_name, fetch_options, **processing_options):
+    """
+    Replace the function ``process_leased_country``, writing a part that
+    only contains the code of the country.
+    """
+    time.sleep(0.2)
+    with open(part_file_path_name, 'wt') as file_handle:
+        file_handle.write('%s\n' % country_code)
+
+
+class WorkQueueTestCase(unittest.TestCase):
+    def setUp(self):
+        self.work_path = tempfile.mkdtemp()
+        self.process_leased_country = gadm2sql.process_leased_country
+        gadm2sql.process_leased_country = write_country_part
+
+    def tearDown(self):
+        gadm2sql.process_leased_country = self.process_leased_country
+        shutil.rmtree(self.work_path)
+
+    def get_lease_generations(self, country_code):
+        lease_file_name_prefix = country_code + gadm2sql.WORK_QUEUE_LEASE_FILE_NAME_INFIX
+        return sorted([ int(file_name[len(lease_file_name_prefix):]) for file_name in os.listdir(self.work_path)
+                if file_name.startswith(lease_file_name_prefix) ])
+
+    def test_local_multi_process_run(self):
+        workers = [ multiprocessing.Process(target=gadm2sql.run_worker,
+                    args=(self.work_path, COUNTRY_CODES, 2, WORK_SETTINGS, {}),
+                    kwargs={ 'lease_expiration_time': 60 })
+                for _ in range(3) ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(60)
+            self.assertEqual(worker.exitcode, 0)
+
+        for country_code in COUNTRY_CODES:
+            with open(os.path.join(self.work_path, country_code + gadm2sql.WORK_QUEUE_DONE_MARKER_FILE_NAME_SUFFIX)) as file_handle:
+                done_marker = json.load(file_handle)
+            self.assertEqual(done_marker['part_file_name'], '%s.%d%s' % \
+                    (country_code, done_marker['generation'], gadm2sql.WORK_QUEUE_PART_FILE_NAME_SUFFIX))
+            self.assertEqual(self.get_lease_generations(country_code)[-1], done_marker['generation'])
+
+        output_file_path_name = os.path.join(self.work_path, 'gadm.sql')
+        gadm2sql.assemble_work_parts(self.work_path, gadm2sql.SqlCopyWriter, output_file_path_name,
+                { 'output_format': 'sql', 'bulk_load': False })
+
+        with open(output_file_path_name) as file_handle:
+            lines = file_handle.read().splitlines()
+        self.assertEqual([ line for line in lines if line in COUNTRY_CODES ], COUNTRY_CODES)
+
+    def test_settings_mismatch(self):
+        gadm2sql.open_work_queue(self.work_path, WORK_SETTINGS, country_codes=COUNTRY_CODES)
+        self.assertEqual(gadm2sql.open_work_queue(self.work_path, WORK_SETTINGS), COUNTRY_CODES)
+        self.assertRaises(Exception, gadm2sql.open_work_queue, self.work_path, dict(WORK_SETTINGS, precision=5))
+
+    def test_claim_completed_country(self):
+        self.assertEqual(gadm2sql.claim_country_lease(self.work_path, 'FRA', 'worker-1'), 1)
+        open(os.path.join(self.work_path, 'FRA' + gadm2sql.WORK_QUEUE_DONE_MARKER_FILE_NAME_SUFFIX), 'w').close()
+
+        self.assertIsNone(gadm2sql.claim_country_lease(self.work_path, 'FRA', 'worker-2', lease_expiration_time=0))
+        self.assertEqual(self.get_lease_generations('FRA'), [ 1 ])
+
+    def test_claim_country_completed_while_claiming(self):
+        # The holder of the stale lease completes the country between the
+        # check of the completion marker and the creation of the lease.
+        self.assertEqual(gadm2sql.claim_country_lease(self.work_path, 'FRA', 'worker-1'), 1)
+
+        os_open = os.open
+        def open_after_completion(file_path_name, flags, *arguments):
+            open(os.path.join(self.work_path, 'FRA' + gadm2sql.WORK_QUEUE_DONE_MARKER_FILE_NAME_SUFFIX), 'w').close()
+            return os_open(file_path_name, flags, *arguments)
+
+        os.open = open_after_completion
+        try:
+            generation = gadm2sql.claim_country_lease(self.work_path, 'FRA', 'worker-2', lease_expiration_time=0)
+        finally:
+            os.open = os_open
+
+        self.assertIsNone(generation)
+        self.assertEqual(self.get_lease_generations('FRA'), [ 1, 2 ])
+        self.assertIsNone(gadm2sql.claim_country_lease(self.work_path, 'FRA', 'worker-3', lease_expiration_time=0))
+
+    def test_claim_country_with_empty_lease(self):
+        # The holder of the lease has crashed between the creation of the
+        # lease and the writing of its content.
+        lease_file_path_name = os.path.join(self.work_path, 'FRA' + gadm2sql.WORK_QUEUE_LEASE_FILE_NAME_INFIX + '1')
+        open(lease_file_path_name, 'w').close()
+        self.assertIsNone(gadm2sql.claim_country_lease(self.work_path, 'FRA', 'worker-2', lease_expiration_time=60))
+
+        os.utime(lease_file_path_name, (0, 0))
+        self.assertEqual(gadm2sql.claim_country_lease(self.work_path, 'FRA', 'worker-2', lease_expiration_time=60), 2)
+        self.assertEqual(self.get_lease_generations('FRA'), [ 1, 2 ])
+
+
+if __name__ == '__main__':
+    unittest.main()